@@ -0,0 +1,221 @@
+"""Per-page rerun benchmark for the dashboard, with a regression check.
+
+    python benchmarks/pages.py [--scales 1 10] [--repeat N] [--out FILE]
+    python benchmarks/pages.py --compare BASELINE [--threshold 0.25] [--min-ms 20]
+    python benchmarks/pages.py --no-compact --out before.json
+
+Every page of views.PAGES (and every year of the Contract Labor year
+selector, plus a name search on the drill-down page) is driven headlessly
+through AppTest, in one session per dataset scale, the way a user would
+click through it.  For each case it records:
+
+* cold_ms       - first run of the case in the process: the derived files
+                  and loader caches are already warm (the startup run's
+                  precompute_all), the case's own figures are not built
+* warm_ms       - median of `--repeat` further reruns of the same state
+* peak_mb       - Python heap high-water mark of the cold run (tracemalloc,
+                  measured in a separate pass so it does not skew timings)
+* payload_bytes - serialized size of every st.plotly_chart on the page
+
+and, per scale, startup_ms: the session's first run, which fills every
+loader cache (precompute_all), and max_rss_mb: the timing process's peak
+resident memory, which also covers Arrow and SQLite buffers that
+tracemalloc cannot see.
+
+Scale 1 is the sample warehouse; scale N is a synthetic warehouse N times
+its size, generated once under data/bench/scale-N.  Every derived file
+(hcris.precompute) is built before timing starts.  Scale 100 needs
+several GB of memory and takes a while to generate.
+
+With --compare, the run fails (exit 1) when a case's cold or warm time
+grows by more than --threshold (fraction) and --min-ms, or its payload by
+more than --threshold, relative to the baseline file.
+
+--no-compact turns off chart payload compaction (HCRIS_COMPACT_CHARTS=0);
+comparing a normal run against a --no-compact baseline reports each
+page's payload bytes before and after compaction.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+BENCH_DIR = ROOT / "data" / "bench"
+SEARCH_QUERY = "hospital"
+
+
+def warehouse(scale):
+    """Warehouse root for `scale`, generated and pre-derived if missing."""
+    from hcris import precompute, sample, store
+
+    if scale == 1:
+        root = store.ensure_warehouse()
+    else:
+        root = BENCH_DIR / f"scale-{scale}"
+        if not store.list_years("financials", root):
+            print(f"generating scale {scale} warehouse in {root} ...", file=sys.stderr)
+            sample.write_sample(root, scale=scale)
+    # derived results are a one-off cost of new data, not of a page run
+    precompute.run(root)
+    return root
+
+
+def _cases(at):
+    """Yield (case name, action) pairs; each action puts the app in that state."""
+    import views
+
+    for page in views.PAGES:
+        def select(page=page):
+            at.sidebar.selectbox[0].select(page)
+        yield page, select
+
+        if page == "Contract Labor Analysis":
+            at.sidebar.selectbox[0].select(page).run()
+            year_box = next(box for box in at.selectbox if box.label == "Select Year")
+            for year in year_box.options:
+                def pick(page=page, year=year):
+                    at.sidebar.selectbox[0].select(page)
+                    next(box for box in at.selectbox if box.label == "Select Year").select(year)
+                yield f"{page} [{year}]", pick
+
+        if page == "Hospital Drill-down":
+            def search(page=page):
+                at.sidebar.selectbox[0].select(page)
+                at.text_input[0].input(SEARCH_QUERY)
+            yield f"{page} [search]", search
+
+
+def _payload_bytes(at):
+    return sum(len(chart.proto.spec.encode()) for chart in at.get("plotly_chart"))
+
+
+def _child(scale, repeat, trace):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=600)
+    start = time.perf_counter()
+    at.run()
+    startup_ms = (time.perf_counter() - start) * 1000
+    results = {}
+    for name, action in _cases(at):
+        action()
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        at.run()
+        cold_ms = (time.perf_counter() - start) * 1000
+        if at.exception:
+            raise SystemExit(f"{name}: {at.exception[0].value}")
+        if trace:
+            results[name] = {"peak_mb": tracemalloc.get_traced_memory()[1] / 2**20}
+            tracemalloc.stop()
+            continue
+        warm = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            at.run()
+            warm.append((time.perf_counter() - start) * 1000)
+        results[name] = {"cold_ms": cold_ms, "warm_ms": statistics.median(warm),
+                         "payload_bytes": _payload_bytes(at)}
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"cases": results, "startup_ms": startup_ms, "max_rss_mb": max_rss_mb}))
+
+
+def _run_child(root, scale, repeat, trace, compact=True):
+    env = dict(os.environ, HCRIS_WAREHOUSE=str(root), HCRIS_COMPACT_CHARTS="1" if compact else "0")
+    cmd = [sys.executable, __file__, "--child", str(scale), "--repeat", str(repeat)]
+    if trace:
+        cmd.append("--trace")
+    out = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    if out.returncode:
+        raise SystemExit(out.stderr.strip().splitlines()[-1])
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(scales, repeat=5, compact=True):
+    results, startup, max_rss = {}, {}, {}
+    for scale in scales:
+        root = warehouse(scale)
+        timings = _run_child(root, scale, repeat, trace=False, compact=compact)
+        peaks = _run_child(root, scale, repeat, trace=True, compact=compact)["cases"]
+        results[str(scale)] = {name: {**case, **peaks.get(name, {})} for name, case in timings["cases"].items()}
+        startup[str(scale)] = timings["startup_ms"]
+        max_rss[str(scale)] = timings["max_rss_mb"]
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "compact_charts": compact,
+        "startup_ms": startup,
+        "max_rss_mb": max_rss,
+        "scales": results,
+    }
+
+
+def compare(current, baseline, threshold=0.25, min_ms=20):
+    """Lines describing each case's change and the list of regressions."""
+    lines, regressions = [], []
+    for scale, cases in current["scales"].items():
+        before_cases = baseline.get("scales", {}).get(scale, {})
+        for name, now in cases.items():
+            before = before_cases.get(name)
+            if before is None:
+                lines.append(f"[{scale}x] {name}: new case")
+                continue
+            for key in ("cold_ms", "warm_ms", "payload_bytes"):
+                old, new = before.get(key), now.get(key)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old
+                slower = change > threshold and (key == "payload_bytes" or new - old > min_ms)
+                line = f"[{scale}x] {name} {key}: {old:,.1f} -> {new:,.1f} ({change:+.0%})"
+                lines.append(line + ("  REGRESSION" if slower else ""))
+                if slower:
+                    regressions.append(line)
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="*", type=int, default=[1, 10])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail on regressions against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=20)
+    parser.add_argument("--no-compact", action="store_true", help="send uncompacted chart payloads")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        _child(args.child, args.repeat, args.trace)
+        return 0
+
+    current = measure(args.scales, args.repeat, compact=not args.no_compact)
+    if args.out:
+        Path(args.out).write_text(json.dumps(current, indent=2) + "\n")
+    if not args.compare:
+        print(json.dumps(current, indent=2))
+        return 0
+
+    baseline = json.loads(Path(args.compare).read_text())
+    lines, regressions = compare(current, baseline, args.threshold, args.min_ms)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
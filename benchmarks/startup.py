@@ -0,0 +1,91 @@
+"""Cold-start measurement for the dashboard.
+
+    python benchmarks/startup.py [APP] [--repeat N]
+
+Each sample runs in a fresh interpreter and reports:
+
+* imports_ms     - time to execute the app's top-level import statements
+* first_paint_ms - first AppTest run of the default page (imports included)
+* rerun_ms       - a second run of the same session
+* modules        - modules loaded by the first run (beyond Streamlit itself)
+
+The warehouse is materialized beforehand so sample generation is not timed.
+"""
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _top_level_imports(app):
+    tree = ast.parse(Path(app).read_text())
+    nodes = [n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+    return ast.unparse(ast.Module(body=nodes, type_ignores=[]))
+
+
+def _child_imports(app):
+    import streamlit  # noqa: F401  (baseline, not attributed to the app)
+
+    imports = _top_level_imports(app)
+    start = time.perf_counter()
+    exec(compile(imports, app, "exec"), {})
+    print(json.dumps({"imports_ms": (time.perf_counter() - start) * 1000}))
+
+
+def _child_paint(app):
+    from streamlit.testing.v1 import AppTest
+
+    before = set(sys.modules)
+    at = AppTest.from_file(str(Path(app).resolve()), default_timeout=300)
+    start = time.perf_counter()
+    at.run()
+    first_paint_ms = (time.perf_counter() - start) * 1000
+    modules = len(set(sys.modules) - before)
+    start = time.perf_counter()
+    at.run()
+    rerun_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise SystemExit(at.exception[0].value)
+    print(json.dumps({"first_paint_ms": first_paint_ms, "rerun_ms": rerun_ms, "modules": modules}))
+
+
+def measure(app, repeat=5):
+    from hcris import store
+    store.ensure_warehouse()
+    samples = []
+    for _ in range(repeat):
+        sample = {}
+        for mode in ("imports", "paint"):
+            out = subprocess.run([sys.executable, __file__, app, "--child", mode], cwd=ROOT,
+                                 capture_output=True, text=True, check=True)
+            sample.update(json.loads(out.stdout.strip().splitlines()[-1]))
+        samples.append(sample)
+    return {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("app", nargs="?", default=str(ROOT / "app.py"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", choices=["imports", "paint"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child == "imports":
+        _child_imports(args.app)
+        return 0
+    if args.child == "paint":
+        _child_paint(args.app)
+        return 0
+    result = measure(args.app, args.repeat)
+    print(json.dumps({"app": args.app, **{k: round(v, 1) for k, v in result.items()}}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
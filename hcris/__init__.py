@@ -0,0 +1 @@
+"""Data layer for the HCRIS Hospital Analytics Dashboard."""
@@ -0,0 +1,97 @@
+"""Bitmap indexes for filtering the hospital-year table.
+
+For every filterable dimension (year, state, type, bed-size band) each
+distinct value gets a bitmap over the table's rows, packed into 64-bit
+words.  A filter is the OR of the bitmaps of the values it allows, and
+several filters combine with AND, so evaluating any selection costs
+O(rows / 64) word operations per value involved -- no pandas boolean
+indexing or regrouping of the table.
+
+    index = BitmapIndex({"Year": years, "State": states})
+    rows = index.rows(index.select(Year=[2022, 2023], State=["CA", "TX"]))
+"""
+import numpy as np
+
+# Bed-size bands: label -> [low, high) bed count
+BED_BANDS = {
+    "Under 50": (0, 50),
+    "50-99": (50, 100),
+    "100-299": (100, 300),
+    "300-499": (300, 500),
+    "500+": (500, np.inf),
+}
+UNKNOWN_BAND = "Unknown"
+
+# set bits of every byte value, for counting a bitmap a byte at a time
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def bed_band(beds):
+    """BED_BANDS label of each bed count; missing or negative counts are UNKNOWN_BAND."""
+    beds = np.asarray(beds, dtype="float64")
+    labels = np.array([*BED_BANDS, UNKNOWN_BAND], dtype=object)
+    lows = np.array([low for low, _ in BED_BANDS.values()])
+    band = np.searchsorted(lows, beds, side="right") - 1
+    band[np.isnan(beds) | (beds < 0)] = len(BED_BANDS)
+    return labels[band]
+
+
+def pack(mask):
+    """Boolean row mask as a bitmap of uint64 words (bit i of the table = row i)."""
+    bits = np.packbits(np.asarray(mask, dtype=bool), bitorder="little")
+    padded = np.zeros(-(-len(bits) // 8) * 8, dtype=np.uint8)
+    padded[:len(bits)] = bits
+    return padded.view(np.uint64)
+
+
+class BitmapIndex:
+    """Per-value bitmaps over `columns` (name -> one label per row)."""
+
+    def __init__(self, columns):
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("index columns must all have one value per row")
+        self.size = lengths.pop() if lengths else 0
+        self.all = pack(np.ones(self.size, dtype=bool))
+        self._none = np.zeros_like(self.all)
+        self.bitmaps = {}
+        for name, values in columns.items():
+            labels, codes = np.unique(np.asarray(values), return_inverse=True)
+            # one row sort groups each value's rows, instead of one scan per value
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+            bitmaps = {}
+            for i, label in enumerate(labels.tolist()):
+                mask = np.zeros(self.size, dtype=bool)
+                mask[order[bounds[i]:bounds[i + 1]]] = True
+                bitmaps[label] = pack(mask)
+                bitmaps[label].flags.writeable = False
+            self.bitmaps[name] = bitmaps
+
+    def values(self, name):
+        """Distinct values of dimension `name`, sorted."""
+        return list(self.bitmaps[name])
+
+    def any_of(self, name, values):
+        """Bitmap of the rows whose `name` is any of `values`."""
+        bitmaps = [self.bitmaps[name][value] for value in values if value in self.bitmaps[name]]
+        if not bitmaps:
+            return self._none
+        return np.bitwise_or.reduce(bitmaps) if len(bitmaps) > 1 else bitmaps[0]
+
+    def select(self, **criteria):
+        """AND of `any_of` over the given dimensions; None (or omitted) means no constraint."""
+        selected = self.all
+        for name, values in criteria.items():
+            if values is not None:
+                selected = selected & self.any_of(name, values)
+        return selected
+
+    def count(self, bitmap):
+        """Rows set in `bitmap`."""
+        return int(_POPCOUNT[bitmap.view(np.uint8)].sum(dtype=np.int64))
+
+    def rows(self, bitmap):
+        """Row positions set in `bitmap`, ascending."""
+        bits = np.unpackbits(bitmap.view(np.uint8), count=self.size, bitorder="little")
+        return np.flatnonzero(bits)
@@ -0,0 +1,72 @@
+"""Per-year contract-labor statistics computed in one vectorized pass.
+
+The hospital-level contract-labor column is sorted once by (Year, value);
+every statistic is then a segment reduction over that sorted array, so
+adding years or hospitals never adds Python-level loops.
+"""
+import numpy as np
+import pandas as pd
+
+TARGET_MIN, TARGET_MAX = 3, 5  # contract labor target range, %
+TARGET_CATEGORIES = ['Below Target (<3%)', 'Within Target (3-5%)', 'Above Target (>5%)']
+
+
+def year_stats(years, pct):
+    """Mean, median, std, max and target-bucket shares of `pct` for every year.
+
+    Returns a DataFrame indexed by Year; NaN values are ignored and std uses
+    ddof=1 like pandas.
+    """
+    years = np.asarray(years)
+    pct = np.asarray(pct, dtype=float)
+    reported = ~np.isnan(pct)
+    years, pct = years[reported], pct[reported]
+
+    order = np.lexsort((pct, years))
+    y, v = years[order], pct[order]
+    labels, starts, counts = np.unique(y, return_index=True, return_counts=True)
+    if not len(labels):
+        return pd.DataFrame(columns=['hospitals', 'mean', 'median', 'std', 'max',
+                                     'below_target', 'within_target', 'above_target'])
+    ends = starts + counts
+
+    mean = np.add.reduceat(v, starts) / counts
+    dev = v - np.repeat(mean, counts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(np.add.reduceat(dev * dev, starts) / (counts - 1))
+    median = (v[starts + (counts - 1) // 2] + v[starts + counts // 2]) / 2
+
+    # 0 = below, 1 = within (inclusive), 2 = above the 3-5% target range
+    bucket = (v >= TARGET_MIN).astype(np.int64) + (v > TARGET_MAX)
+    segment = np.repeat(np.arange(len(labels)), counts)
+    buckets = np.bincount(segment * 3 + bucket, minlength=3 * len(labels)).reshape(-1, 3)
+    shares = buckets / counts[:, None] * 100
+
+    return pd.DataFrame({
+        'hospitals': counts,
+        'mean': mean,
+        'median': median,
+        'std': std,
+        'max': v[ends - 1],
+        'below_target': shares[:, 0],
+        'within_target': shares[:, 1],
+        'above_target': shares[:, 2],
+    }, index=pd.Index(labels, name='Year'))
+
+
+# Fixed histogram bins shared by every year: 50 bins over 0-45%
+HISTOGRAM_EDGES = np.linspace(0, 45, 51)
+
+
+def year_histograms(years, pct, edges=HISTOGRAM_EDGES):
+    """Bin counts of `pct` per year on fixed `edges`; values outside are clipped into the end bins."""
+    years = np.asarray(years)
+    pct = np.asarray(pct, dtype=float)
+    reported = ~np.isnan(pct)
+    years, pct = years[reported], pct[reported]
+
+    nbins = len(edges) - 1
+    labels, segment = np.unique(years, return_inverse=True)
+    bins = np.clip(np.searchsorted(edges, pct, side='right') - 1, 0, nbins - 1)
+    counts = np.bincount(segment * nbins + bins, minlength=len(labels) * nbins).reshape(-1, nbins)
+    return {int(year): row for year, row in zip(labels, counts)}
@@ -0,0 +1,196 @@
+"""Embedded SQLite database of hospitals for counts and name lookups.
+
+The latest attributes of every hospital are loaded into a single SQLite
+file next to the warehouse, with the warehouse's record counts and year
+range (read from the Parquet footers) in a meta table; it is rebuilt
+whenever the warehouse data version changes.  Filtered aggregates come
+from the rollup cube (hcris.rollups), so financial and department records
+are not copied here.
+
+Connections are read-only and pooled per process, so every Streamlit
+session shares them.  Queries are fixed SQL strings with bound
+parameters; lists are passed as one JSON array each
+(``IN (SELECT value FROM json_each(?))``), which keeps the SQL text, and
+so sqlite3's cached prepared statement, the same for any list.
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+
+import pandas as pd
+
+from hcris import store
+
+POOL_SIZE = int(os.environ.get("HCRIS_DB_POOL", "4"))
+POOL_TIMEOUT = 30  # seconds to wait for a free connection
+
+# Bump when the database layout changes, so current-looking files are rebuilt
+LAYOUT = 2
+
+TABLES = {
+    "hospitals": ["Provider_Number", "Hospital", "City", "State", "Type"],
+}
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE hospitals (
+    Provider_Number TEXT PRIMARY KEY, Hospital TEXT, City TEXT, State TEXT, Type TEXT
+);
+"""
+
+SUMMARY_SQL = """
+SELECT
+    (SELECT COUNT(*) FROM hospitals) AS Hospitals,
+    (SELECT COUNT(*) FROM hospitals WHERE Type = 'Teaching') AS Teaching_Hospitals,
+    (SELECT COUNT(DISTINCT State) FROM hospitals) AS States,
+    (SELECT CAST(value AS INTEGER) FROM meta WHERE key = 'first_year') AS First_Year,
+    (SELECT CAST(value AS INTEGER) FROM meta WHERE key = 'last_year') AS Last_Year,
+    (SELECT CAST(value AS INTEGER) FROM meta WHERE key = 'financial_records') AS Financial_Records,
+    (SELECT CAST(value AS INTEGER) FROM meta WHERE key = 'department_records') AS Department_Records
+"""
+
+NAMES_SQL = """
+SELECT Provider_Number, Hospital
+FROM hospitals
+WHERE Provider_Number IN (SELECT value FROM json_each(?))
+"""
+
+
+def database_path(root=None):
+    return store.derived_dir("sqlite", root) / "hcris.sqlite"
+
+
+def _built_version(path):
+    if not path.exists():
+        return None
+    with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as conn:
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+        except sqlite3.DatabaseError:
+            return None
+    return row[0] if row else None
+
+
+def _insert(conn, table, df):
+    columns = TABLES[table]
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    rows = df[columns].astype(object).where(df[columns].notna(), None)
+    conn.executemany(sql, rows.itertuples(index=False, name=None))
+
+
+def _version(root=None):
+    return f"{store.data_version(root)}/{LAYOUT}"
+
+
+def _meta(root=None):
+    """Warehouse-wide record counts and year range, without reading any rows."""
+    years = store.list_years("financials", root)
+    return {
+        "data_version": _version(root),
+        "first_year": years[0] if years else None,
+        "last_year": years[-1] if years else None,
+        "financial_records": store.row_count("financials", root),
+        "department_records": store.row_count("departments", root),
+    }
+
+
+def is_current(root=None):
+    return _built_version(database_path(root)) == _version(root)
+
+
+def build(root=None):
+    """Load the hospitals into the SQLite file unless it is already current; return its path."""
+    path = database_path(root)
+    if _built_version(path) == _version(root):
+        return path
+
+    tmp = path.with_suffix(".sqlite.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        with closing(sqlite3.connect(tmp)) as conn:
+            conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+            _insert(conn, "hospitals", store.read_hospitals(root=root))
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", _meta(root).items())
+            conn.commit()
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, path)
+    return path
+
+
+class ConnectionPool:
+    """Up to `size` read-only connections to one database, shared across threads."""
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return self._open()
+                except BaseException:
+                    self._opened -= 1
+                    raise
+        return self._idle.get(timeout=POOL_TIMEOUT)
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._opened -= 1
+
+
+class Repository:
+    """Queries over the embedded database."""
+
+    def __init__(self, path, pool_size=POOL_SIZE):
+        self.pool = ConnectionPool(path, pool_size)
+
+    def query(self, sql, params=()):
+        with self.pool.connection() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def summary(self):
+        """Database-wide counts: hospitals, teaching hospitals, states, years and records."""
+        return self.query(SUMMARY_SQL).iloc[0].to_dict()
+
+    def hospital_names(self, provider_numbers):
+        return self.query(NAMES_SQL, [json.dumps([str(p) for p in provider_numbers])])
+
+    def close(self):
+        self.pool.close()
+
+
+def open_repository(root=None, pool_size=POOL_SIZE):
+    """Repository over the warehouse's SQLite copy, rebuilding it first if stale."""
+    return Repository(build(root), pool_size)
@@ -0,0 +1,220 @@
+"""Department (cost-center) costs as memory-mapped columnar arrays.
+
+Each year's department records are stored next to the warehouse as one
+.npy file per column, sorted by provider:
+
+    <warehouse>/_departments/2023/provider.npy     int32 code into providers.npy
+    <warehouse>/_departments/2023/cost_center.npy  uint8 (usually) code into cost_centers.npy
+    <warehouse>/_departments/2023/salaries.npy     float64
+    <warehouse>/_departments/2023/total_cost.npy   float64
+    <warehouse>/_departments/2023/offsets.npy      each provider's row range
+    <warehouse>/_departments/2023/provider_state.npy  code into states.npy
+
+Readers memory-map the columns and reduce them a chunk of rows at a time
+with bincount, so resident memory is bounded by the chunk size and the
+result, not by how many years or records there are.  A single hospital's
+records are one contiguous slice (via the offsets), so its breakdown reads
+only those rows.
+"""
+import mmap
+import os
+import shutil
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from hcris import store
+
+CHUNK_ROWS = int(os.environ.get("HCRIS_DEPARTMENT_CHUNK_ROWS", str(1 << 16)))
+
+# per-record columns and per-provider arrays are memory-mapped; the small
+# cost-center and state dictionaries are read into memory
+MAPPED = ("provider", "cost_center", "salaries", "total_cost", "providers", "offsets")
+LOADED = ("cost_centers", "states", "provider_state")
+FIELDS = ["State", "Cost_Center", "Department", "Records", "Salaries", "Total_Cost"]
+
+
+class YearArrays(NamedTuple):
+    """One year's department columns (memory-mapped) and their dictionaries."""
+    provider: np.ndarray
+    cost_center: np.ndarray
+    salaries: np.ndarray
+    total_cost: np.ndarray
+    providers: np.ndarray
+    cost_centers: np.ndarray
+    states: np.ndarray
+    offsets: np.ndarray
+    provider_state: np.ndarray
+
+
+def year_dir(year, root=None):
+    return store.derived_dir("departments", root) / str(int(year))
+
+
+def department_name(code):
+    return store.COST_CENTERS.get(code, f"Line {code}")
+
+
+def _codes(count):
+    """Smallest unsigned dtype able to hold codes 0..count-1."""
+    return np.min_scalar_type(max(count - 1, 0))
+
+
+def encode_year(dept, fin):
+    """Column arrays for one year of department records, sorted by provider.
+
+    `fin` supplies each provider's state (Provider_Number, State).
+    """
+    providers, provider = np.unique(dept["Provider_Number"].to_numpy(dtype=str), return_inverse=True)
+    cost_centers, cost_center = np.unique(dept["Cost_Center"].to_numpy(dtype=str), return_inverse=True)
+    order = np.argsort(provider, kind="stable")
+
+    state_of = fin.drop_duplicates("Provider_Number").set_index("Provider_Number")["State"]
+    provider_states = state_of.reindex(providers).fillna("Unknown").to_numpy(dtype=str)
+    states, provider_state = np.unique(provider_states, return_inverse=True)
+
+    return {
+        "provider": provider[order].astype(np.int32),
+        "cost_center": cost_center[order].astype(_codes(len(cost_centers))),
+        "salaries": dept["Salaries"].to_numpy(dtype="float64", na_value=np.nan)[order],
+        "total_cost": dept["Total_Cost"].to_numpy(dtype="float64", na_value=np.nan)[order],
+        "providers": providers,
+        "cost_centers": cost_centers,
+        "states": states,
+        "offsets": np.concatenate([[0], np.cumsum(np.bincount(provider, minlength=len(providers)))]),
+        "provider_state": provider_state.astype(_codes(len(states))),
+    }
+
+
+def sources(root=None):
+    """Year -> fingerprints of the department and financials partitions each year is built from."""
+    return {year: f"{store.fingerprint('departments', year, root)}|{store.fingerprint('financials', year, root)}"
+            for year in store.list_years("departments", root)}
+
+
+def build_file(year, root=None):
+    dept = store.read_table("departments", columns=["Provider_Number", "Cost_Center", "Salaries", "Total_Cost"],
+                            years=[year], root=root)
+    fin = store.read_table("financials", columns=["Provider_Number", "State"], years=[year], root=root)
+    target = year_dir(year, root)
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    for name, array in encode_year(dept, fin).items():
+        np.save(tmp / f"{name}.npy", array)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+
+
+def refresh(root=None):
+    """Re-encode years whose department or financials partition changed; return those years."""
+    return store.refresh_derived("departments", sources(root), build_file, year_dir, root)
+
+
+def list_years(root=None):
+    """Years with department arrays, refreshed against the warehouse first."""
+    refresh(root)
+    return sorted(int(y) for y in store.read_manifest("departments", root))
+
+
+def open_year(year, root=None):
+    """Memory-mapped columns of one year; nothing is read until it is indexed."""
+    path = year_dir(year, root)
+    arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in MAPPED}
+    arrays.update({name: np.load(path / f"{name}.npy") for name in LOADED})
+    return YearArrays(**arrays)
+
+
+def _release(part):
+    """Drop the pages of `part`'s mapped arrays read so far from this process.
+
+    They stay in the OS page cache, but no longer count towards our
+    resident memory, which therefore stays at about one chunk.
+    """
+    for name in MAPPED:
+        mapped = getattr(getattr(part, name), "_mmap", None)
+        if mapped is not None and hasattr(mapped, "madvise"):
+            mapped.madvise(mmap.MADV_DONTNEED)
+
+
+def _lookup(values, dictionary):
+    """Positions of `values` in the sorted `dictionary`."""
+    return np.searchsorted(dictionary, values)
+
+
+def _frame(cells, states, centers, records, salaries, total_cost):
+    state, center = np.divmod(cells, len(centers))
+    codes = centers[center]
+    return pd.DataFrame({
+        "State": states[state],
+        "Cost_Center": codes,
+        "Department": [department_name(code) for code in codes],
+        "Records": records[cells],
+        "Salaries": salaries[cells],
+        "Total_Cost": total_cost[cells],
+    })
+
+
+def state_breakdown(years=None, root=None, chunk_rows=CHUNK_ROWS):
+    """Records, salaries and total cost per (State, Cost_Center), over `years`.
+
+    Each year's columns are reduced `chunk_rows` rows at a time into one
+    State x Cost_Center grid; missing amounts count as zero.
+    """
+    parts = [open_year(year, root) for year in (years if years is not None else list_years(root))]
+    if not parts:
+        return pd.DataFrame(columns=FIELDS)
+    states = np.unique(np.concatenate([part.states for part in parts]))
+    centers = np.unique(np.concatenate([part.cost_centers for part in parts]))
+    size = len(states) * len(centers)
+    records, salaries, total_cost = np.zeros(size, np.int64), np.zeros(size), np.zeros(size)
+
+    for part in parts:
+        provider_state = _lookup(part.states, states)[part.provider_state].astype(np.int64)
+        center_code = _lookup(part.cost_centers, centers)
+        for start in range(0, len(part.provider), chunk_rows):
+            rows = slice(start, start + chunk_rows)
+            cell = provider_state[part.provider[rows]] * len(centers) + center_code[part.cost_center[rows]]
+            records += np.bincount(cell, minlength=size)
+            salaries += np.bincount(cell, weights=np.nan_to_num(part.salaries[rows]), minlength=size)
+            total_cost += np.bincount(cell, weights=np.nan_to_num(part.total_cost[rows]), minlength=size)
+            _release(part)
+
+    return _frame(np.flatnonzero(records), states, centers, records, salaries, total_cost)
+
+
+def hospital_breakdown(provider_number, years=None, root=None):
+    """Salaries and total cost per (Year, Cost_Center) for one hospital.
+
+    Only the hospital's own row range is read from each year.
+    """
+    frames = []
+    for year in (years if years is not None else list_years(root)):
+        part = open_year(year, root)
+        code = _lookup(provider_number, part.providers)
+        if code >= len(part.providers) or part.providers[code] != provider_number:
+            continue
+        rows = slice(part.offsets[code], part.offsets[code + 1])
+        center = part.cost_center[rows]
+        size = len(part.cost_centers)
+        records = np.bincount(center, minlength=size)
+        cells = np.flatnonzero(records)
+        states = part.states[[part.provider_state[code]]]
+        frame = _frame(cells, states, part.cost_centers, records,
+                       np.bincount(center, weights=np.nan_to_num(part.salaries[rows]), minlength=size),
+                       np.bincount(center, weights=np.nan_to_num(part.total_cost[rows]), minlength=size))
+        frame.insert(0, "Year", year)
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=["Year", *FIELDS])
+    return pd.concat(frames, ignore_index=True)
+
+
+def providers_in(state, year, root=None):
+    """Provider numbers with department records in `state` and `year`."""
+    part = open_year(year, root)
+    code = _lookup(state, part.states)
+    if code >= len(part.states) or part.states[code] != state:
+        return part.providers[:0]
+    return part.providers[part.provider_state == code]
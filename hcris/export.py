@@ -0,0 +1,176 @@
+"""Streaming export of warehouse tables, one dataset per file.
+
+Rows are pulled from the warehouse in fixed-size record batches and
+written straight to the output, so peak memory is one batch plus the
+writer's buffers whatever the table size.
+
+Exports take the dashboard's filters (years, states, types, bed_bands).
+A table without the filtered column is matched through the financial
+records of the same report (departments carry only a Report_Id); a filter
+neither way can apply (`unsupported`) is an error, never silently dropped.
+
+    python -m hcris.export TABLE OUT [--format parquet|csv.gz] [--years 2023 ...]
+                                     [--states TX CA ...] [--types Teaching ...]
+                                     [--bed-bands 50-99 ...] [--columns A B ...]
+"""
+import argparse
+import gzip
+import sys
+import tempfile
+
+import pyarrow.csv as pcsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from hcris import bitmaps, store
+
+BATCH_ROWS = 64 * 1024
+
+# format -> (mime type, file extension)
+FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "csv.gz": ("application/gzip", ".csv.gz"),
+}
+
+
+def column_names(table):
+    return ["Year", *store.SCHEMAS[table].names]
+
+
+# filter keyword -> the financials column it tests
+FILTER_COLUMNS = {"states": "State", "types": "Type", "bed_bands": "Beds"}
+
+
+def _bed_bands(bands):
+    """Expression for Beds falling in any of the bitmaps.BED_BANDS labels `bands`."""
+    parts = []
+    for band in bands:
+        if band == bitmaps.UNKNOWN_BAND:
+            parts.append(ds.field("Beds").is_null() | (ds.field("Beds") < 0))
+        else:
+            low, high = bitmaps.BED_BANDS[band]
+            parts.append((ds.field("Beds") >= low) & (ds.field("Beds") < high))
+    if not parts:
+        return ds.scalar(False)
+    expression = parts[0]
+    for part in parts[1:]:
+        expression = expression | part
+    return expression
+
+
+def _expression(filters):
+    """AND of the expressions for `filters` (keyword -> allowed values), or None."""
+    parts = []
+    for key, values in filters.items():
+        if key == "bed_bands":
+            parts.append(_bed_bands(values))
+        elif key == "years":
+            parts.append(ds.field("Year").isin([int(y) for y in values]))
+        else:
+            parts.append(ds.field(FILTER_COLUMNS[key]).isin(list(values)))
+    expression = None
+    for part in parts:
+        expression = part if expression is None else expression & part
+    return expression
+
+
+def _split(table, filters):
+    """`filters` as (applied to `table` itself, resolved through financials)."""
+    names = store.SCHEMAS[table].names
+    own = {key: values for key, values in filters.items()
+           if values is not None and (key == "years" or FILTER_COLUMNS[key] in names)}
+    joined = {key: values for key, values in filters.items() if values is not None and key not in own}
+    return own, joined
+
+
+def unsupported(table, **filters):
+    """Filter keywords `table` can apply neither itself nor through a Report_Id."""
+    _, joined = _split(table, filters)
+    return [] if "Report_Id" in store.SCHEMAS[table].names else list(joined)
+
+
+def scanner(table, columns=None, years=None, states=None, types=None, bed_bands=None,
+            batch_rows=BATCH_ROWS, root=None):
+    """Scanner over `table`, projected to `columns` and filtered to the
+    `years`, `states`, hospital `types` and `bed_bands` allowed (None: all).
+
+    Raises ValueError for a filter the table cannot apply (see `unsupported`).
+    """
+    filters = {"years": years, "states": states, "types": types, "bed_bands": bed_bands}
+    missing = unsupported(table, **filters)
+    if missing:
+        raise ValueError(f"{table} cannot be filtered by {', '.join(missing)}")
+    own, joined = _split(table, filters)
+    expression = _expression(own)
+    if joined:
+        # the reports whose financial record passes every filter; one int column
+        financials = ds.dataset(store.table_dir("financials", root), format="parquet",
+                                partitioning=store.PARTITIONING)
+        reports = financials.to_table(columns=["Report_Id"], filter=_expression({**own, **joined}))
+        by_report = ds.field("Report_Id").isin(reports.column("Report_Id"))
+        expression = by_report if expression is None else expression & by_report
+    dataset = ds.dataset(store.table_dir(table, root), format="parquet",
+                         partitioning=store.PARTITIONING)
+    return dataset.scanner(columns=columns, filter=expression, batch_size=batch_rows)
+
+
+def write_export(sink, table, fmt="parquet", **query):
+    """Stream `table` into the binary file-like `sink`; returns the row count."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}; expected one of {list(FORMATS)}")
+    scan = scanner(table, **query)
+    rows = 0
+    stream = gzip.GzipFile(fileobj=sink, mode="wb") if fmt == "csv.gz" else sink
+    try:
+        if fmt == "parquet":
+            writer = pq.ParquetWriter(stream, scan.projected_schema, compression="zstd")
+        else:
+            writer = pcsv.CSVWriter(stream, scan.projected_schema)
+        with writer:
+            for batch in scan.to_batches():
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    finally:
+        if stream is not sink:
+            stream.close()
+    return rows
+
+
+def export_file(table, fmt="parquet", **query):
+    """Export into an anonymous temporary file, positioned at the start.
+
+    The output goes to disk as it is written, so nothing grows in memory
+    with the export size; the file is deleted when it is closed.
+    """
+    sink = tempfile.TemporaryFile()
+    try:
+        write_export(sink, table, fmt, **query)
+    except BaseException:
+        sink.close()
+        raise
+    sink.seek(0)
+    return sink
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a warehouse table.")
+    parser.add_argument("table", choices=list(store.SCHEMAS))
+    parser.add_argument("out")
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    parser.add_argument("--years", nargs="*", type=int)
+    parser.add_argument("--states", nargs="*")
+    parser.add_argument("--types", nargs="*")
+    parser.add_argument("--bed-bands", nargs="*", choices=[*bitmaps.BED_BANDS, bitmaps.UNKNOWN_BAND])
+    parser.add_argument("--columns", nargs="*")
+    parser.add_argument("--warehouse", default=None)
+    args = parser.parse_args(argv)
+    with open(args.out, "wb") as sink:
+        rows = write_export(sink, args.table, args.format, columns=args.columns,
+                            years=args.years, states=args.states, types=args.types,
+                            bed_bands=args.bed_bands, root=args.warehouse)
+    print(f"{rows:,} rows -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
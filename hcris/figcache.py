@@ -0,0 +1,36 @@
+"""Plotly figures served from cached JSON specs.
+
+Built figures are cached as their JSON string in the process-wide result
+cache (hcris.resultcache).  Strings are immutable, so one cached spec can
+safely be handed to any number of sessions.
+"""
+import json
+
+import plotly.graph_objects as go
+
+
+class CachedFigure(go.Figure):
+    """Figure backed by a cached JSON spec.
+
+    Streamlit reads figures through to_dict(), so the spec is handed over
+    as-is without rebuilding or re-validating any traces.
+    """
+
+    def __init__(self, spec):
+        super().__init__()
+        self._spec = spec
+
+    def to_dict(self):
+        return json.loads(self._spec)
+
+    def to_plotly_json(self):
+        return self.to_dict()
+
+    def restyled(self, trace=0, layout=None, **props):
+        """The spec as a dict with `props` set on trace `trace` and `layout`
+        merged into its layout, for swapping in new values (say a z vector)
+        without rebuilding the figure.  The cached spec is not modified."""
+        spec = self.to_dict()
+        spec["data"][trace].update(props)
+        spec["layout"].update(layout or {})
+        return spec
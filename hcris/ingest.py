@@ -0,0 +1,219 @@
+"""Stream raw CMS HCRIS hospital cost reports into the Parquet warehouse.
+
+Usage:
+
+    python -m hcris.ingest RAW_DIR [YEAR ...] [--warehouse DIR] [--chunk-rows N]
+
+RAW_DIR holds the Form 2552-10 files as published by CMS (no header row):
+HOSP10_<YEAR>_RPT.CSV, HOSP10_<YEAR>_NMRC.CSV and HOSP10_<YEAR>_ALPHA.CSV.
+The NMRC and ALPHA files are read in fixed-size chunks, so memory stays
+bounded no matter how large a year's files are.
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from hcris import store
+
+CHUNK_ROWS = 1_000_000
+
+RPT_COLUMNS = [
+    "RPT_REC_NUM", "PRVDR_CTRL_TYPE_CD", "PRVDR_NUM", "NPI", "RPT_STUS_CD",
+    "FY_BGN_DT", "FY_END_DT", "PROC_DT", "INITL_RPT_SW", "LAST_RPT_SW",
+    "TRNSMTL_NUM", "FI_NUM", "ADR_VNDR_CD", "FI_CREAT_DT", "UTIL_CD",
+    "NPR_DT", "SPEC_IND", "FI_RCPT_DT",
+]
+NMRC_COLUMNS = ["RPT_REC_NUM", "WKSHT_CD", "LINE_NUM", "CLMN_NUM", "ITM_VAL_NUM"]
+ALPHA_COLUMNS = ["RPT_REC_NUM", "WKSHT_CD", "LINE_NUM", "CLMN_NUM", "ITM_ALPHNMRC_ITM_TXT"]
+
+# (worksheet, line, column) -> field, per the 2552-10 layout
+NUMERIC_FIELDS = {
+    ("S300001", "01400", "00200"): "Beds",
+    ("S300001", "02700", "01000"): "FTE",
+    ("G300000", "00300", "00100"): "Net_Patient_Revenue",
+    ("G300000", "00400", "00100"): "Operating_Cost",
+    ("S300002", "00100", "00200"): "Total_Salaries",
+    ("S300002", "01100", "00200"): "Contract_Labor",
+}
+ALPHA_FIELDS = {
+    ("S200001", "00200", "00100"): "City",
+    ("S200001", "00200", "00200"): "State",
+    ("S200001", "00300", "00100"): "Hospital",
+    ("S200001", "05600", "00100"): "Teaching",
+}
+
+# Worksheet A: one department record per cost-center line
+DEPARTMENT_WORKSHEET = "A000000"
+DEPARTMENT_COLUMNS = {"00100": "Salaries", "00700": "Total_Cost"}
+
+FILE_PATTERN = re.compile(r"HOSP10_(\d{4})_RPT\.CSV$", re.IGNORECASE)
+
+
+def _find(raw_dir, year, kind):
+    for path in Path(raw_dir).iterdir():
+        if path.name.upper() == f"HOSP10_{year}_{kind}.CSV":
+            return path
+    raise FileNotFoundError(f"HOSP10_{year}_{kind}.CSV not found in {raw_dir}")
+
+
+def discover_years(raw_dir):
+    years = set()
+    for path in Path(raw_dir).iterdir():
+        match = FILE_PATTERN.match(path.name)
+        if match:
+            years.add(int(match.group(1)))
+    return sorted(years)
+
+
+def _read_chunks(path, names, value_col, value_dtype, chunk_rows):
+    dtypes = {"RPT_REC_NUM": "int64", "WKSHT_CD": "string", "LINE_NUM": "string",
+              "CLMN_NUM": "string", value_col: value_dtype}
+    return pd.read_csv(path, header=None, names=names, dtype=dtypes, chunksize=chunk_rows)
+
+
+def _select_fields(chunk, fields, value_col):
+    """Rows of `chunk` matching the (worksheet, line, column) keys in `fields`, in long form."""
+    worksheets = {key[0] for key in fields}
+    part = chunk[chunk["WKSHT_CD"].isin(worksheets)]
+    if part.empty:
+        return None
+    keys = pd.MultiIndex.from_frame(part[["WKSHT_CD", "LINE_NUM", "CLMN_NUM"]])
+    wanted = keys.isin(list(fields))
+    part = part[wanted]
+    field = [fields[key] for key in keys[wanted]]
+    return pd.DataFrame({"RPT_REC_NUM": part["RPT_REC_NUM"].to_numpy(),
+                         "Field": field,
+                         "Value": part[value_col].to_numpy()})
+
+
+def _pivot_fields(pieces, fields):
+    columns = list(dict.fromkeys(fields.values()))
+    pieces = [p for p in pieces if p is not None]
+    if not pieces:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name="RPT_REC_NUM"))
+    long = pd.concat(pieces, ignore_index=True)
+    wide = long.pivot_table(index="RPT_REC_NUM", columns="Field", values="Value", aggfunc="first")
+    return wide.reindex(columns=columns)
+
+
+def read_alpha_fields(path, chunk_rows=CHUNK_ROWS):
+    pieces = [
+        _select_fields(chunk, ALPHA_FIELDS, "ITM_ALPHNMRC_ITM_TXT")
+        for chunk in _read_chunks(path, ALPHA_COLUMNS, "ITM_ALPHNMRC_ITM_TXT", "string", chunk_rows)
+    ]
+    return _pivot_fields(pieces, ALPHA_FIELDS)
+
+
+def _department_rows(chunk, providers):
+    part = chunk[(chunk["WKSHT_CD"] == DEPARTMENT_WORKSHEET)
+                 & chunk["CLMN_NUM"].isin(list(DEPARTMENT_COLUMNS))]
+    part = part[part["RPT_REC_NUM"].isin(providers.index)]
+    if part.empty:
+        return None
+    wide = part.pivot_table(index=["RPT_REC_NUM", "LINE_NUM"], columns="CLMN_NUM",
+                            values="ITM_VAL_NUM", aggfunc="sum")
+    wide = wide.rename(columns=DEPARTMENT_COLUMNS).reindex(columns=list(DEPARTMENT_COLUMNS.values()))
+    wide = wide.reset_index().rename(columns={"RPT_REC_NUM": "Report_Id", "LINE_NUM": "Cost_Center"})
+    wide["Provider_Number"] = providers.reindex(wide["Report_Id"]).to_numpy()
+    return wide
+
+
+def scan_numeric(path, providers, year, root=None, chunk_rows=CHUNK_ROWS):
+    """One pass over the NMRC file: pick the financial fields and stream department rows.
+
+    CMS publishes NMRC ordered by report, so the rows of the last report in
+    a chunk are carried into the next chunk rather than split across two
+    department row groups.
+    """
+    pieces = []
+    carry = None
+    with store.partition_writer("departments", year, root) as writer:
+        for chunk in _read_chunks(path, NMRC_COLUMNS, "ITM_VAL_NUM", "float64", chunk_rows):
+            pieces.append(_select_fields(chunk, NUMERIC_FIELDS, "ITM_VAL_NUM"))
+            if carry is not None:
+                chunk = pd.concat([carry, chunk], ignore_index=True)
+            last = chunk["RPT_REC_NUM"].iat[-1]
+            tail = chunk["RPT_REC_NUM"].to_numpy() == last
+            carry, chunk = chunk[tail], chunk[~tail]
+            rows = _department_rows(chunk, providers)
+            if rows is not None:
+                writer.write_table(store.to_arrow("departments", rows))
+        if carry is not None:
+            rows = _department_rows(carry, providers)
+            if rows is not None:
+                writer.write_table(store.to_arrow("departments", rows))
+    return _pivot_fields(pieces, NUMERIC_FIELDS)
+
+
+def _hospital_type(teaching):
+    is_teaching = teaching.fillna("").str.strip().str.upper().eq("Y").to_numpy(dtype=bool)
+    return np.where(is_teaching, "Teaching", "Non-Teaching")
+
+
+def build_financials(reports, numeric, alpha):
+    fin = reports.join(numeric, how="left").join(alpha[["State", "Teaching"]], how="left")
+    fin = fin.reset_index().rename(columns={"RPT_REC_NUM": "Report_Id", "PRVDR_NUM": "Provider_Number"})
+    fin["State"] = fin["State"].str.strip().str.upper()
+    fin["Type"] = _hospital_type(fin["Teaching"])
+    salaries = fin["Total_Salaries"].where(fin["Total_Salaries"] > 0)
+    fin["Contract_Labor_Pct"] = fin["Contract_Labor"] / salaries * 100
+    revenue = fin["Net_Patient_Revenue"].where(fin["Net_Patient_Revenue"] != 0)
+    fin["Operating_Margin"] = (revenue - fin["Operating_Cost"]) / revenue.abs() * 100
+    return fin
+
+
+def build_hospitals(reports, alpha):
+    hospitals = reports[["PRVDR_NUM"]].join(alpha, how="left").reset_index(drop=True)
+    hospitals = hospitals.rename(columns={"PRVDR_NUM": "Provider_Number"})
+    for column in ["Hospital", "City", "State"]:
+        hospitals[column] = hospitals[column].str.strip().str.upper()
+    hospitals["Type"] = _hospital_type(hospitals["Teaching"])
+    return hospitals
+
+
+def read_reports(path):
+    """Report headers, keeping the latest-ending report for each provider."""
+    reports = pd.read_csv(path, header=None, names=RPT_COLUMNS,
+                          usecols=["RPT_REC_NUM", "PRVDR_NUM", "FY_END_DT"],
+                          dtype={"RPT_REC_NUM": "int64", "PRVDR_NUM": "string", "FY_END_DT": "string"})
+    reports["FY_END_DT"] = pd.to_datetime(reports["FY_END_DT"], format="%m/%d/%Y", errors="coerce")
+    reports["PRVDR_NUM"] = reports["PRVDR_NUM"].str.strip().str.zfill(6)
+    reports = reports.sort_values(["PRVDR_NUM", "FY_END_DT", "RPT_REC_NUM"])
+    reports = reports.drop_duplicates("PRVDR_NUM", keep="last")
+    return reports.set_index("RPT_REC_NUM")[["PRVDR_NUM"]]
+
+
+def ingest_year(raw_dir, year, root=None, chunk_rows=CHUNK_ROWS):
+    """Ingest one fiscal year; rewrites that year's partitions only."""
+    reports = read_reports(_find(raw_dir, year, "RPT"))
+    alpha = read_alpha_fields(_find(raw_dir, year, "ALPHA"), chunk_rows)
+    numeric = scan_numeric(_find(raw_dir, year, "NMRC"), reports["PRVDR_NUM"], year, root, chunk_rows)
+    store.write_partition("hospitals", year, build_hospitals(reports, alpha), root)
+    financials = build_financials(reports, numeric, alpha)
+    store.write_partition("financials", year, financials, root)
+    return len(financials)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest CMS HCRIS cost report files.")
+    parser.add_argument("raw_dir")
+    parser.add_argument("years", nargs="*", type=int)
+    parser.add_argument("--warehouse", default=None)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    years = args.years or discover_years(args.raw_dir)
+    if not years:
+        parser.error(f"no HOSP10_<YEAR>_RPT.CSV files in {args.raw_dir}")
+    for year in years:
+        count = ingest_year(args.raw_dir, year, args.warehouse, args.chunk_rows)
+        print(f"{year}: {count:,} financial records")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
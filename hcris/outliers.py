@@ -0,0 +1,113 @@
+"""Robust outlier flags within each state and year.
+
+Each metric is scored against its own state-year group: a modified z-score
+from the group median and median absolute deviation (MAD), or Tukey's IQR
+fences.  Groups are reduced with grouped transforms, never a Python loop,
+and the scored records are stored one file per year with a manifest of the
+source partitions, like the rollup cube.  Every page reads its outlier
+counts and lists from these stored flags.
+"""
+import functools
+
+import numpy as np
+
+from hcris import store
+
+# metric -> how it is derived from a financial record
+METRICS = {
+    "Operating_Cost": lambda fin: fin["Operating_Cost"],
+    "FTE_per_Bed": lambda fin: fin["FTE"] / fin["Beds"].where(fin["Beds"] > 0),
+    "Revenue_per_Bed": lambda fin: fin["Net_Patient_Revenue"] / fin["Beds"].where(fin["Beds"] > 0),
+    "Contract_Labor_Pct": lambda fin: fin["Contract_Labor_Pct"],
+}
+
+METHODS = ("mad", "iqr")
+METHOD = "mad"
+MAD_THRESHOLD = 3.5  # |modified z| above this is an outlier (Iglewicz & Hoaglin)
+IQR_FENCE = 1.5
+MIN_GROUP = 5  # state-years with fewer reported values are never flagged
+
+SOURCE_COLUMNS = ["Report_Id", "Provider_Number", "State", "Type", "Beds", "FTE",
+                  "Net_Patient_Revenue", "Operating_Cost", "Contract_Labor_Pct"]
+
+
+def _score(values, groups, method):
+    """Score and outlier mask of `values` relative to their group."""
+    grouped = values.groupby(groups)
+    reported = grouped.transform("count")
+    if method == "mad":
+        median = grouped.transform("median")
+        deviation = (values - median).abs()
+        mad = deviation.groupby(groups).transform("median")
+        score = 0.6745 * (values - median) / mad.where(mad > 0)
+        flagged = score.abs() > MAD_THRESHOLD
+    elif method == "iqr":
+        q1 = grouped.transform("quantile", 0.25)
+        q3 = grouped.transform("quantile", 0.75)
+        iqr = q3 - q1
+        # distance beyond the nearer fence, in IQRs (0 inside the fences)
+        score = ((values - (q3 + IQR_FENCE * iqr)).clip(lower=0)
+                 - ((q1 - IQR_FENCE * iqr) - values).clip(lower=0)) / iqr.where(iqr > 0)
+        flagged = score != 0
+    else:
+        raise ValueError(f"unknown outlier method {method!r}; expected one of {METHODS}")
+    flagged &= score.notna() & (reported >= MIN_GROUP)
+    return score, flagged
+
+
+def score_year(fin, method=METHOD):
+    """One row per record: each metric's value, score and outlier flag."""
+    scored = fin[["Report_Id", "Provider_Number", "State", "Type", "Beds", "FTE"]].copy()
+    for metric, derive in METRICS.items():
+        values = derive(fin).astype("float64")
+        score, flagged = _score(values, fin["State"], method)
+        scored[metric] = values
+        scored[f"{metric}_Score"] = score
+        scored[f"{metric}_Outlier"] = flagged.to_numpy()
+    return scored
+
+
+def top_k(flags, metric, k, outliers_only=True):
+    """The `k` records with the largest `metric`, largest first.
+
+    Uses a partial selection (argpartition), so only the k selected rows
+    are ever sorted.
+    """
+    if outliers_only:
+        flags = flags[flags[f"{metric}_Outlier"]]
+    values = flags[metric].to_numpy(dtype="float64", na_value=np.nan)
+    values = np.where(np.isnan(values), -np.inf, values)
+    k = min(k, int(np.isfinite(values).sum()))
+    if k == 0:
+        return flags.iloc[:0]
+    picked = np.argpartition(values, len(values) - k)[-k:]
+    picked = picked[np.argsort(values[picked])[::-1]]
+    return flags.iloc[picked]
+
+
+def flags_path(year, root=None):
+    return store.derived_dir("outliers", root) / f"flags_{int(year)}.parquet"
+
+
+def sources(root=None, method=METHOD):
+    """Year -> financials fingerprint plus the scoring settings each flags file reflects."""
+    settings = f"{method}:{MAD_THRESHOLD}:{IQR_FENCE}:{MIN_GROUP}"
+    return {year: f"{store.fingerprint('financials', year, root)}|{settings}"
+            for year in store.list_years("financials", root)}
+
+
+def build_file(year, root=None, method=METHOD):
+    fin = store.read_table("financials", columns=SOURCE_COLUMNS, years=[year], root=root)
+    score_year(fin, method).to_parquet(flags_path(year, root), index=False)
+
+
+def refresh(root=None, method=METHOD):
+    """Re-score years whose financials partition or settings changed; return those years."""
+    build = functools.partial(build_file, method=method)
+    return store.refresh_derived("outliers", sources(root, method), build, flags_path, root)
+
+
+def load_flags(root=None, method=METHOD):
+    """Scored records for every year, refreshed against the warehouse first."""
+    refresh(root, method)
+    return store.read_derived("outliers", flags_path, root)
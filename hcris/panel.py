@@ -0,0 +1,145 @@
+"""Hospital x year panel of outlier metrics and flags.
+
+The scored hospital-year records (hcris.outliers) are aligned into dense
+(hospitals, years) arrays, one per metric value and outlier flag.  Each
+year's provider numbers are sorted and merge-joined against the sorted
+union of every year's keys (a binary-search merge, no hashing and no loop
+per hospital), so row i of every array is the same hospital.  Persistence
+counts and year-over-year deltas are then single array operations over
+the whole panel.
+
+    grid = panel.build(flags)
+    flagged = panel.years_flagged(grid, "Contract_Labor_Pct")
+    persistent = panel.persistent(grid, min_years=3)
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from hcris import outliers
+
+
+class Panel(NamedTuple):
+    providers: np.ndarray  # sorted provider numbers, one per row
+    years: np.ndarray      # sorted years, one per column
+    values: dict           # metric -> float64 (hospitals, years), NaN where not reported
+    flags: dict            # metric -> bool (hospitals, years)
+
+
+def _merge_join(keys, sorted_keys):
+    """Positions of `keys` in `sorted_keys`, which must contain them all.
+
+    `keys` is sorted first, so the lookups walk `sorted_keys` in order --
+    the merge step of a sort-merge join."""
+    order = np.argsort(keys, kind="stable")
+    positions = np.empty(len(keys), dtype=np.intp)
+    positions[order] = np.searchsorted(sorted_keys, keys[order])
+    return positions
+
+
+def build(flags, metrics=tuple(outliers.METRICS)):
+    """Panel of `metrics` from scored records (Year, Provider_Number and, per
+    metric, the value and `<metric>_Outlier` columns)."""
+    providers = flags["Provider_Number"].to_numpy(dtype=str)
+    record_years = flags["Year"].to_numpy(dtype=int)
+    years = np.unique(record_years)
+    keys = np.unique(providers)
+
+    rows = np.empty(len(flags), dtype=np.intp)
+    for year in years:
+        in_year = record_years == year
+        rows[in_year] = _merge_join(providers[in_year], keys)
+    columns = np.searchsorted(years, record_years)
+
+    values, flagged = {}, {}
+    for metric in metrics:
+        grid = np.full((len(keys), len(years)), np.nan)
+        grid[rows, columns] = flags[metric].to_numpy(dtype="float64", na_value=np.nan)
+        mask = np.zeros((len(keys), len(years)), dtype=bool)
+        mask[rows, columns] = flags[f"{metric}_Outlier"].to_numpy(dtype=bool, na_value=False)
+        values[metric], flagged[metric] = grid, mask
+    return Panel(keys, years, values, flagged)
+
+
+def years_flagged(panel, metric):
+    """Per hospital, the number of years `metric` was an outlier."""
+    return panel.flags[metric].sum(axis=1)
+
+
+def years_reported(panel, metric):
+    """Per hospital, the number of years `metric` was reported."""
+    return (~np.isnan(panel.values[metric])).sum(axis=1)
+
+
+def persistent(panel, min_years, metrics=None):
+    """Boolean (hospitals, metrics) mask: flagged in at least `min_years` of
+    the panel's years, for each of `metrics` (default: all)."""
+    metrics = list(panel.flags) if metrics is None else list(metrics)
+    return np.column_stack([years_flagged(panel, metric) >= min_years for metric in metrics])
+
+
+def deltas(panel, metric):
+    """Year-over-year change of `metric`, shape (hospitals, years); the first
+    year, and any year with either value missing, is NaN."""
+    values = panel.values[metric]
+    change = np.full(values.shape, np.nan)
+    change[:, 1:] = values[:, 1:] - values[:, :-1]
+    return change
+
+
+def _last_reported(values):
+    """Per row, the last non-NaN value (NaN if none)."""
+    reported = ~np.isnan(values)
+    last = values.shape[1] - 1 - np.argmax(reported[:, ::-1], axis=1)
+    return np.where(reported.any(axis=1), values[np.arange(len(values)), last], np.nan)
+
+
+def persistence_table(panel, min_years, metrics=None):
+    """One row per (hospital, metric) flagged in at least `min_years` years:
+    Provider_Number, Metric, Years_Flagged, Years_Reported, Latest_Value,
+    Latest_Change (last year-over-year delta) and Mean_Change; most
+    persistent first."""
+    metrics = list(panel.flags) if metrics is None else list(metrics)
+    frames = []
+    for metric in metrics:
+        flagged = years_flagged(panel, metric)
+        rows = np.flatnonzero(flagged >= min_years)
+        change = deltas(panel, metric)[rows]
+        reported = ~np.isnan(change)
+        frames.append(pd.DataFrame({
+            "Provider_Number": panel.providers[rows],
+            "Metric": metric,
+            "Years_Flagged": flagged[rows],
+            "Years_Reported": years_reported(panel, metric)[rows],
+            "Latest_Value": _last_reported(panel.values[metric][rows]),
+            "Latest_Change": _last_reported(change),
+            "Mean_Change": np.where(reported.any(axis=1),
+                                    np.nansum(change, axis=1) / np.maximum(reported.sum(axis=1), 1), np.nan),
+        }))
+    table = pd.concat(frames, ignore_index=True)
+    return table.sort_values(["Years_Flagged", "Metric", "Provider_Number"], ascending=[False, True, True],
+                             ignore_index=True)
+
+
+def most_persistent(panel, metric, min_years, top_n):
+    """Rows of the `top_n` hospitals flagged on `metric` in the most years (at
+    least `min_years`), ties broken by the larger latest value."""
+    flagged = years_flagged(panel, metric)
+    rows = np.flatnonzero(flagged >= min_years)
+    latest = _last_reported(panel.values[metric][rows])
+    order = np.lexsort((-np.nan_to_num(latest, nan=-np.inf), -flagged[rows]))
+    return rows[order[:top_n]]
+
+
+def trends(panel, metric, rows):
+    """Long frame (Provider_Number, Year, value, YoY_Change) of `metric` for
+    the hospitals at `rows`, in every year they reported it."""
+    values = panel.values[metric][rows]
+    frame = pd.DataFrame({
+        "Provider_Number": np.repeat(panel.providers[rows], len(panel.years)),
+        "Year": np.tile(panel.years, len(rows)),
+        metric: values.ravel(),
+        "YoY_Change": deltas(panel, metric)[rows].ravel(),
+    })
+    return frame[~np.isnan(values.ravel())].reset_index(drop=True)
@@ -0,0 +1,109 @@
+"""Peer groups: each hospital's nearest neighbours on size and teaching status.
+
+Hospitals are placed in a small feature space -- log beds, log net patient
+revenue and log FTE, each standardized over the year's hospitals, plus
+teaching status -- and a KD-tree (scipy cKDTree) over those points answers
+nearest-peer queries.  One hospital's peers cost O(k log n); every
+hospital's peers at once O(n k log n), which is seconds for tens of
+thousands of hospitals where a full distance matrix is O(n^2).
+
+    index = PeerIndex(store.read_table("financials", years=[2023]))
+    peers = index.peers("050441", k=25)
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+FEATURES = ("Beds", "Net_Patient_Revenue", "FTE")
+# Distance added between a teaching and a non-teaching hospital, in
+# standard deviations of the size features: large enough that peers come
+# from the same group unless it has no hospital of similar size
+TEACHING_WEIGHT = 2.0
+DEFAULT_K = 25
+# Values compared against the peer distribution
+METRICS = ("Contract_Labor_Pct", "Operating_Margin", "Revenue_per_Bed")
+
+
+def features(records):
+    """(points, usable) for `records`: one row of standardized log FEATURES and
+    weighted teaching flag per usable record (all FEATURES positive), and the
+    boolean mask of those records."""
+    size = np.column_stack([records[name].to_numpy(dtype="float64", na_value=np.nan) for name in FEATURES])
+    usable = (size > 0).all(axis=1)
+    logs = np.log(size[usable])
+    spread = logs.std(axis=0)
+    scaled = (logs - logs.mean(axis=0)) / np.where(spread > 0, spread, 1.0)
+    teaching = records["Type"].to_numpy(dtype=object)[usable] == "Teaching"
+    return np.column_stack([scaled, teaching * TEACHING_WEIGHT]), usable
+
+
+class PeerIndex:
+    def __init__(self, records):
+        """Index one year of financial records (Provider_Number, Type, FEATURES,
+        Contract_Labor_Pct, Operating_Margin); records missing a size feature
+        are left out."""
+        points, usable = features(records)
+        records = records[usable].reset_index(drop=True)
+        beds = records["Beds"].to_numpy(dtype="float64", na_value=np.nan)
+        revenue = records["Net_Patient_Revenue"].to_numpy(dtype="float64", na_value=np.nan)
+        self.records = records.assign(Revenue_per_Bed=revenue / beds)
+        self.providers = self.records["Provider_Number"].astype(str).to_numpy()
+        self._positions = dict(zip(self.providers.tolist(), range(len(self.providers))))
+        self._points = points
+        self._tree = cKDTree(points)
+
+    def __len__(self):
+        return len(self.providers)
+
+    def __contains__(self, provider_number):
+        return provider_number in self._positions
+
+    def _query(self, positions, k):
+        """(ids, distances), shape (len(positions), k): the k nearest points to
+        each position, the position itself excluded."""
+        # a list of ranks keeps the result 2-D even for k + 1 == 1
+        distances, ids = self._tree.query(self._points[positions], k=list(range(1, k + 2)))
+        # a hospital is normally its own first neighbour, but exact
+        # duplicates can tie with it; drop it wherever it landed, or the
+        # farthest neighbour when it did not land at all
+        own = ids == np.asarray(positions)[:, None]
+        own[~own.any(axis=1), -1] = True
+        keep = ~own
+        return ids[keep].reshape(len(positions), k), distances[keep].reshape(len(positions), k)
+
+    def record(self, provider_number):
+        """The indexed record of `provider_number` (with Revenue_per_Bed), or None."""
+        position = self._positions.get(provider_number)
+        return None if position is None else self.records.iloc[position]
+
+    def peers(self, provider_number, k=DEFAULT_K):
+        """Records of the `k` hospitals nearest `provider_number`, nearest first,
+        with a Distance column; None if the hospital is not indexed."""
+        position = self._positions.get(provider_number)
+        if position is None:
+            return None
+        k = min(k, len(self) - 1)
+        if k < 1:
+            return self.records.iloc[:0].assign(Distance=pd.Series(dtype="float64"))
+        ids, distances = self._query([position], k)
+        return self.records.iloc[ids[0]].assign(Distance=distances[0]).reset_index(drop=True)
+
+    def all_peers(self, k=DEFAULT_K):
+        """(ids, distances), shape (len(self), k): every hospital's k nearest
+        peers as row positions in `records`, in one batched tree query."""
+        k = min(k, len(self) - 1)
+        return self._query(np.arange(len(self)), k)
+
+    def peer_medians(self, k=DEFAULT_K):
+        """Every hospital's Provider_Number and the median of each of METRICS
+        over its `k` peers (NaN values ignored)."""
+        ids, _ = self.all_peers(k)
+        medians = {"Provider_Number": self.providers}
+        for metric in METRICS:
+            values = self.records[metric].to_numpy(dtype="float64", na_value=np.nan)[ids]
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # hospitals whose peers all lack the metric
+                medians[metric] = np.nanmedian(values, axis=1) if values.size else np.full(len(self), np.nan)
+        return pd.DataFrame(medians)
@@ -0,0 +1,107 @@
+"""Build every derived aggregate up front, in parallel.
+
+Each stale (result family, year) pair -- rollup cube, quantile sketches,
+quality checks, outlier flags, department arrays -- is one task, and the
+SQLite hospital database is another.  Tasks run
+on a process pool.  Workers only write their own result file; manifests
+are updated here in the parent as tasks finish, so nothing races on them.
+
+    python -m hcris.precompute [--workers N] [--warehouse DIR]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+from hcris import db, departments, outliers, quality, rollups, sketches, store
+
+WORKERS = int(os.environ.get("HCRIS_PRECOMPUTE_WORKERS", "0")) or os.cpu_count() or 1
+
+# family -> (sources(root), build_file(year, root), path(year, root))
+FAMILIES = {
+    "rollups": (rollups.sources, rollups.build_file, rollups.cube_path),
+    "sketches": (sketches.sources, sketches.build_file, sketches.sketch_path),
+    "quality": (quality.sources, quality.build_file, quality.result_path),
+    "outliers": (outliers.sources, outliers.build_file, outliers.flags_path),
+    "departments": (departments.sources, departments.build_file, departments.year_dir),
+}
+
+
+def _build_database(year, root=None):
+    db.build(root)
+
+
+def plan(root=None):
+    """The stale tasks as (family, year, build) plus each family's sources."""
+    tasks, sources = [], {}
+    for family, (family_sources, build, path) in FAMILIES.items():
+        sources[family] = family_sources(root)
+        tasks += [(family, year, build) for year in store.stale_years(family, sources[family], path, root)]
+    if not db.is_current(root):
+        tasks.append(("sqlite", None, _build_database))
+    return tasks, sources
+
+
+def run(root=None, workers=WORKERS, progress=None):
+    """Run every stale task; `progress(done, total, label)` is called as each finishes.
+
+    Returns the number of tasks run.  If a task fails, the tasks that
+    finished are still recorded in their manifests before the error is
+    raised, so the next run only retries the rest.
+    """
+    tasks, sources = plan(root)
+    built = {family: [] for family in FAMILIES}
+    done = 0
+
+    def finished(family, year):
+        nonlocal done
+        done += 1
+        if family in built:
+            built[family].append(year)
+        if progress is not None:
+            progress(done, len(tasks), family if year is None else f"{family} {year}")
+
+    try:
+        if workers <= 1 or len(tasks) <= 1:
+            for family, year, build in tasks:
+                build(year, root)
+                finished(family, year)
+        elif tasks:
+            # spawned workers: forking a process that already runs threads
+            # (the Streamlit server) is not safe
+            with ProcessPoolExecutor(min(workers, len(tasks)), mp_context=get_context("spawn")) as pool:
+                futures = {pool.submit(build, year, root): (family, year) for family, year, build in tasks}
+                failed = None
+                for future in as_completed(futures):
+                    if future.exception() is not None:
+                        failed = failed or future.exception()
+                        continue
+                    finished(*futures[future])
+                if failed is not None:
+                    raise failed
+    finally:
+        # record what did finish even if a task failed, so it is not rebuilt
+        for family, (_, _, path) in FAMILIES.items():
+            store.record_years(family, sources[family], built[family], path, root)
+    return len(tasks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the dashboard's derived aggregates.")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--warehouse", default=None)
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+
+    def report(done, total, label):
+        print(f"[{done}/{total}] {label}")
+
+    count = run(args.warehouse, args.workers, report)
+    print(f"{count} task(s) in {time.perf_counter() - start:.1f}s with {args.workers} worker(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Data-quality rules evaluated per year partition.
+
+All checks for a year run as vectorized column operations over that
+year's financial and department records: negative values, field
+completeness, orphaned foreign keys (hash anti-joins) and FTE-per-bed
+plausibility.  Results are stored one row per year with a manifest of the
+source partitions they came from, so `refresh()` re-checks only years
+whose data changed.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from hcris import store
+
+# Staffing outside this range of FTEs per bed is flagged as implausible
+FTE_PER_BED_RANGE = (1.0, 20.0)
+
+COMPLETENESS_FIELDS = {
+    "Revenue_Complete": "Net_Patient_Revenue",
+    "Cost_Complete": "Operating_Cost",
+    "FTE_Complete": "FTE",
+    "Contract_Complete": "Contract_Labor",
+    "Beds_Complete": "Beds",
+}
+
+# result column -> (issue label, severity when any are found)
+ISSUES = {
+    "Negative_Revenue": ("Negative Revenue", "High"),
+    "Negative_Operating_Cost": ("Negative Operating Cost", "High"),
+    "Negative_FTE": ("Negative FTE", "High"),
+    "Negative_Contract_Labor": ("Negative Contract Labor", "Medium"),
+    "Negative_Department_Cost": ("Negative Department Cost", "Medium"),
+    "Implausible_FTE_per_Bed": ("Implausible FTE per Bed", "Medium"),
+}
+
+FINANCIAL_COLUMNS = ["Report_Id", "Provider_Number", "Beds", "FTE", "Net_Patient_Revenue",
+                     "Operating_Cost", "Contract_Labor"]
+
+
+def _anti_join(keys, reference):
+    """Mask of `keys` with no match in `reference`, via a hash lookup."""
+    return pd.Index(reference).unique().get_indexer(keys) == -1
+
+
+def check_year(fin, dept, providers):
+    """Every rule for one year's records; returns a dict of results."""
+    result = {"Records": len(fin), "Department_Records": len(dept)}
+
+    for column, field in COMPLETENESS_FIELDS.items():
+        result[column] = float(fin[field].notna().mean() * 100) if len(fin) else np.nan
+
+    result["Negative_Revenue"] = int((fin["Net_Patient_Revenue"] < 0).sum())
+    result["Negative_Operating_Cost"] = int((fin["Operating_Cost"] < 0).sum())
+    result["Negative_FTE"] = int((fin["FTE"] < 0).sum())
+    result["Negative_Contract_Labor"] = int((fin["Contract_Labor"] < 0).sum())
+    result["Negative_Department_Cost"] = int((dept["Total_Cost"] < 0).sum())
+
+    result["Orphaned_Financial"] = int(_anti_join(fin["Provider_Number"], providers).sum())
+    result["Orphaned_Department"] = int(_anti_join(dept["Report_Id"], fin["Report_Id"]).sum())
+
+    beds = fin["Beds"].where(fin["Beds"] > 0)
+    ratio = fin["FTE"] / beds
+    low, high = FTE_PER_BED_RANGE
+    result["Implausible_FTE_per_Bed"] = int(((ratio < low) | (ratio > high)).sum())
+    return result
+
+
+def result_path(year, root=None):
+    return store.derived_dir("quality", root) / f"checks_{int(year)}.parquet"
+
+
+def _providers_version(root=None):
+    digest = hashlib.sha1()
+    for year in store.list_years("hospitals", root):
+        digest.update(f"{year}/{store.fingerprint('hospitals', year, root)};".encode())
+    return digest.hexdigest()[:12]
+
+
+def sources(root=None):
+    """Year -> fingerprints of the partitions (and provider list) each year's checks read."""
+    providers_version = _providers_version(root)
+    return {
+        year: "|".join(map(str, [store.fingerprint(t, year, root) for t in ("financials", "departments")]
+                               + [providers_version]))
+        for year in store.list_years("financials", root)
+    }
+
+
+def build_file(year, root=None):
+    providers = store.read_table("hospitals", columns=["Provider_Number"], root=root)["Provider_Number"]
+    fin = store.read_table("financials", columns=FINANCIAL_COLUMNS, years=[year], root=root)
+    dept = store.read_table("departments", columns=["Report_Id", "Total_Cost"], years=[year], root=root)
+    pd.DataFrame([check_year(fin, dept, providers)]).to_parquet(result_path(year, root), index=False)
+
+
+def refresh(root=None):
+    """Re-run the checks for years whose source partitions changed; return those years."""
+    return store.refresh_derived("quality", sources(root), build_file, result_path, root)
+
+
+def load_results(root=None):
+    """Check results, one row per year, refreshed against the warehouse first."""
+    refresh(root)
+    return store.read_derived("quality", result_path, root)
+
+
+def issue_counts(results):
+    """Issue totals across years with their severity ('None' when clean)."""
+    totals = results[list(ISSUES)].sum()
+    return pd.DataFrame({
+        "Issue Type": [label for label, _ in ISSUES.values()],
+        "Count": totals.to_numpy(),
+        "Severity": [severity if totals[key] else "None" for key, (_, severity) in ISSUES.items()],
+    })
@@ -0,0 +1,185 @@
+"""Process-wide cache of computed results, shared by every session.
+
+Entries are keyed on normalized filter state plus the data version (see
+`make_key`), expire after a TTL, and are evicted least-recently-used once
+the total estimated size passes a byte budget.  Lookups are single-flight:
+when several sessions ask for the same missing key at once, one computes
+it and the others wait for its result instead of repeating the work.
+
+Cached values are handed to every caller as-is, so they must be treated as
+immutable (Arrow tables, strings, read-only mappings).
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+
+def _normalize(value):
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _normalize(item)) for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_normalize(item) for item in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(item) for item in value)
+    if isinstance(value, np.ndarray):
+        return tuple(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, "tolist"):  # pandas Series / Index
+        return tuple(value.tolist())
+    return value
+
+
+def make_key(namespace, *args, **filters):
+    """Hashable key for `namespace` called with `args` and `filters`.
+
+    Mappings and sets are sorted, sequences and arrays become tuples and
+    numpy scalars plain Python values, so equal filter states share a key.
+    """
+    return (namespace, _normalize(args), _normalize(filters))
+
+
+def sizeof(value):
+    """Approximate memory held by `value`, in bytes."""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if hasattr(value, "memory_usage"):  # DataFrame
+        return int(value.memory_usage(deep=True).sum())
+    if hasattr(value, "nbytes"):  # Arrow table, numpy array
+        return int(value.nbytes)
+    if isinstance(value, Mapping):
+        return sys.getsizeof(value) + sum(sizeof(key) + sizeof(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class _Flight:
+    """One in-progress computation that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultCache:
+    def __init__(self, max_bytes=256 * 2**20, max_entries=4096, ttl=3600.0):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (value, size, expires)
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.coalesced = self.evictions = self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _lookup(self, key, now):
+        """(found, value) for `key`, expiring it if stale.  Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[2] <= now:
+            self._drop(key)
+            self.expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[0]
+
+    def get(self, key, default=None):
+        with self._lock:
+            found, value = self._lookup(key, time.monotonic())
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Store `value` under `key` (unless it alone exceeds the budget); return it."""
+        size = sizeof(value)
+        if size > self.max_bytes:
+            return value
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            for stale in [k for k, (_, _, expires) in self._entries.items() if expires <= now]:
+                self._drop(stale)
+                self.expirations += 1
+            self._entries[key] = (value, size, now + self.ttl)
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Cached value for `key`, calling `compute()` only on a miss.
+
+        Concurrent misses on one key share a single `compute()` call; if it
+        raises, every waiting caller gets the exception.
+        """
+        with self._lock:
+            found, value = self._lookup(key, time.monotonic())
+            if found:
+                self.hits += 1
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = self.put(key, compute())
+            return flight.value
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "size_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
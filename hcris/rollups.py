@@ -0,0 +1,100 @@
+"""Materialized Year x State x Type rollup cube over the financial records.
+
+Every cell holds additive measures (counts and sums), so any coarser view --
+by year, by state, by year and state -- is a sum over cells and never
+touches hospital-level rows.  The cube is stored one file per year next to
+the warehouse, with a manifest recording which source partition each year
+was built from; `refresh()` rebuilds only the years whose partition changed.
+"""
+import numpy as np
+import pandas as pd
+
+from hcris import outliers, store
+
+KEYS = ["Year", "State", "Type"]
+EXTREME_MARGIN = 50  # operating margin %, either direction
+
+# metric -> how it is derived from a financial record; each has a _Sum and
+# a _Reported (non-missing count) measure, so any rollup can take its mean
+METRICS = dict(outliers.METRICS, Operating_Margin=lambda fin: fin["Operating_Margin"])
+
+SOURCE_COLUMNS = ["State", "Type", "Beds", "Net_Patient_Revenue", "Operating_Cost", "FTE",
+                  "Contract_Labor_Pct", "Operating_Margin"]
+
+
+def cube_path(year, root=None):
+    return store.derived_dir("rollups", root) / f"cube_{int(year)}.parquet"
+
+
+def _values(column):
+    return column.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def measures(fin):
+    """The additive measures of each financial record, on `fin`'s index."""
+    margin = _values(fin["Operating_Margin"])
+    with np.errstate(invalid="ignore"):
+        measures = pd.DataFrame({
+            "Hospital_Count": np.ones(len(fin), dtype=np.int64),
+            "Margin_Extreme_Negative": (margin < -EXTREME_MARGIN).astype(np.int64),
+            "Margin_Extreme_Positive": (margin > EXTREME_MARGIN).astype(np.int64),
+        }, index=fin.index)
+    for metric, derive in METRICS.items():
+        # scored records (the outlier flags) already carry the derived metrics
+        values = _values(fin[metric] if metric in fin else derive(fin))
+        measures[f"{metric}_Reported"] = (~np.isnan(values)).astype(np.int64)
+        measures[f"{metric}_Sum"] = np.nan_to_num(values)
+    return measures
+
+
+def aggregate(records, by):
+    """`records`' measures summed per `by` columns of `records`."""
+    return pd.concat([records[by], measures(records)], axis=1).groupby(by, sort=True).sum()
+
+
+def build_year(fin):
+    """Cube cells for one year's financial records."""
+    return aggregate(fin, ["State", "Type"]).reset_index()
+
+
+def sources(root=None):
+    """Year -> financials fingerprint plus the measures each cube file is built with."""
+    settings = f"{EXTREME_MARGIN}:{','.join(METRICS)}"
+    return {year: f"{store.fingerprint('financials', year, root)}|{settings}"
+            for year in store.list_years("financials", root)}
+
+
+def build_file(year, root=None):
+    fin = store.read_table("financials", columns=SOURCE_COLUMNS, years=[year], root=root)
+    build_year(fin).to_parquet(cube_path(year, root), index=False)
+
+
+def refresh(root=None):
+    """Rebuild cube files for years whose financials partition changed; return rebuilt years."""
+    return store.refresh_derived("rollups", sources(root), build_file, cube_path, root)
+
+
+def load_cube(root=None):
+    """All cube cells, refreshed against the warehouse first."""
+    refresh(root)
+    return store.read_derived("rollups", cube_path, root)
+
+
+def rollup(cube, by, years=None, states=None, types=None):
+    """Sum cube cells up to the `by` keys, after optional cell filters."""
+    cells = cube
+    if years is not None:
+        cells = cells[cells["Year"].isin(years)]
+    if states is not None:
+        cells = cells[cells["State"].isin(states)]
+    if types is not None:
+        cells = cells[cells["Type"].isin(types)]
+    return cells.drop(columns=[k for k in KEYS if k not in by]).groupby(by).sum()
+
+
+def mean(cells, metric):
+    """Mean of `metric` in each row of `cells` (cube cells or a rollup); NaN
+    where no value was reported."""
+    reported = cells[f"{metric}_Reported"].to_numpy(dtype="float64")
+    total = cells[f"{metric}_Sum"].to_numpy(dtype="float64")
+    return pd.Series(total / np.where(reported > 0, reported, np.nan), index=cells.index)
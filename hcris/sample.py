@@ -0,0 +1,242 @@
+"""Synthetic HCRIS-shaped sample warehouse.
+
+Used when no raw CMS files have been ingested, and by the benchmarks to
+build scaled-up datasets.  Volumes and distributions are calibrated to the
+2021-2024 extraction log (6,229 hospitals, 21,649 financial records,
+roughly 150k department records), so the dashboard looks like the real
+thing without shipping CMS data.
+
+    python -m hcris.sample [--scale N] [--warehouse DIR]
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from hcris import store
+
+N_HOSPITALS = 6229
+YEAR_COUNTS = {2021: 6056, 2022: 6066, 2023: 6103, 2024: 3424}
+TEACHING_SHARE = 1496 / N_HOSPITALS
+DEPARTMENTS_PER_REPORT = 6.9
+
+# Hospital counts and mean operating cost for the largest states in the log
+STATE_PROFILE = {
+    "TX": (570, 186662556), "CA": (396, 439031724), "FL": (261, 303463674),
+    "OH": (220, 299311128), "PA": (203, 325987469), "LA": (195, 103938058),
+    "IL": (199, 266668769), "IN": (169, 192137948), "NY": (164, 704628680),
+    "GA": (160, 226425251),
+}
+OTHER_STATES = [
+    "AL", "AK", "AZ", "AR", "CO", "CT", "DE", "DC", "HI", "ID", "IA", "KS", "KY",
+    "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM",
+    "NC", "ND", "OK", "OR", "RI", "SC", "SD", "TN", "UT", "VT", "VA", "WA", "WV",
+    "WI", "WY",
+]
+TERRITORIES = ["PR", "GU", "VI", "AS", "MP"]
+NATIONAL_MEAN_COST = 260_000_000
+
+# Named hospitals from the log, kept so familiar outliers still show up
+ANCHORS = [
+    # name, state, type, beds, 2023 operating cost, contract labor %
+    ("NEW YORK PRESBYTERIAN HOSPITAL", "NY", "Teaching", 2600, 9818337999, 2.4),
+    ("NYU LANGONE HOSPITALS", "NY", "Teaching", 1900, 8956110402, 2.1),
+    ("CLEVELAND CLINIC HOSPITAL", "OH", "Teaching", 1300, 8323985995, 1.8),
+    ("STANFORD HEALTH CARE", "CA", "Teaching", 620, 7425866725, 2.6),
+    ("UCSF MEDICAL CENTER", "CA", "Teaching", 800, 5835800029, 2.2),
+    ("UT MD ANDERSON CANCER CENTER", "TX", "Teaching", 680, 5471697134, 1.5),
+    ("SAME DAY SURGERY CENTER", "SD", "Non-Teaching", 4, 6500000, 41.1),
+    ("BLACK HILLS SURGICAL HOSPITAL LLP", "SD", "Non-Teaching", 12, 52000000, 20.2),
+    ("SALINA SURGICAL HOSPITAL", "KS", "Non-Teaching", 10, 31000000, 17.8),
+    ("STRAITH HOSPITAL FOR SPECIAL SURGERY", "MI", "Non-Teaching", 20, 45000000, 18.6),
+    ("HEBREW REHABILITATION CENTER", "MA", "Non-Teaching", 667, 420000000, 3.1),
+    ("DALLAS CO. HOSP. DIST.", "TX", "Teaching", 786, 2100000000, 2.0),
+    ("OU MEDICAL CENTER", "OK", "Teaching", 819, 1500000000, 2.7),
+    ("YALE NEW HAVEN HOSPITAL", "CT", "Teaching", 1306, 4200000000, 1.9),
+    ("CHRISTIANA CARE HEALTH SYSTEM", "DE", "Teaching", 1172, 2300000000, 2.3),
+]
+
+NAME_PLACES = [
+    "MERCY", "ST. JOSEPH", "ST. MARY'S", "BAPTIST", "METHODIST", "PRESBYTERIAN",
+    "GOOD SAMARITAN", "SACRED HEART", "PROVIDENCE", "TRINITY", "UNITY", "GRACE",
+    "VALLEY", "LAKESIDE", "RIVERSIDE", "HILLCREST", "PARKVIEW", "NORTHSIDE",
+    "SOUTHEAST", "WESTERN", "CENTRAL", "COUNTY", "CHILDREN'S", "VETERANS",
+    "ADVENTIST", "LUTHERAN", "ST. LUKE'S", "ST. FRANCIS", "HOLY CROSS", "MOUNT CARMEL",
+    "CEDAR", "PINE RIDGE", "OAKWOOD", "MAPLE GROVE", "WILLOW CREEK", "SUMMIT",
+    "BAYSHORE", "PRAIRIE", "MOUNTAIN VIEW", "DESERT", "COASTAL", "HERITAGE",
+]
+NAME_SUFFIXES = [
+    "HOSPITAL", "MEDICAL CENTER", "REGIONAL MEDICAL CENTER", "MEMORIAL HOSPITAL",
+    "COMMUNITY HOSPITAL", "HEALTH CENTER", "GENERAL HOSPITAL", "REHABILITATION HOSPITAL",
+    "SURGICAL HOSPITAL", "CRITICAL ACCESS HOSPITAL",
+]
+NAME_TOWNS = [
+    "SPRINGFIELD", "FRANKLIN", "GREENVILLE", "BRISTOL", "CLINTON", "FAIRVIEW",
+    "SALEM", "MADISON", "GEORGETOWN", "ARLINGTON", "ASHLAND", "BURLINGTON",
+    "CHESTER", "DOVER", "HUDSON", "JACKSON", "KINGSTON", "LEBANON", "MARION",
+    "MILTON", "NEWPORT", "OXFORD", "RICHMOND", "SHELBY", "WINCHESTER", "AUBURN",
+]
+
+# Share of non-null values per field, and rate of sign-flipped entries
+COMPLETENESS = {"Net_Patient_Revenue": 0.962, "Operating_Cost": 0.987,
+                "FTE": 0.833, "Contract_Labor": 0.717, "Beds": 0.99}
+NEGATIVE_RATE = {"Net_Patient_Revenue": 0.0011, "Operating_Cost": 0.0003, "Contract_Labor": 0.0004}
+
+
+def _state_weights(rng):
+    states = list(STATE_PROFILE) + OTHER_STATES + TERRITORIES
+    counts = [count for count, _ in STATE_PROFILE.values()]
+    counts += list(rng.integers(8, 150, len(OTHER_STATES)))
+    counts += list(rng.integers(1, 12, len(TERRITORIES)))
+    weights = np.asarray(counts, dtype=float)
+    cost_factor = np.ones(len(states))
+    cost_factor[:len(STATE_PROFILE)] = [cost / NATIONAL_MEAN_COST for _, cost in STATE_PROFILE.values()]
+    cost_factor[len(STATE_PROFILE):] = rng.lognormal(0, 0.25, len(states) - len(STATE_PROFILE))
+    return np.asarray(states), weights / weights.sum(), cost_factor
+
+
+def generate_hospitals(scale=1, seed=42):
+    """Static attributes for every synthetic provider."""
+    rng = np.random.default_rng(seed)
+    n = N_HOSPITALS * scale
+    states, weights, cost_factor = _state_weights(rng)
+    state_idx = rng.choice(len(states), size=n, p=weights)
+    teaching = rng.random(n) < TEACHING_SHARE
+
+    beds = rng.lognormal(np.log(60), 0.9, n) * np.where(teaching, 3.0, 1.0)
+    beds = np.clip(beds, 4, 2500).round()
+    cost_per_bed = rng.lognormal(np.log(1.3e6), 0.45, n) * np.where(teaching, 1.4, 1.0)
+    cost_per_bed *= cost_factor[state_idx]
+    contract_propensity = rng.gamma(2.0, 1.1, n)
+
+    names = np.char.add(np.char.add(
+        rng.choice(NAME_TOWNS, n).astype(str), " "),
+        np.char.add(np.char.add(rng.choice(NAME_PLACES, n).astype(str), " "),
+                    rng.choice(NAME_SUFFIXES, n).astype(str)))
+    hospitals = pd.DataFrame({
+        "Provider_Number": [f"{i % 99 + 1:02d}{i // 99:04d}" for i in range(n)],
+        "Hospital": names,
+        "City": rng.choice(NAME_TOWNS, n),
+        "State": states[state_idx],
+        "Type": np.where(teaching, "Teaching", "Non-Teaching"),
+        "Beds": beds,
+        "Cost_per_Bed": cost_per_bed,
+        "Contract_Propensity": contract_propensity,
+    })
+
+    for i, (name, state, kind, anchor_beds, cost_2023, contract_pct) in enumerate(ANCHORS):
+        hospitals.loc[i, ["Hospital", "State", "Type"]] = [name, state, kind]
+        hospitals.loc[i, "Beds"] = anchor_beds
+        hospitals.loc[i, "Cost_per_Bed"] = cost_2023 / anchor_beds / 1.04 ** 2
+        hospitals.loc[i, "Contract_Propensity"] = contract_pct
+    return hospitals
+
+
+def generate_year(hospitals, year, scale=1, seed=42):
+    """Financial and department records for one fiscal year."""
+    rng = np.random.default_rng([seed, year])
+    n_total = len(hospitals)
+    n_anchor = len(ANCHORS)
+    count = min(YEAR_COUNTS[year] * scale, n_total)
+    chosen = rng.choice(np.arange(n_anchor, n_total), size=count - n_anchor, replace=False)
+    rows = np.sort(np.concatenate([np.arange(n_anchor), chosen]))
+    h = hospitals.iloc[rows].reset_index(drop=True)
+    n = len(h)
+
+    growth = 1.04 ** (year - 2021)
+    beds = np.round(h["Beds"].to_numpy() * rng.choice([1.0, 1.0, 1.0, 0.95, 1.05], n))
+    cost = beds * h["Cost_per_Bed"].to_numpy() * growth * rng.lognormal(0, 0.05, n)
+    is_anchor = rows < n_anchor
+    cost[is_anchor] = h["Beds"].to_numpy()[is_anchor] * h["Cost_per_Bed"].to_numpy()[is_anchor] * growth
+
+    margin = rng.normal(-0.02, 0.11, n)
+    extreme_loss = rng.random(n) < 0.055
+    margin[extreme_loss] = rng.uniform(-3.0, -0.5, extreme_loss.sum())
+    extreme_gain = rng.random(n) < 0.004
+    margin[extreme_gain] = rng.uniform(0.5, 0.9, extreme_gain.sum())
+    revenue = cost / (1 - margin)
+
+    fte = beds * rng.lognormal(np.log(5.5), 0.35, n)
+    implausible = rng.random(n) < 0.01
+    fte[implausible] *= rng.uniform(15, 40, implausible.sum())
+
+    salaries = cost * rng.uniform(0.35, 0.5, n)
+    contract_pct = h["Contract_Propensity"].to_numpy() * rng.lognormal(0, 0.15, n)
+    contract_pct[is_anchor] = h["Contract_Propensity"].to_numpy()[is_anchor]
+    contract_pct = np.clip(contract_pct, 0, 45)
+    contract = salaries * contract_pct / 100
+
+    values = {"Beds": beds, "FTE": fte, "Net_Patient_Revenue": revenue,
+              "Operating_Cost": cost, "Contract_Labor": contract}
+    for field, share in COMPLETENESS.items():
+        missing = (rng.random(n) > share) & ~is_anchor
+        values[field] = np.where(missing, np.nan, values[field])
+    for field, rate in NEGATIVE_RATE.items():
+        flip = rng.random(n) < rate
+        values[field] = np.where(flip, -np.abs(values[field]), values[field])
+
+    report_ids = year * 10_000_000 + np.arange(n) + 1
+    financials = pd.DataFrame({
+        "Report_Id": report_ids,
+        "Provider_Number": h["Provider_Number"].to_numpy(),
+        "State": h["State"].to_numpy(),
+        "Type": h["Type"].to_numpy(),
+        **values,
+        "Total_Salaries": salaries,
+    })
+    revenue = financials["Net_Patient_Revenue"].where(financials["Net_Patient_Revenue"] != 0)
+    financials["Contract_Labor_Pct"] = financials["Contract_Labor"] / financials["Total_Salaries"] * 100
+    financials["Operating_Margin"] = (revenue - financials["Operating_Cost"]) / revenue.abs() * 100
+
+    departments = _generate_departments(rng, financials)
+    return h[store.SCHEMAS["hospitals"].names], financials, departments
+
+
+def _generate_departments(rng, financials):
+    """A handful of Worksheet A cost centers per report, splitting its operating cost."""
+    codes = np.asarray(list(store.COST_CENTERS))
+    n = len(financials)
+    per_report = np.clip(rng.poisson(DEPARTMENTS_PER_REPORT, n), 1, len(codes))
+    # Distinct cost centers per report: the first k entries of a random permutation
+    order = np.argsort(rng.random((n, len(codes))), axis=1)
+    pick = np.arange(len(codes)) < per_report[:, None]
+    report_pos = np.repeat(np.arange(n), per_report)
+    centers = codes[order[pick]]
+
+    share = rng.gamma(1.0, 1.0, len(report_pos))
+    starts = np.concatenate([[0], np.cumsum(per_report)[:-1]])
+    share /= np.repeat(np.add.reduceat(share, starts), per_report)
+    total = np.abs(np.nan_to_num(financials["Operating_Cost"].to_numpy()))[report_pos] * share
+    return pd.DataFrame({
+        "Report_Id": financials["Report_Id"].to_numpy()[report_pos],
+        "Provider_Number": financials["Provider_Number"].to_numpy()[report_pos],
+        "Cost_Center": centers,
+        "Salaries": total * rng.uniform(0.3, 0.6, len(report_pos)),
+        "Total_Cost": total,
+    })
+
+
+def write_sample(root=None, scale=1, seed=42, years=None):
+    """Write the synthetic warehouse one year partition at a time."""
+    hospitals = generate_hospitals(scale, seed)
+    for year in years or YEAR_COUNTS:
+        hosp, financials, departments = generate_year(hospitals, year, scale, seed)
+        store.write_partition("hospitals", year, hosp, root)
+        store.write_partition("financials", year, financials, root)
+        store.write_partition("departments", year, departments, root)
+    return root
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write the synthetic HCRIS sample warehouse.")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--warehouse", default=None)
+    args = parser.parse_args(argv)
+    write_sample(args.warehouse, args.scale, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
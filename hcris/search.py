@@ -0,0 +1,153 @@
+"""In-memory hospital lookup: name / CCN search and per-provider history.
+
+`SearchIndex` answers typeahead queries over every provider name and CCN.
+Name tokens and CCNs are kept in sorted arrays, so a prefix is a binary
+search for its range -- the flattened equivalent of walking a trie -- and
+a trigram index catches misspellings and matches inside words when the
+prefixes alone come up short.
+
+`HistoryIndex` keeps the financial records sorted by provider and year with
+each provider's row range, so a hospital's history is a slice rather than
+a scan of the table.
+"""
+import bisect
+import re
+from collections import defaultdict
+from typing import NamedTuple
+
+import numpy as np
+
+MIN_SIMILARITY = 0.5  # share of the query's trigrams a fuzzy match must contain
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]+")
+
+
+class Match(NamedTuple):
+    provider_number: str
+    hospital: str
+    city: str
+    state: str
+    score: float
+
+
+def normalize(text):
+    return _NON_ALNUM.sub(" ", str(text).upper()).strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    def __init__(self, hospitals):
+        """Index a frame with Provider_Number, Hospital, City and State columns."""
+        self.providers = hospitals["Provider_Number"].astype(str).to_numpy()
+        self.names = hospitals["Hospital"].fillna("").astype(str).to_numpy()
+        self.cities = hospitals["City"].fillna("").astype(str).to_numpy()
+        self.states = hospitals["State"].fillna("").astype(str).to_numpy()
+        normalized = [normalize(name) for name in self.names]
+        self._name_lengths = np.array([len(name) for name in normalized])
+
+        # sorted (token, id) pairs: every id whose name has a token starting
+        # with p sits in one contiguous run
+        pairs = sorted({(token, i) for i, name in enumerate(normalized) for token in name.split()})
+        self._tokens = [token for token, _ in pairs]
+        self._token_ids = np.array([i for _, i in pairs], dtype=np.int32)
+
+        order = np.argsort(self.providers, kind="stable")
+        self._ccns = self.providers[order].tolist()
+        self._ccn_ids = order.astype(np.int32)
+
+        postings = defaultdict(list)
+        counts = np.zeros(len(normalized), dtype=np.int32)
+        for i, name in enumerate(normalized):
+            grams = trigrams(name)
+            counts[i] = len(grams)
+            for gram in grams:
+                postings[gram].append(i)
+        self._trigrams = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._trigram_counts = counts
+
+    def __len__(self):
+        return len(self.providers)
+
+    @staticmethod
+    def _prefix_range(keys, prefix):
+        return bisect.bisect_left(keys, prefix), bisect.bisect_left(keys, prefix + "\uffff")
+
+    def _prefix_ids(self, token):
+        start, stop = self._prefix_range(self._tokens, token)
+        return self._token_ids[start:stop]
+
+    def _fuzzy(self, query):
+        """Ids and similarity of names containing enough of `query`'s trigrams."""
+        wanted = trigrams(query)
+        grams = [self._trigrams[g] for g in wanted if g in self._trigrams]
+        if not grams:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        shared = np.bincount(np.concatenate(grams), minlength=len(self))
+        similarity = shared / len(wanted)
+        ids = np.flatnonzero(similarity >= MIN_SIMILARITY)
+        return ids, similarity[ids]
+
+    def search(self, query, limit=10, states=None):
+        """Best matches for `query`, a name fragment or CCN, best first;
+        only hospitals in `states` when given."""
+        query = normalize(query)
+        if not query:
+            return []
+        # CCN prefix hits score 2 (3 if exact), name prefix hits 1-2 by how
+        # much of the name the query covers; only when neither finds anything
+        # are names scored by shared trigrams, below 1
+        scores = np.zeros(len(self))
+
+        if query.isdigit():
+            start, stop = self._prefix_range(self._ccns, query)
+            exact = np.array(self._ccns[start:stop]) == query
+            scores[self._ccn_ids[start:stop]] = np.where(exact, 3.0, 2.0)
+
+        # every query token must prefix some token of the name
+        matched = np.ones(len(self), dtype=bool)
+        for token in query.split():
+            hit = np.zeros(len(self), dtype=bool)
+            hit[self._prefix_ids(token)] = True
+            matched &= hit
+        ids = np.flatnonzero(matched)
+        closeness = len(query) / np.maximum(self._name_lengths[ids], len(query))
+        scores[ids] = np.maximum(scores[ids], 1.0 + closeness)
+
+        if not scores.any():
+            ids, similarity = self._fuzzy(query)
+            scores[ids] = np.maximum(scores[ids], similarity * 0.99)
+
+        if states is not None:
+            scores[~np.isin(self.states, list(states))] = 0
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        best = sorted(candidates.tolist(), key=lambda i: (-scores[i], self.names[i]))
+        return [Match(self.providers[i], self.names[i], self.cities[i], self.states[i], float(scores[i]))
+                for i in best]
+
+
+class HistoryIndex:
+    def __init__(self, records):
+        """Index records (with Provider_Number and Year) by provider."""
+        records = records.sort_values(["Provider_Number", "Year"], kind="stable").reset_index(drop=True)
+        providers = records["Provider_Number"].astype(str).to_numpy()
+        self.records = records
+        self._ranges = {}
+        if not len(providers):
+            return
+        starts = np.flatnonzero(np.r_[True, providers[1:] != providers[:-1]])
+        stops = np.r_[starts[1:], len(providers)]
+        self._ranges = dict(zip(providers[starts], zip(starts.tolist(), stops.tolist())))
+
+    def __contains__(self, provider_number):
+        return str(provider_number) in self._ranges
+
+    def history(self, provider_number):
+        """The provider's records, oldest year first (empty if unknown)."""
+        start, stop = self._ranges.get(str(provider_number), (0, 0))
+        return self.records.iloc[start:stop]
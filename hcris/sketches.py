@@ -0,0 +1,135 @@
+"""Mergeable quantile sketches per Year x State x Type rollup cell.
+
+Each metric's values in a cell are counted into logarithmic buckets
+(DDSketch-style): bucket i of sign s holds the values x of that sign with
+
+    GAMMA**(i - 1) < |x| <= GAMMA**i,   GAMMA = (1 + ALPHA) / (1 - ALPHA)
+
+and is read back as s * 2 * GAMMA**i / (GAMMA + 1).  Values with |x| below
+MIN_MAGNITUDE share a zero bucket.  Bucket counts are additive like the
+rollup cube's measures, so the sketch of any set of cells is the sum of
+their counts: merging is exact and order-independent.  A quantile read
+from a merged sketch is within a relative error ALPHA of the exact one,
+
+    |estimate - x| <= ALPHA * |x|
+
+where x is the value of rank floor(q * (n - 1)) among the n selected
+values (for the median, the lower middle value).  Callers answer
+selections of at most EXACT_MAX values exactly from the rows instead, at
+the same rank.
+
+Sketches are stored one file per year next to the warehouse, with a
+manifest of the source partitions, like the rollup cube.
+"""
+import numpy as np
+import pandas as pd
+
+from hcris import store
+from hcris.rollups import KEYS, METRICS
+
+ALPHA = 0.01
+GAMMA = (1 + ALPHA) / (1 - ALPHA)
+MIN_MAGNITUDE = 1e-9
+EXACT_MAX = 1000  # selections with at most this many values are answered exactly
+
+SOURCE_COLUMNS = ["State", "Type", "Beds", "FTE", "Net_Patient_Revenue", "Operating_Cost",
+                  "Contract_Labor_Pct", "Operating_Margin"]
+
+
+def buckets(values):
+    """(sign, bucket) of each value; NaN values get sign 0 and bucket -1."""
+    values = np.asarray(values, dtype="float64")
+    magnitude = np.abs(values)
+    sign = np.sign(values).astype(np.int8)
+    sign[magnitude < MIN_MAGNITUDE] = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bucket = np.ceil(np.log(magnitude) / np.log(GAMMA))
+    bucket = np.where(sign != 0, bucket, 0)
+    bucket[np.isnan(values)] = -1
+    return sign, bucket.astype(np.int32)
+
+
+def estimate(sign, bucket):
+    """Value each (sign, bucket) is read back as."""
+    return sign * 2 * GAMMA ** np.asarray(bucket, dtype="float64") / (GAMMA + 1)
+
+
+def build_year(fin):
+    """Sketch rows (State, Type, Metric, Sign, Bucket, Count) for one year's records."""
+    parts = []
+    for metric, derive in METRICS.items():
+        values = derive(fin).to_numpy(dtype="float64", na_value=np.nan)
+        reported = ~np.isnan(values)
+        sign, bucket = buckets(values[reported])
+        parts.append(pd.DataFrame({
+            "State": fin["State"].to_numpy()[reported],
+            "Type": fin["Type"].to_numpy()[reported],
+            "Metric": metric,
+            "Sign": sign,
+            "Bucket": bucket,
+        }))
+    rows = pd.concat(parts, ignore_index=True)
+    return rows.groupby(["State", "Type", "Metric", "Sign", "Bucket"], sort=True).size().rename("Count").reset_index()
+
+
+def sketch_path(year, root=None):
+    return store.derived_dir("sketches", root) / f"sketch_{int(year)}.parquet"
+
+
+def sources(root=None):
+    """Year -> financials fingerprint plus the accuracy each sketch file is built with."""
+    return {year: f"{store.fingerprint('financials', year, root)}|{ALPHA}:{MIN_MAGNITUDE}"
+            for year in store.list_years("financials", root)}
+
+
+def build_file(year, root=None):
+    fin = store.read_table("financials", columns=SOURCE_COLUMNS, years=[year], root=root)
+    build_year(fin).to_parquet(sketch_path(year, root), index=False)
+
+
+def refresh(root=None):
+    """Rebuild sketch files for years whose financials partition changed; return rebuilt years."""
+    return store.refresh_derived("sketches", sources(root), build_file, sketch_path, root)
+
+
+def load_sketches(root=None):
+    """Sketch rows of every cell, refreshed against the warehouse first."""
+    refresh(root)
+    return store.read_derived("sketches", sketch_path, root)
+
+
+def select(sketches, metric, years=None, states=None, types=None):
+    """Sketch rows of `metric` in the cells the filters allow."""
+    cells = sketches[sketches["Metric"] == metric]
+    for key, values in zip(KEYS, (years, states, types)):
+        if values is not None:
+            cells = cells[cells[key].isin(values)]
+    return cells
+
+
+def quantiles(cells, by, qs=(0.5,)):
+    """Estimated quantiles `qs` per `by` group, merged from sketch rows `cells`.
+
+    Returns a DataFrame indexed by `by` with a Count column and one column
+    per q.
+    """
+    merged = cells.groupby([*by, "Sign", "Bucket"])["Count"].sum().reset_index()
+    sign = merged["Sign"].to_numpy(dtype=np.int64)
+    bucket = merged["Bucket"].to_numpy(dtype=np.int64)
+    # value order within each group: negatives (largest magnitude first), zero, positives
+    group = merged.groupby(by, sort=True).ngroup().to_numpy()
+    order = np.lexsort((sign * bucket, sign, group))
+    group, sign, bucket = group[order], sign[order], bucket[order]
+    counts = merged["Count"].to_numpy(dtype=np.int64)[order]
+
+    cumulative = np.cumsum(counts)
+    totals = np.bincount(group, weights=counts).astype(np.int64)
+    before = np.concatenate([[0], np.cumsum(totals)[:-1]])
+    result = pd.DataFrame({"Count": totals},
+                          index=merged.groupby(by, sort=True).size().index)
+    for q in qs:
+        # first bucket whose running count passes the rank floor(q * (n - 1))
+        rank = before + np.floor(q * (totals - 1)).astype(np.int64)
+        position = np.searchsorted(cumulative, rank, side="right")
+        result[q] = estimate(sign[position], bucket[position])
+    return result
@@ -0,0 +1,270 @@
+"""Year-partitioned Parquet warehouse for the HCRIS tables.
+
+Layout (hive style, one directory per fiscal year):
+
+    <warehouse>/hospitals/Year=2023/part-0.parquet
+    <warehouse>/financials/Year=2023/part-0.parquet
+    <warehouse>/departments/Year=2023/part-0.parquet
+
+Readers project columns and prune year partitions, so a page only pays for
+the data it actually draws.
+"""
+import hashlib
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+WAREHOUSE_DIR = Path(os.environ.get(
+    "HCRIS_WAREHOUSE",
+    Path(__file__).resolve().parent.parent / "data" / "warehouse"
+))
+
+PARTITIONING = ds.partitioning(pa.schema([("Year", pa.int32())]), flavor="hive")
+
+# Column layout of each table; the Year column lives in the partition path
+SCHEMAS = {
+    "hospitals": pa.schema([
+        ("Provider_Number", pa.string()),
+        ("Hospital", pa.string()),
+        ("City", pa.string()),
+        ("State", pa.string()),
+        ("Type", pa.string()),
+    ]),
+    "financials": pa.schema([
+        ("Report_Id", pa.int64()),
+        ("Provider_Number", pa.string()),
+        ("State", pa.string()),
+        ("Type", pa.string()),
+        ("Beds", pa.float64()),
+        ("FTE", pa.float64()),
+        ("Net_Patient_Revenue", pa.float64()),
+        ("Operating_Cost", pa.float64()),
+        ("Total_Salaries", pa.float64()),
+        ("Contract_Labor", pa.float64()),
+        ("Contract_Labor_Pct", pa.float64()),
+        ("Operating_Margin", pa.float64()),
+    ]),
+    "departments": pa.schema([
+        ("Report_Id", pa.int64()),
+        ("Provider_Number", pa.string()),
+        ("Cost_Center", pa.string()),
+        ("Salaries", pa.float64()),
+        ("Total_Cost", pa.float64()),
+    ]),
+}
+
+# Worksheet A cost-center lines (Form 2552-10) used for department records
+COST_CENTERS = {
+    "00400": "Employee Benefits",
+    "00500": "Administrative & General",
+    "00700": "Operation of Plant",
+    "00800": "Laundry & Linen",
+    "00900": "Housekeeping",
+    "01000": "Dietary",
+    "01300": "Nursing Administration",
+    "01500": "Pharmacy",
+    "01600": "Medical Records",
+    "03000": "Adults & Pediatrics",
+    "03100": "Intensive Care Unit",
+    "03200": "Coronary Care Unit",
+    "04300": "Nursery",
+    "05000": "Operating Room",
+    "05200": "Delivery & Labor Room",
+    "05400": "Radiology - Diagnostic",
+    "06000": "Laboratory",
+    "06500": "Respiratory Therapy",
+    "06600": "Physical Therapy",
+    "07300": "Drugs Charged to Patients",
+    "09000": "Clinic",
+    "09100": "Emergency",
+    "09200": "Observation Beds",
+    "11300": "Interest Expense",
+}
+
+
+def table_dir(table, root=None):
+    return Path(root or WAREHOUSE_DIR) / table
+
+
+def partition_path(table, year, root=None):
+    return table_dir(table, root) / f"Year={int(year)}" / "part-0.parquet"
+
+
+def list_years(table, root=None):
+    """Years that have a partition for `table`, oldest first."""
+    base = table_dir(table, root)
+    if not base.is_dir():
+        return []
+    return sorted(
+        int(p.name.split("=", 1)[1]) for p in base.glob("Year=*")
+        if (p / "part-0.parquet").exists()
+    )
+
+
+@contextmanager
+def partition_writer(table, year, root=None):
+    """Yield a ParquetWriter for one partition; the file appears atomically on exit."""
+    path = partition_path(table, year, root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".parquet.tmp")
+    writer = pq.ParquetWriter(tmp, SCHEMAS[table], compression="zstd")
+    try:
+        yield writer
+    except BaseException:
+        writer.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    writer.close()
+    os.replace(tmp, path)
+
+
+def to_arrow(table, df):
+    """Conform a DataFrame to the table schema (extra columns dropped)."""
+    schema = SCHEMAS[table]
+    return pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+
+
+def write_partition(table, year, df, root=None):
+    with partition_writer(table, year, root) as writer:
+        writer.write_table(to_arrow(table, df))
+
+
+def read_table(table, columns=None, years=None, root=None):
+    """Read `table` as a DataFrame, projecting `columns` and pruning to `years`."""
+    base = table_dir(table, root)
+    schema = SCHEMAS[table].append(pa.field("Year", pa.int32()))
+    if not base.is_dir():
+        return schema.empty_table().to_pandas()
+    dataset = ds.dataset(base, format="parquet", partitioning=PARTITIONING, schema=schema)
+    flt = None
+    if years is not None:
+        flt = ds.field("Year").isin([int(y) for y in years])
+    return dataset.to_table(columns=columns, filter=flt).to_pandas()
+
+
+def row_count(table, root=None):
+    """Rows of `table` across every year, from the Parquet footers."""
+    return sum(pq.ParquetFile(partition_path(table, year, root)).metadata.num_rows
+               for year in list_years(table, root))
+
+
+def read_hospitals(columns=None, root=None):
+    """Latest reported attributes for each provider."""
+    wanted = None
+    if columns is not None:
+        wanted = list(dict.fromkeys(["Provider_Number", "Year", *columns]))
+    df = read_table("hospitals", columns=wanted, root=root)
+    df = df.sort_values("Year").drop_duplicates("Provider_Number", keep="last")
+    df = df.reset_index(drop=True)
+    if columns is not None:
+        df = df[list(dict.fromkeys(["Provider_Number", *columns]))]
+    return df
+
+
+def ensure_warehouse(root=None):
+    """Make sure a warehouse exists, materializing the synthetic sample if not."""
+    root = Path(root or WAREHOUSE_DIR)
+    if not list_years("financials", root):
+        from hcris import sample
+        sample.write_sample(root)
+    return root
+
+
+def fingerprint(table, year, root=None):
+    """Cheap change marker for one partition (size and mtime), or None if absent."""
+    try:
+        st = partition_path(table, year, root).stat()
+    except FileNotFoundError:
+        return None
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+
+def data_version(root=None):
+    """Digest of every partition's fingerprint; changes whenever any partition is rewritten."""
+    digest = hashlib.sha1()
+    for table in SCHEMAS:
+        for year in list_years(table, root):
+            digest.update(f"{table}/{year}/{fingerprint(table, year, root)};".encode())
+    return digest.hexdigest()[:12]
+
+
+def derived_dir(name, root=None):
+    """Directory for results derived from the warehouse (rollups, checks, ...)."""
+    path = Path(root or WAREHOUSE_DIR) / f"_{name}"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def read_manifest(name, root=None):
+    """Year -> source fingerprint map recorded for a derived result."""
+    try:
+        return json.loads((derived_dir(name, root) / "manifest.json").read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def write_manifest(name, manifest, root=None):
+    path = derived_dir(name, root) / "manifest.json"
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def read_derived(name, path, root=None):
+    """Every recorded year's file of derived result `name` as one frame, with
+    a leading Year column; empty when no year is recorded."""
+    parts = []
+    for year in sorted(int(y) for y in read_manifest(name, root)):
+        part = pq.read_table(path(year, root))
+        parts.append(part.add_column(0, "Year", pa.array([year] * part.num_rows, pa.int64())))
+    if not parts:
+        return pa.table({"Year": pa.array([], pa.int64())}).to_pandas()
+    return pa.concat_tables(parts, promote_options="default").to_pandas()
+
+
+def stale_years(name, sources, path, root=None):
+    """Years of `sources` (year -> input marker) whose derived file is missing or out of date."""
+    manifest = read_manifest(name, root)
+    return [year for year, source in sources.items()
+            if manifest.get(str(year)) != source or not path(year, root).exists()]
+
+
+def record_years(name, sources, built, path, root=None):
+    """Record the `built` years in the manifest and drop years no longer in `sources`.
+
+    Returns the years that changed.
+    """
+    manifest = read_manifest(name, root)
+    changed = list(built)
+    for year in built:
+        manifest[str(year)] = sources[year]
+    for stale in set(manifest) - {str(y) for y in sources}:
+        target = path(stale, root)
+        if target.is_dir():
+            shutil.rmtree(target)
+        else:
+            target.unlink(missing_ok=True)
+        del manifest[stale]
+        changed.append(int(stale))
+    if changed:
+        write_manifest(name, manifest, root)
+    return changed
+
+
+def refresh_derived(name, sources, build, path, root=None):
+    """Rebuild, one year at a time, the derived files whose inputs changed.
+
+    `sources` maps year -> input marker, `build(year, root)` writes
+    `path(year, root)` (a file, or a directory of files).  Returns the
+    years rebuilt or removed.
+    """
+    built = stale_years(name, sources, path, root)
+    for year in built:
+        build(year, root)
+    return record_years(name, sources, built, path, root)
@@ -0,0 +1,121 @@
+"""Per-rerun timing spans for the dashboard's hot path.
+
+    with timing.span("load", "load_rollups"):
+        ...
+
+Spans are collected per script run (per thread, so concurrent sessions
+don't mix) between `begin()` and `end()`.  `end()` appends the run to a
+JSON-lines log and rewrites a Prometheus text file of per-stage totals,
+when those paths are configured.
+
+Tracing is off unless HCRIS_TRACE is set; then `span()` returns a shared
+no-op context manager, so instrumented code pays one function call.
+
+    HCRIS_TRACE=1                  collect spans (and show the debug panel)
+    HCRIS_TRACE_LOG=spans.jsonl    append one JSON line per rerun
+    HCRIS_TRACE_PROM=hcris.prom    Prometheus text exposition of the totals
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+ENABLED = os.environ.get("HCRIS_TRACE", "") not in ("", "0")
+LOG_PATH = os.environ.get("HCRIS_TRACE_LOG")
+PROM_PATH = os.environ.get("HCRIS_TRACE_PROM")
+
+_NOOP = nullcontext()
+_local = threading.local()
+_write_lock = threading.Lock()
+# (stage, page, name) -> [count, seconds], for the whole process
+_totals = {}
+
+
+def begin(**labels):
+    """Start collecting spans for this thread's script run."""
+    if not ENABLED:
+        return
+    _local.run = {"labels": labels, "start": time.perf_counter(), "spans": [], "depth": 0}
+
+
+def _record(stage, name, started):
+    run = getattr(_local, "run", None)
+    if run is None:
+        return
+    run["spans"].append({
+        "stage": stage,
+        "name": name,
+        "start_ms": round((started - run["start"]) * 1000, 3),
+        "ms": round((time.perf_counter() - started) * 1000, 3),
+        "depth": run["depth"],
+    })
+
+
+@contextmanager
+def _span(stage, name):
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run["depth"] += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if run is not None:
+            run["depth"] -= 1
+        _record(stage, name, started)
+
+
+def span(stage, name=None):
+    """Context manager timing one stage (load, build, plotly_chart, ...)."""
+    if not ENABLED:
+        return _NOOP
+    return _span(stage, name)
+
+
+def end(**labels):
+    """Finish this thread's run; export it and return its summary (None when disabled)."""
+    run = getattr(_local, "run", None)
+    if run is None:
+        return None
+    _local.run = None
+    labels = {**run["labels"], **labels}
+    summary = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        **labels,
+        "total_ms": round((time.perf_counter() - run["start"]) * 1000, 3),
+        # spans are recorded as they close; order them by when they opened
+        "spans": sorted(run["spans"], key=lambda s: s["start_ms"]),
+    }
+    page = labels.get("page", "")
+    with _write_lock:
+        for s in run["spans"]:
+            total = _totals.setdefault((s["stage"], page, s["name"] or ""), [0, 0.0])
+            total[0] += 1
+            total[1] += s["ms"] / 1000
+        if LOG_PATH:
+            with open(LOG_PATH, "a") as log:
+                log.write(json.dumps(summary) + "\n")
+        if PROM_PATH:
+            _write_prometheus(Path(PROM_PATH))
+    return summary
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_prometheus(path):
+    lines = [
+        "# HELP hcris_stage_seconds Time spent in each dashboard stage.",
+        "# TYPE hcris_stage_seconds summary",
+    ]
+    for (stage, page, name), (count, seconds) in sorted(_totals.items()):
+        labels = f'stage="{_escape(stage)}",page="{_escape(page)}",name="{_escape(name)}"'
+        lines.append(f"hcris_stage_seconds_sum{{{labels}}} {seconds:.6f}")
+        lines.append(f"hcris_stage_seconds_count{{{labels}}} {count}")
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text("\n".join(lines) + "\n")
+    os.replace(tmp, path)
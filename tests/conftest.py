@@ -0,0 +1,9 @@
+import pytest
+
+from hcris import sample
+
+
+@pytest.fixture(scope="session")
+def warehouse(tmp_path_factory):
+    """A small synthetic warehouse (two years at sample scale), shared by the session."""
+    return sample.write_sample(tmp_path_factory.mktemp("warehouse"), years=[2022, 2023])
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from hcris import bitmaps
+
+
+@pytest.fixture
+def columns():
+    rng = np.random.default_rng(7)
+    rows = 1003  # not a multiple of 64, so the last word is padded
+    return {
+        "Year": rng.choice([2021, 2022, 2023], rows),
+        "State": rng.choice(np.array(["CA", "NY", "TX", "WA"], dtype=object), rows),
+        "Flag": rng.random(rows) < 0.1,
+    }
+
+
+def test_select_rows_and_count_match_boolean_masks(columns):
+    index = bitmaps.BitmapIndex(columns)
+    cases = [
+        ({}, np.ones(1003, dtype=bool)),
+        ({"Year": [2022]}, columns["Year"] == 2022),
+        ({"Year": [2021, 2023], "State": ["TX", "CA"]},
+         np.isin(columns["Year"], [2021, 2023]) & np.isin(columns["State"], ["TX", "CA"])),
+        ({"State": ["NY"], "Flag": [True]}, (columns["State"] == "NY") & columns["Flag"]),
+        ({"State": ["ZZ"]}, np.zeros(1003, dtype=bool)),
+        ({"State": None, "Year": [2023]}, columns["Year"] == 2023),
+    ]
+    for criteria, mask in cases:
+        selected = index.select(**criteria)
+        assert index.rows(selected).tolist() == np.flatnonzero(mask).tolist(), criteria
+        assert index.count(selected) == mask.sum(), criteria
+
+
+def test_values_are_sorted(columns):
+    index = bitmaps.BitmapIndex(columns)
+    assert index.values("Year") == [2021, 2022, 2023]
+    assert index.values("Flag") == [False, True]
+
+
+def test_columns_must_share_a_length():
+    with pytest.raises(ValueError):
+        bitmaps.BitmapIndex({"Year": [2022, 2023], "State": ["CA"]})
+
+
+def test_bed_band():
+    bands = bitmaps.bed_band([0, 49, 50, 299.5, 500, 10_000, np.nan, -1])
+    assert bands.tolist() == ["Under 50", "Under 50", "50-99", "100-299", "500+", "500+",
+                              bitmaps.UNKNOWN_BAND, bitmaps.UNKNOWN_BAND]
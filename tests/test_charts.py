@@ -0,0 +1,40 @@
+import base64
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+
+from views import charts
+
+
+def decoded(values):
+    """A trace array as it reaches the browser: typed arrays are base64 decoded."""
+    if isinstance(values, dict) and "bdata" in values:
+        return np.frombuffer(base64.b64decode(values["bdata"]), dtype=values["dtype"])
+    return np.asarray(values)
+
+
+def compacted_trace(trace):
+    return json.loads(charts.compact(go.Figure(trace)).to_json())["data"][0]
+
+
+def test_integer_counts_keep_their_values():
+    counts = np.array([915, 1206, 923, 557, 353, 45, 0, 3])
+    assert decoded(compacted_trace(go.Bar(y=counts))["y"]).tolist() == counts.tolist()
+
+
+def test_integral_floats_keep_their_values():
+    counts = np.array([79.0, 412.0, 1.0, 70000.0, -3.0])
+    assert decoded(compacted_trace(go.Bar(y=counts))["y"]).tolist() == counts.tolist()
+
+
+def test_floats_keep_display_precision():
+    costs = np.array([123456789.0, 0.0123456, -98765.4321])
+    # rounded to SIGNIFICANT_DIGITS: within half a unit of the last kept digit
+    bound = 0.5 * 10.0 ** (1 - charts.SIGNIFICANT_DIGITS)
+    np.testing.assert_allclose(decoded(compacted_trace(go.Scatter(y=costs))["y"]), costs, rtol=bound)
+
+
+def test_narrows_small_integers():
+    assert charts._compact_array(np.arange(200)).dtype == np.uint8
+    assert charts._compact_array(np.array([-1, 200])).dtype == np.int16
@@ -0,0 +1,20 @@
+from hcris import db, store
+
+
+def test_summary_and_names(warehouse):
+    repository = db.open_repository(warehouse)
+    try:
+        summary = repository.summary()
+        hospitals = store.read_hospitals(root=warehouse)
+        assert summary["Hospitals"] == len(hospitals)
+        assert summary["Teaching_Hospitals"] == (hospitals["Type"] == "Teaching").sum()
+        assert (summary["First_Year"], summary["Last_Year"]) == (2022, 2023)
+        assert summary["Financial_Records"] == len(store.read_table("financials", root=warehouse))
+        assert summary["Department_Records"] == len(store.read_table("departments", root=warehouse))
+
+        wanted = hospitals.head(3)
+        names = repository.hospital_names(wanted["Provider_Number"]).set_index("Provider_Number")
+        assert names["Hospital"].to_dict() == wanted.set_index("Provider_Number")["Hospital"].to_dict()
+    finally:
+        repository.close()
+    assert db.is_current(warehouse)
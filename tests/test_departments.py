@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from hcris import departments, store
+
+
+def expected_cells(warehouse, years, by):
+    dept = store.read_table("departments", years=years, root=warehouse)
+    fin = store.read_table("financials", columns=["Year", "Provider_Number", "State"], years=years, root=warehouse)
+    dept = dept.merge(fin.drop_duplicates(["Year", "Provider_Number"]), on=["Year", "Provider_Number"], how="left")
+    dept["State"] = dept["State"].fillna("Unknown")
+    grouped = dept.groupby(by)
+    return pd.DataFrame({"Records": grouped.size(), "Salaries": grouped["Salaries"].sum(),
+                         "Total_Cost": grouped["Total_Cost"].sum()})
+
+
+def test_state_breakdown_matches_pandas(warehouse):
+    # a small chunk size makes every year span several chunks
+    cells = departments.state_breakdown(root=warehouse, chunk_rows=1000).set_index(["State", "Cost_Center"])
+    expected = expected_cells(warehouse, [2022, 2023], ["State", "Cost_Center"])
+    assert cells.index.sort_values().tolist() == expected.index.sort_values().tolist()
+    cells = cells.loc[expected.index]
+    assert cells["Records"].tolist() == expected["Records"].tolist()
+    np.testing.assert_allclose(cells["Salaries"], expected["Salaries"])
+    np.testing.assert_allclose(cells["Total_Cost"], expected["Total_Cost"])
+    assert (cells["Department"] == [departments.department_name(code) for _, code in cells.index]).all()
+
+
+def test_hospital_breakdown_matches_pandas(warehouse):
+    dept = store.read_table("departments", root=warehouse)
+    provider = dept["Provider_Number"].value_counts().index[0]
+    breakdown = departments.hospital_breakdown(provider, root=warehouse).set_index(["Year", "Cost_Center"])
+    own = dept[dept["Provider_Number"] == provider].groupby(["Year", "Cost_Center"])
+    assert breakdown.index.tolist() == own.size().index.tolist()
+    assert breakdown["Records"].tolist() == own.size().tolist()
+    np.testing.assert_allclose(breakdown["Total_Cost"], own["Total_Cost"].sum())
+
+    assert departments.hospital_breakdown("no such provider", root=warehouse).empty
+
+
+def test_providers_in_state(warehouse):
+    fin = store.read_table("financials", columns=["Provider_Number", "State"], years=[2023], root=warehouse)
+    dept = store.read_table("departments", columns=["Provider_Number"], years=[2023], root=warehouse)
+    expected = sorted(set(dept["Provider_Number"]) & set(fin.loc[fin["State"] == "TX", "Provider_Number"]))
+    assert departments.providers_in("TX", 2023, root=warehouse).tolist() == expected
+    assert len(departments.providers_in("ZZ", 2023, root=warehouse)) == 0
@@ -0,0 +1,41 @@
+import gzip
+import io
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from hcris import bitmaps, export, store
+
+
+def exported(warehouse, table, fmt="parquet", **query):
+    with export.export_file(table, fmt, root=warehouse, **query) as sink:
+        data = sink.read()
+    if fmt == "csv.gz":
+        return pd.read_csv(io.BytesIO(gzip.decompress(data)))
+    return pq.read_table(io.BytesIO(data)).to_pandas()
+
+
+def test_financials_filters(warehouse):
+    fin = store.read_table("financials", root=warehouse)
+    band = bitmaps.bed_band(fin["Beds"].to_numpy())
+    expected = fin[(fin["Year"] == 2023) & fin["State"].isin(["CA", "TX"]) & (fin["Type"] == "Teaching")
+                   & pd.Series(band).isin(["100-299", bitmaps.UNKNOWN_BAND]).to_numpy()]
+    rows = exported(warehouse, "financials", "csv.gz", years=[2023], states=["CA", "TX"], types=["Teaching"],
+                    bed_bands=["100-299", bitmaps.UNKNOWN_BAND])
+    assert sorted(rows["Report_Id"]) == sorted(expected["Report_Id"])
+
+
+def test_departments_filtered_through_financials(warehouse):
+    fin = store.read_table("financials", root=warehouse)
+    reports = fin.loc[(fin["State"] == "TX") & (fin["Type"] == "Teaching"), "Report_Id"]
+    departments = store.read_table("departments", root=warehouse)
+    rows = exported(warehouse, "departments", states=["TX"], types=["Teaching"], columns=["Report_Id"])
+    assert len(rows) == departments["Report_Id"].isin(reports).sum() > 0
+    assert rows["Report_Id"].isin(reports).all()
+
+
+def test_unapplicable_filter_is_refused(warehouse):
+    assert export.unsupported("hospitals", bed_bands=["500+"]) == ["bed_bands"]
+    with pytest.raises(ValueError):
+        export.scanner("hospitals", bed_bands=["500+"], root=warehouse)
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from hcris import ingest, store
+
+
+def write_raw(raw_dir, year, nmrc_rows):
+    raw_dir.mkdir()
+    pd.DataFrame([
+        [1, 2, "010001", "", 1, "01/01/2023", "12/31/2023", *[""] * 11],
+        [2, 2, "010002", "", 1, "01/01/2023", "12/31/2023", *[""] * 11],
+    ]).to_csv(raw_dir / f"HOSP10_{year}_RPT.CSV", header=False, index=False)
+    pd.DataFrame([
+        [report, worksheet, line, column, value]
+        for report in (1, 2)
+        for (worksheet, line, column), value in zip(ingest.ALPHA_FIELDS, ["Dothan", "AL", f"Hospital {report}", "N"])
+    ]).to_csv(raw_dir / f"HOSP10_{year}_ALPHA.CSV", header=False, index=False)
+    pd.DataFrame(nmrc_rows).to_csv(raw_dir / f"HOSP10_{year}_NMRC.CSV", header=False, index=False)
+
+
+def test_report_split_across_chunks_is_carried_whole(tmp_path):
+    # report 1's department line 00500 straddles the 3-row chunk boundary
+    write_raw(tmp_path / "raw", 2023, [
+        [1, "G300000", "00400", "00100", 900.0],
+        [1, "A000000", "00400", "00100", 10.0],
+        [1, "A000000", "00500", "00100", 20.0],
+        [1, "A000000", "00500", "00700", 25.0],
+        [1, "A000000", "00400", "00700", 15.0],
+        [2, "A000000", "00400", "00100", 30.0],
+        [2, "A000000", "00400", "00700", 35.0],
+    ])
+    root = tmp_path / "warehouse"
+    ingest.ingest_year(tmp_path / "raw", 2023, root, chunk_rows=3)
+
+    departments = store.read_table("departments", years=[2023], root=root)
+    departments = departments.sort_values(["Report_Id", "Cost_Center"], ignore_index=True)
+    assert departments[["Report_Id", "Cost_Center", "Salaries", "Total_Cost"]].values.tolist() == [
+        [1, "00400", 10.0, 15.0],
+        [1, "00500", 20.0, 25.0],
+        [2, "00400", 30.0, 35.0],
+    ]
+    assert departments["Provider_Number"].tolist() == ["010001", "010001", "010002"]
+
+    financials = store.read_table("financials", years=[2023], root=root).set_index("Report_Id")
+    assert financials.loc[1, "Operating_Cost"] == 900.0
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hcris import outliers
+
+
+def records(values, state="CA"):
+    return pd.DataFrame({
+        "Report_Id": np.arange(len(values)),
+        "Provider_Number": [f"{i:06d}" for i in range(len(values))],
+        "State": state,
+        "Type": "Non-Teaching",
+        "Beds": 100.0,
+        "FTE": 400.0,
+        "Net_Patient_Revenue": 1e8,
+        "Operating_Cost": values,
+        "Contract_Labor_Pct": 4.0,
+    })
+
+
+def test_mad_flags_against_modified_z_score():
+    values = np.array([100.0, 102, 98, 101, 99, 103, 97, 100, 500, np.nan])
+    scored = outliers.score_year(records(values), method="mad")
+
+    reported = values[~np.isnan(values)]
+    median = np.median(reported)
+    mad = np.median(np.abs(reported - median))
+    z = 0.6745 * (values - median) / mad
+    np.testing.assert_allclose(scored["Operating_Cost_Score"], z)
+    assert scored["Operating_Cost_Outlier"].tolist() == list(np.abs(z) > outliers.MAD_THRESHOLD)
+    assert scored["Operating_Cost_Outlier"].sum() == 1
+
+
+def test_iqr_flags_beyond_fences():
+    values = np.array([10.0, 11, 12, 13, 14, 15, 16, 40, -20])
+    scored = outliers.score_year(records(values), method="iqr")
+    q1, q3 = np.percentile(values, [25, 75])
+    fence = outliers.IQR_FENCE * (q3 - q1)
+    expected = (values < q1 - fence) | (values > q3 + fence)
+    assert scored["Operating_Cost_Outlier"].tolist() == expected.tolist()
+    assert scored.loc[7, "Operating_Cost_Score"] == pytest.approx((40 - (q3 + fence)) / (q3 - q1))
+
+
+def test_states_are_scored_separately_and_small_groups_never_flagged():
+    fin = pd.concat([records([100.0, 101, 99, 100, 102, 98, 1000]),
+                     records([1.0, 1000, 1], state="RI")], ignore_index=True)
+    scored = outliers.score_year(fin)
+    assert scored.loc[fin["State"] == "CA", "Operating_Cost_Outlier"].tolist() == [False] * 6 + [True]
+    assert not scored.loc[fin["State"] == "RI", "Operating_Cost_Outlier"].any()
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        outliers.score_year(records([1.0] * 5), method="zscore")
+
+
+def test_top_k_largest_flagged_first():
+    flags = pd.DataFrame({
+        "Operating_Cost": [5.0, 50.0, np.nan, 30.0, 40.0, 60.0],
+        "Operating_Cost_Outlier": [True, True, True, True, False, True],
+    })
+    assert outliers.top_k(flags, "Operating_Cost", 3).index.tolist() == [5, 1, 3]
+    assert outliers.top_k(flags, "Operating_Cost", 10).index.tolist() == [5, 1, 3, 0]
+    assert outliers.top_k(flags, "Operating_Cost", 2, outliers_only=False).index.tolist() == [5, 1]
+    assert outliers.top_k(flags.iloc[:0], "Operating_Cost", 3).empty
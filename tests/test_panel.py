@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from hcris import panel
+
+METRICS = ("Contract_Labor_Pct",)
+
+
+def _flags():
+    # provider "b" skips 2022; providers are not in key order within a year
+    return pd.DataFrame({
+        "Year": [2021, 2021, 2021, 2022, 2022, 2023, 2023, 2023],
+        "Provider_Number": ["c", "a", "b", "c", "a", "b", "a", "c"],
+        "Contract_Labor_Pct": [30.0, 1.0, 25.0, 35.0, 2.0, 40.0, np.nan, 20.0],
+        "Contract_Labor_Pct_Outlier": [True, False, True, True, False, True, False, False],
+    })
+
+
+def test_build_aligns_every_year_by_provider():
+    grid = panel.build(_flags(), METRICS)
+    assert grid.providers.tolist() == ["a", "b", "c"]
+    assert grid.years.tolist() == [2021, 2022, 2023]
+    np.testing.assert_array_equal(grid.values["Contract_Labor_Pct"],
+                                  [[1, 2, np.nan], [25, np.nan, 40], [30, 35, 20]])
+    assert grid.flags["Contract_Labor_Pct"].tolist() == [[False] * 3, [True, False, True], [True, True, False]]
+
+
+def test_persistence_and_deltas():
+    grid = panel.build(_flags(), METRICS)
+    metric = "Contract_Labor_Pct"
+    assert panel.years_flagged(grid, metric).tolist() == [0, 2, 2]
+    assert panel.years_reported(grid, metric).tolist() == [2, 2, 3]
+    assert panel.persistent(grid, 2)[:, 0].tolist() == [False, True, True]
+    np.testing.assert_array_equal(panel.deltas(grid, metric),
+                                  [[np.nan, 1, np.nan], [np.nan] * 3, [np.nan, 5, -15]])
+
+    table = panel.persistence_table(grid, 2)
+    assert table["Provider_Number"].tolist() == ["b", "c"]
+    b, c = table.to_dict("records")
+    assert (b["Latest_Value"], np.isnan(b["Latest_Change"]), np.isnan(b["Mean_Change"])) == (40, True, True)
+    assert (c["Latest_Value"], c["Latest_Change"], c["Mean_Change"]) == (20, -15, -5)
+
+    # ties on years flagged go to the larger latest value
+    assert panel.most_persistent(grid, metric, 1, 2).tolist() == [1, 2]
+
+
+def test_trends_skip_unreported_years():
+    grid = panel.build(_flags(), METRICS)
+    trend = panel.trends(grid, "Contract_Labor_Pct", np.array([1]))
+    assert trend["Year"].tolist() == [2021, 2023]
+    assert np.isnan(trend["YoY_Change"]).all()
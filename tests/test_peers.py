@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from hcris import peers
+
+
+def _records(rows=300, seed=3):
+    rng = np.random.default_rng(seed)
+    beds = rng.integers(10, 900, rows).astype(float)
+    beds[:5] = np.nan  # not indexed
+    return pd.DataFrame({
+        "Provider_Number": [f"{i:06d}" for i in range(rows)],
+        "Type": rng.choice(["Teaching", "Short Term", "Critical Access"], rows),
+        "Beds": beds,
+        "Net_Patient_Revenue": beds * rng.uniform(5e5, 2e6, rows),
+        "FTE": beds * rng.uniform(2, 8, rows),
+        "Contract_Labor_Pct": rng.uniform(0, 20, rows),
+        "Operating_Margin": rng.normal(0, 10, rows),
+    })
+
+
+def _brute_force(points, position, k):
+    distances = np.sqrt(((points - points[position]) ** 2).sum(axis=1))
+    distances[position] = np.inf
+    order = np.argsort(distances, kind="stable")[:k]
+    return order, distances[order]
+
+
+def test_peers_match_brute_force():
+    records = _records()
+    index = peers.PeerIndex(records)
+    points, usable = peers.features(records)
+    assert len(index) == usable.sum() == len(records) - 5
+    assert "000000" not in index and index.peers("000000") is None
+
+    ids, distances = index.all_peers(k=10)
+    for position in range(0, len(index), 7):
+        expected_ids, expected = _brute_force(points, position, 10)
+        np.testing.assert_allclose(distances[position], expected)
+        assert set(ids[position]) == set(expected_ids)
+
+        found = index.peers(index.providers[position], k=10)
+        np.testing.assert_allclose(found["Distance"], expected)
+        assert index.providers[position] not in set(found["Provider_Number"])
+
+
+def test_peer_medians_match_brute_force():
+    records = _records()
+    index = peers.PeerIndex(records)
+    points, _ = peers.features(records)
+    medians = index.peer_medians(k=5)
+    for position in range(0, len(index), 11):
+        expected_ids, _ = _brute_force(points, position, 5)
+        for metric in peers.METRICS:
+            assert medians[metric][position] == np.median(index.records[metric].to_numpy()[expected_ids])
+
+
+def test_duplicates_exclude_the_hospital_itself():
+    records = pd.concat([_records(20).iloc[5:6]] * 3, ignore_index=True)
+    records["Provider_Number"] = ["A", "B", "C"]
+    index = peers.PeerIndex(records)
+    assert sorted(index.peers("A", k=5)["Provider_Number"]) == ["B", "C"]
+    assert peers.PeerIndex(records.iloc[:1]).peers("A").empty
@@ -0,0 +1,28 @@
+import shutil
+
+import pytest
+
+from hcris import precompute, store
+
+
+def test_failed_task_keeps_finished_work(tmp_path, warehouse, monkeypatch):
+    root = tmp_path / "warehouse"
+    shutil.copytree(warehouse, root, ignore=shutil.ignore_patterns("_*"))
+    sources, build, path = precompute.FAMILIES["quality"]
+
+    def failing(year, root=None):
+        if year == 2023:
+            raise RuntimeError("disk full")
+        build(year, root)
+
+    monkeypatch.setitem(precompute.FAMILIES, "quality", (sources, failing, path))
+    with pytest.raises(RuntimeError):
+        precompute.run(root, workers=1)
+    assert sorted(store.read_manifest("rollups", root)) == ["2022", "2023"]
+    assert list(store.read_manifest("quality", root)) == ["2022"]
+
+    monkeypatch.setitem(precompute.FAMILIES, "quality", (sources, build, path))
+    tasks, _ = precompute.plan(root)
+    retried = [(family, year) for family, year, _ in tasks]
+    assert ("quality", 2023) in retried
+    assert not [task for task in retried if task[0] in ("rollups", "sketches") or task == ("quality", 2022)]
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from hcris import quality
+
+
+def test_check_year_counts_every_rule():
+    fin = pd.DataFrame({
+        "Report_Id": [1, 2, 3, 4],
+        "Provider_Number": ["010001", "010002", "010003", "999999"],
+        "Beds": [100.0, 0.0, 50.0, np.nan],
+        "FTE": [500.0, 10.0, 25.0, -1.0],
+        "Net_Patient_Revenue": [1e8, -5.0, np.nan, 2e7],
+        "Operating_Cost": [9e7, 1e6, 2e6, np.nan],
+        "Contract_Labor": [1e6, np.nan, -3.0, 0.0],
+    })
+    dept = pd.DataFrame({"Report_Id": [1, 1, 3, 7], "Total_Cost": [10.0, -2.0, 5.0, 1.0]})
+    providers = pd.Series(["010001", "010002", "010003", "010001"])
+
+    result = quality.check_year(fin, dept, providers)
+
+    assert result["Records"] == 4 and result["Department_Records"] == 4
+    assert result["Revenue_Complete"] == 75.0
+    assert result["Cost_Complete"] == 75.0
+    assert result["Beds_Complete"] == 75.0
+    assert result["Negative_Revenue"] == 1
+    assert result["Negative_Operating_Cost"] == 0
+    assert result["Negative_FTE"] == 1
+    assert result["Negative_Contract_Labor"] == 1
+    assert result["Negative_Department_Cost"] == 1
+    assert result["Orphaned_Financial"] == 1  # provider 999999
+    assert result["Orphaned_Department"] == 1  # report 7
+    # 0.5 FTE/bed is flagged, 5 is not; zero and missing beds are not judged
+    assert result["Implausible_FTE_per_Bed"] == 1
+
+
+def test_issue_counts_severity():
+    results = pd.DataFrame([{key: 0 for key in quality.ISSUES}, {key: 0 for key in quality.ISSUES}])
+    results.loc[1, "Negative_FTE"] = 3
+    issues = quality.issue_counts(results).set_index("Issue Type")
+    assert issues.loc["Negative FTE"].tolist() == [3, "High"]
+    assert issues.loc["Negative Revenue"].tolist() == [0, "None"]
+
+
+def test_load_results_one_row_per_year(warehouse):
+    results = quality.load_results(warehouse)
+    assert results["Year"].tolist() == [2022, 2023]
+    assert (results["Records"] > 0).all()
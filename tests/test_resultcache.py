@@ -0,0 +1,74 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from hcris import resultcache
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resultcache.time, "monotonic", lambda: now[0])
+    cache = resultcache.ResultCache(ttl=10)
+    cache.put("a", "value")
+    now[0] = 109.0
+    assert cache.get("a") == "value"
+    now[0] = 110.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1 and len(cache) == 0
+
+
+def test_least_recently_used_evicted_past_budget():
+    cache = resultcache.ResultCache(max_bytes=30)
+    cache.put("a", "x" * 10)
+    cache.put("b", "x" * 10)
+    cache.put("c", "x" * 10)
+    assert cache.get("a") is not None  # "b" is now the least recently used
+    cache.put("d", "x" * 10)
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in "acd"] == [True, True, True]
+    assert cache.size_bytes == 30 and cache.stats()["evictions"] == 1
+
+    cache.put("big", "x" * 31)  # larger than the whole budget: not cached
+    assert cache.get("big") is None and len(cache) == 3
+
+
+def test_concurrent_misses_compute_once():
+    cache = resultcache.ResultCache()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()["coalesced"] < 7:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["result"] * 8 and len(calls) == 1
+    assert cache.get_or_compute("k", compute) == "result" and len(calls) == 1
+
+
+def test_failed_compute_is_raised_and_not_cached():
+    cache = resultcache.ResultCache()
+
+    def compute():
+        raise KeyError("missing")
+
+    with pytest.raises(KeyError):
+        cache.get_or_compute("k", compute)
+    assert cache.get_or_compute("k", lambda: 1) == 1
+
+
+def test_equal_filter_states_share_a_key():
+    assert resultcache.make_key("f", 1, filters={"states": ["TX", "CA"], "years": np.array([2023])}) == \
+        resultcache.make_key("f", np.int64(1), filters={"years": [2023], "states": ["TX", "CA"]})
@@ -0,0 +1,44 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from hcris import outliers, rollups, store
+
+
+def test_cube_sums_match_groupby(warehouse):
+    cube = rollups.load_cube(warehouse)
+    fin = store.read_table("financials", root=warehouse)
+
+    by_state = rollups.rollup(cube, ["State"], years=[2023])
+    expected = fin[fin["Year"] == 2023].groupby("State")
+    assert by_state["Hospital_Count"].tolist() == expected.size().tolist()
+    np.testing.assert_allclose(rollups.mean(by_state, "Operating_Cost"), expected["Operating_Cost"].mean())
+    np.testing.assert_allclose(rollups.mean(by_state, "Contract_Labor_Pct"), expected["Contract_Labor_Pct"].mean())
+
+    by_year = rollups.rollup(cube, ["Year"], types=["Teaching"])
+    teaching = fin[fin["Type"] == "Teaching"]
+    fte_per_bed = outliers.METRICS["FTE_per_Bed"](teaching).groupby(teaching["Year"]).mean()
+    np.testing.assert_allclose(rollups.mean(by_year, "FTE_per_Bed"), fte_per_bed)
+    extreme = (teaching["Operating_Margin"] > rollups.EXTREME_MARGIN).groupby(teaching["Year"]).sum()
+    assert by_year["Margin_Extreme_Positive"].tolist() == extreme.tolist()
+
+
+def test_aggregate_matches_cube(warehouse):
+    fin = store.read_table("financials", columns=rollups.SOURCE_COLUMNS + ["Year"], root=warehouse)
+    cells = rollups.rollup(rollups.load_cube(warehouse), ["Year", "State"])
+    pd.testing.assert_frame_equal(rollups.aggregate(fin, ["Year", "State"]), cells, check_dtype=False,
+                                  check_index_type=False)
+
+
+def test_refresh_rebuilds_only_changed_years(tmp_path, warehouse):
+    root = tmp_path / "warehouse"
+    shutil.copytree(warehouse, root, ignore=shutil.ignore_patterns("_*"))
+    assert sorted(rollups.refresh(root)) == [2022, 2023]
+    assert rollups.refresh(root) == []
+
+    fin = store.read_table("financials", years=[2023], root=root)
+    store.write_partition("financials", 2023, fin.head(100), root)
+    assert rollups.refresh(root) == [2023]
+    assert rollups.rollup(rollups.load_cube(root), ["Year"])["Hospital_Count"].to_dict() == {
+        2022: len(store.read_table("financials", years=[2022], root=root)), 2023: 100}
@@ -0,0 +1,19 @@
+import pandas as pd
+
+from hcris import search
+
+
+def test_history_by_provider():
+    records = pd.DataFrame({"Provider_Number": ["000002", "000001", "000002", "000001"],
+                            "Year": [2023, 2022, 2022, 2023], "Beds": [4.0, 1.0, 3.0, 2.0]})
+    index = search.HistoryIndex(records)
+    assert index.history("000001")["Beds"].tolist() == [1.0, 2.0]
+    assert index.history("000002")["Year"].tolist() == [2022, 2023]
+    assert "000003" not in index and index.history("000003").empty
+
+
+def test_history_without_records():
+    index = search.HistoryIndex(pd.DataFrame({"Provider_Number": pd.Series([], dtype=str),
+                                              "Year": pd.Series([], dtype=int)}))
+    assert "000001" not in index
+    assert index.history("000001").empty
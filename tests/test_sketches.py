@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from hcris import sketches, store
+
+
+def _records(rows, seed):
+    rng = np.random.default_rng(seed)
+    beds = rng.integers(10, 800, rows).astype(float)
+    return pd.DataFrame({
+        "State": rng.choice(["CA", "NY", "TX"], rows),
+        "Type": rng.choice(["Teaching", "Short Term"], rows),
+        "Beds": beds,
+        "FTE": beds * rng.lognormal(1.5, 0.5, rows),
+        "Net_Patient_Revenue": beds * rng.lognormal(14, 1, rows),
+        "Operating_Cost": rng.lognormal(18, 1.5, rows),
+        "Contract_Labor_Pct": np.where(rng.random(rows) < 0.05, 0.0, rng.gamma(2, 3, rows)),
+        "Operating_Margin": rng.normal(0, 15, rows),
+    })
+
+
+def _cells(years):
+    return pd.concat([sketches.build_year(fin).assign(Year=year) for year, fin in years.items()],
+                     ignore_index=True)
+
+
+def test_merge_is_order_independent():
+    years = {2022: _records(3000, 1), 2023: _records(3000, 2)}
+    merged = sketches.quantiles(_cells(years), ["Metric"], qs=(0.1, 0.5, 0.9))
+    reversed_ = sketches.quantiles(_cells(dict(reversed(list(years.items())))).iloc[::-1], ["Metric"],
+                                   qs=(0.1, 0.5, 0.9))
+    pd.testing.assert_frame_equal(merged, reversed_)
+
+
+def test_quantiles_within_alpha_of_exact():
+    years = {2022: _records(4000, 3), 2023: _records(4000, 4)}
+    cells = _cells(years)
+    records = pd.concat(years.values(), ignore_index=True)
+    qs = (0.05, 0.25, 0.5, 0.75, 0.95)
+    for metric, derive in sketches.METRICS.items():
+        for state in ("CA", "TX"):
+            selected = sketches.select(cells, metric, states=[state], types=["Teaching"])
+            estimate = sketches.quantiles(selected, ["Metric"], qs).iloc[0]
+            values = derive(records[(records["State"] == state) & (records["Type"] == "Teaching")]).dropna()
+            assert estimate["Count"] == len(values)
+            for q in qs:
+                exact = np.sort(values.to_numpy())[int(np.floor(q * (len(values) - 1)))]
+                assert abs(estimate[q] - exact) <= sketches.ALPHA * abs(exact) + sketches.MIN_MAGNITUDE, (metric, q)
+
+
+def test_load_sketches_without_years(tmp_path):
+    assert sketches.load_sketches(tmp_path).empty
+    assert list(store.read_derived("sketches", sketches.sketch_path, tmp_path).columns) == ["Year"]
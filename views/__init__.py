@@ -0,0 +1,22 @@
+"""Dashboard pages, one module each, imported on first selection."""
+import importlib
+
+# Sidebar label -> module implementing render(data_version), which returns
+# the filters the page applied ({'years': [...], 'states': [...]}) or None.
+# Pages whose controls rerun as fragments return a dict the fragment keeps
+# current, so it may still change (or be empty) after render returns.
+PAGES = {
+    "Overview": "views.overview",
+    "Contract Labor Analysis": "views.contract_labor",
+    "Financial Metrics": "views.financial_metrics",
+    "State Comparisons": "views.state_comparisons",
+    "Outlier Analysis": "views.outlier_analysis",
+    "Data Quality": "views.data_quality",
+    "Hospital Drill-down": "views.hospital_drilldown",
+    "Department Costs": "views.department_costs",
+}
+
+
+def render(page, data_version):
+    module = importlib.import_module(PAGES.get(page, PAGES["Overview"]))
+    return module.render(data_version)
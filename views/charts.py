@@ -0,0 +1,124 @@
+"""Chart builders that stay cheap to ship and draw as the data grows."""
+import os
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Up to GL_POINTS points are drawn as SVG; up to DENSITY_POINTS with WebGL;
+# beyond that the points are counted server-side on a fixed grid and only
+# the outliers are sent individually
+GL_POINTS = int(os.environ.get("HCRIS_GL_POINTS", "1000"))
+DENSITY_POINTS = int(os.environ.get("HCRIS_DENSITY_POINTS", "20000"))
+DENSITY_GRID = 80
+
+# Every figure spec embeds its whole template, and plotly_white is ~7 KB of
+# mostly unused trace defaults and colour scales.  compact() swaps it for
+# "hcris": only the plotly_white layout settings our 2D charts draw with.
+TEMPLATE = "hcris"
+_white = pio.templates["plotly_white"].layout
+pio.templates[TEMPLATE] = go.layout.Template(layout=dict(
+    colorway=_white.colorway,
+    font=_white.font,
+    hovermode=_white.hovermode,
+    hoverlabel=_white.hoverlabel,
+    paper_bgcolor=_white.paper_bgcolor,
+    plot_bgcolor=_white.plot_bgcolor,
+    coloraxis=_white.coloraxis,
+    xaxis=_white.xaxis,
+    yaxis=_white.yaxis,
+    title=_white.title,
+))
+
+# Trace arrays are sent as typed arrays (base64); floats are rounded to this
+# many significant digits and sent as float32, which holds about 7
+SIGNIFICANT_DIGITS = 6
+COMPACT = os.environ.get("HCRIS_COMPACT_CHARTS", "1") not in ("", "0")
+_ARRAYS = ("x", "y", "z", "base", "width", "customdata", "marker.size", "marker.color")
+
+
+def scatter(data, x, y, outlier=None, hover_name=None, title=None, labels=None, **px_kwargs):
+    """px.scatter of `data` whose rendering depends on its size.
+
+    `outlier` names a boolean column; in the density view those rows are
+    still drawn as individual points over the grid.  Other px.scatter
+    arguments (color, size, ...) apply to the point views only.
+    """
+    labels = labels or {}
+    if len(data) <= DENSITY_POINTS:
+        render_mode = "svg" if len(data) <= GL_POINTS else "webgl"
+        return px.scatter(data, x=x, y=y, hover_name=hover_name, title=title, labels=labels,
+                          render_mode=render_mode, **px_kwargs)
+
+    xs = data[x].to_numpy(dtype="float64", na_value=np.nan)
+    ys = data[y].to_numpy(dtype="float64", na_value=np.nan)
+    drawn = np.isfinite(xs) & np.isfinite(ys)
+    counts, x_edges, y_edges = np.histogram2d(xs[drawn], ys[drawn], bins=DENSITY_GRID)
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=np.where(counts > 0, counts, np.nan).T.astype("float32"),
+        colorscale="Blues",
+        colorbar=dict(title="Hospitals"),
+        hovertemplate="%{z:,} hospitals<extra></extra>",
+        name="Density"
+    ))
+
+    if outlier is not None:
+        points = data[data[outlier].to_numpy(dtype=bool, na_value=False) & drawn]
+        fig.add_trace(go.Scattergl(
+            x=points[x], y=points[y],
+            mode="markers",
+            marker=dict(color="#d62728", size=6),
+            text=points[hover_name] if hover_name else None,
+            hovertemplate="%{text}<br>%{x:,}, %{y:,}<extra></extra>" if hover_name else None,
+            name="Outliers"
+        ))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title=labels.get(x, x),
+        yaxis_title=labels.get(y, y)
+    )
+    return fig
+
+
+def _compact_array(values):
+    """`values` as the narrowest numpy array that displays the same."""
+    array = np.asarray(values)
+    if array.dtype.kind in "iu":
+        if not array.size:
+            return array
+        # the narrowest type holding both ends holds every value
+        return array.astype(np.result_type(np.min_scalar_type(array.min()), np.min_scalar_type(array.max())))
+    if array.dtype.kind != "f":
+        return values
+    finite = np.isfinite(array)
+    if finite.all() and np.array_equal(array, np.round(array)) and np.abs(array).max(initial=0) < 2**31:
+        return _compact_array(array.astype("int64"))
+    # round to SIGNIFICANT_DIGITS relative to each value's magnitude
+    magnitude = np.floor(np.log10(np.abs(np.where(finite & (array != 0), array, 1))))
+    scale = 10.0 ** (SIGNIFICANT_DIGITS - 1 - magnitude)
+    return (np.round(array * scale) / scale).astype("float32")
+
+
+def compact(fig):
+    """Shrink `fig`'s serialized spec in place: lean shared template and
+    numeric trace arrays rounded and narrowed before they are base64
+    encoded.  Returns `fig`."""
+    if not COMPACT:
+        return fig
+    fig.update_layout(template=TEMPLATE)
+    for trace in fig.data:
+        for path in _ARRAYS:
+            try:
+                values = trace[path]
+            except (KeyError, ValueError):
+                continue
+            if values is None or isinstance(values, (str, int, float)):
+                continue
+            compacted = _compact_array(values)
+            if compacted is not values:
+                trace[path] = compacted
+    return fig
@@ -0,0 +1,474 @@
+"""Loaders and figure caching shared by the page modules.
+
+Loader results and figure specs live in one process-wide result cache
+(hcris.resultcache), keyed on their arguments and the warehouse data
+version, with a TTL, a byte budget and single-flight computation.  Loaded
+data is held once and never copied per rerun; tables are immutable Arrow
+tables and each caller gets its own DataFrame over their buffers (see
+`shared`).
+"""
+import functools
+import os
+import threading
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from hcris import (bitmaps, contract_labor, db, departments, figcache, outliers, panel, peers,
+                   precompute, quality, resultcache, rollups, search, sketches, store, timing)
+from views import charts
+
+
+# Results shared by every session in the process
+@st.cache_resource
+def result_cache():
+    return resultcache.ResultCache(
+        max_bytes=int(os.environ.get("HCRIS_CACHE_MB", "256")) * 2**20,
+        ttl=float(os.environ.get("HCRIS_CACHE_TTL", "3600"))
+    )
+
+
+def cached(load):
+    """Cache `load`'s (immutable) result in the result cache, keyed on its arguments."""
+    @functools.wraps(load)
+    def lookup(*args, **kwargs):
+        key = resultcache.make_key(load.__qualname__, *args, **kwargs)
+        return result_cache().get_or_compute(key, lambda: load(*args, **kwargs))
+    return lookup
+
+
+def shared(load):
+    """Cache `load`'s DataFrame once per process as an immutable Arrow table.
+
+    Every call returns a new DataFrame backed by the table's buffers without
+    copying them (Arrow-backed dtypes), so adding or replacing columns on
+    it never reaches the cached table or another session's frame.
+    """
+    @cached
+    @functools.wraps(load)
+    def table(*args, **kwargs):
+        return pa.Table.from_pandas(load(*args, **kwargs), preserve_index=False)
+
+    @functools.wraps(load)
+    def view(*args, **kwargs):
+        with timing.span("load", load.__name__):
+            return table(*args, **kwargs).to_pandas(types_mapper=pd.ArrowDtype)
+    return view
+
+
+# One pooled, read-only connection set to the embedded database per process
+@st.cache_resource(show_spinner=False)
+def repository(version):
+    return db.open_repository()
+
+
+@cached
+def load_database_summary(version):
+    return MappingProxyType(repository(version).summary())
+
+
+# Hospital-year table and the bitmap index the global filters select from
+@shared
+def load_hospital_years(version):
+    """One row per hospital-year: the outlier flags plus Operating_Margin and
+    the bed-size band."""
+    margins = store.read_table("financials", columns=["Report_Id", "Operating_Margin"])
+    table = load_outlier_flags(version).merge(margins, on="Report_Id", how="left")
+    table['Bed_Band'] = bitmaps.bed_band(table['Beds'].to_numpy(dtype='float64', na_value=np.nan))
+    return table
+
+
+# filter key -> hospital-year index dimension
+FILTER_DIMENSIONS = {'years': 'Year', 'states': 'State', 'types': 'Type', 'bed_bands': 'Bed_Band'}
+# each metric's outlier flags are indexed too, so outlier counts are bitmap counts
+FLAG_DIMENSIONS = [f'{metric}_Outlier' for metric in outliers.METRICS]
+
+
+@st.cache_resource(show_spinner=False)
+def filter_index(version):
+    table = load_hospital_years(version)
+    columns = {
+        dimension: table[dimension].to_numpy(dtype=object if dimension != 'Year' else int)
+        for dimension in FILTER_DIMENSIONS.values()
+    }
+    columns.update({flag: table[flag].to_numpy(dtype=bool) for flag in FLAG_DIMENSIONS})
+    return bitmaps.BitmapIndex(columns)
+
+
+def criteria(filters):
+    """`filters` as BitmapIndex.select keywords."""
+    return {FILTER_DIMENSIONS[key]: values for key, values in (filters or {}).items()}
+
+
+@cached
+def selected_rows(version, filters):
+    """Positions of the hospital-year rows `filters` ({'years': [...], ...}) allows."""
+    index = filter_index(version)
+    rows = index.rows(index.select(**criteria(filters)))
+    rows.flags.writeable = False
+    return rows
+
+
+def narrow(filters, dimensions):
+    """`filters` further restricted to `dimensions` (e.g. years=[2023])."""
+    filters = dict(filters or {})
+    for key, values in dimensions.items():
+        filters[key] = [value for value in values if key not in filters or value in filters[key]]
+    return filters
+
+
+def hospital_years(version, filters=None, **dimensions):
+    """Hospital-year rows allowed by `filters`, further restricted to `dimensions`
+    (e.g. years=[2023]); the whole table when nothing is filtered."""
+    table = load_hospital_years(version)
+    filters = narrow(filters, dimensions)
+    if not filters:
+        return table
+    return table.take(selected_rows(version, filters))
+
+
+def rollup_cells(version, by, filters=None, **dimensions):
+    """Rollup measures (hcris.rollups) of the hospital-years allowed by
+    `filters` and `dimensions`, summed per `by`.
+
+    Year, state and type selections are summed from the rollup cube's
+    cells without reading any rows.  Bed-size bands are not a cube key, so
+    under a bed-size filter the selected rows are aggregated instead.
+    """
+    filters = narrow(filters, dimensions)
+    if 'bed_bands' in filters:
+        return rollups.aggregate(hospital_years(version, filters), by)
+    return rollups.rollup(load_rollups(version), by, filters.get('years'), filters.get('states'), filters.get('types'))
+
+
+def outlier_counts(version, metric, groups, filters=None, **dimensions):
+    """Hospital-years flagged as outliers on `metric` in each of `groups` (an
+    index over Year / State / Type, e.g. a rollup's), counted on the bitmap
+    index; an int array in `groups`' order."""
+    index = filter_index(version)
+    flagged = index.select(**criteria(narrow(filters, dimensions))) & index.any_of(f'{metric}_Outlier', [True])
+    counts = []
+    for group in groups:
+        group = group if isinstance(group, tuple) else (group,)
+        members = flagged
+        for name, value in zip(groups.names, group):
+            members = members & index.any_of(name, [value])
+        counts.append(index.count(members))
+    return np.array(counts, dtype=np.int64)
+
+
+@shared
+def load_state_contract(version, year, top_n=10, filters=None):
+    cells = rollup_cells(version, ['State'], filters, years=[year])
+    states = pd.DataFrame({
+        'Hospital_Count': cells['Hospital_Count'],
+        'Mean_Contract_Pct': rollups.mean(cells, 'Contract_Labor_Pct').round(1)
+    }).reset_index()
+    return states.sort_values(['Hospital_Count', 'State'], ascending=[False, True], ignore_index=True).head(top_n)
+
+
+@shared
+def load_margins(version, filters=None):
+    cells = rollup_cells(version, ['Year'], filters)
+    cells = cells[cells['Operating_Margin_Reported'] > 0]
+    spread = load_quantiles(version, 'Operating_Margin', (0.25, 0.5, 0.75), filters).set_index('Year')
+    margins = pd.DataFrame({
+        'Mean_Margin': rollups.mean(cells, 'Operating_Margin'),
+        'Median_Margin': spread['P50'],
+        'P25_Margin': spread['P25'],
+        'P75_Margin': spread['P75'],
+        'Extreme_Negative': cells['Margin_Extreme_Negative'],
+        'Extreme_Positive': cells['Margin_Extreme_Positive'],
+    }, index=cells.index).reset_index()
+    return margins.round({'Mean_Margin': 1, 'Median_Margin': 1, 'P25_Margin': 1, 'P75_Margin': 1})
+
+
+@shared
+def load_rollups(version):
+    return rollups.load_cube()
+
+
+@shared
+def load_sketches(version):
+    return sketches.load_sketches()
+
+
+@shared
+def load_quantiles(version, metric, qs=(0.5,), filters=None):
+    """Per-year quantiles `qs` of `metric` over the filtered hospital-years, as
+    columns P50, P25, ... plus the Count of values.
+
+    Merged from the per-cell quantile sketches, within a relative error of
+    sketches.ALPHA, for callers that read no rows themselves (their counts
+    and means come from the rollup cube).  Selections of at most
+    sketches.EXACT_MAX hospital-years, and bed-size filters (not a cube key),
+    are computed exactly from the rows.  Both take the value of rank
+    floor(q * (n - 1)), so a quantile does not jump when a selection crosses
+    EXACT_MAX.
+    """
+    filters = filters or {}
+    selected = len(selected_rows(version, filters)) if filters else filter_index(version).size
+    if selected <= sketches.EXACT_MAX or 'bed_bands' in filters:
+        grouped = hospital_years(version, filters).groupby('Year')[metric]
+        result = pd.DataFrame({'Count': grouped.count(),
+                               **{q: grouped.quantile(q, interpolation='lower') for q in qs}})
+    else:
+        cells = sketches.select(load_sketches(version), metric, filters.get('years'), filters.get('states'),
+                                filters.get('types'))
+        result = sketches.quantiles(cells, ['Year'], qs)
+    return result.rename(columns={q: f"P{q * 100:g}" for q in qs}).reset_index()
+
+
+@shared
+def load_quality(version, filters=None):
+    """Per-year quality checks; of the global filters only the years apply."""
+    results = quality.load_results()
+    if filters and 'years' in filters:
+        results = results[results['Year'].isin(filters['years'])]
+    return results
+
+
+@shared
+def load_operating_metrics(version, filters=None):
+    results = load_quality(version, filters)
+    operating_df = results[['Year', 'Records', 'Revenue_Complete', 'Cost_Complete', 'FTE_Complete', 'Contract_Complete']]
+    return operating_df.rename(columns={'Records': 'Total_Hospitals'}).round(1)
+
+
+@shared
+def load_state_financials(version, year, top_n=10, filters=None):
+    cells = rollup_cells(version, ['State'], filters, years=[year])
+    records = cells['Hospital_Count'].to_numpy(dtype='float64')
+    state_df = pd.DataFrame({
+        f'Hospital_Count_{year}': cells['Hospital_Count'],
+        f'Mean_Operating_Cost_{year}': rollups.mean(cells, 'Operating_Cost').round(0),
+    })
+    state_df['Mean_Operating_Cost_Millions'] = state_df[f'Mean_Operating_Cost_{year}'] / 1_000_000
+    flagged = outlier_counts(version, 'Operating_Cost', cells.index, filters, years=[year])
+    state_df['Outlier_Percentage'] = (flagged / records * 100).round(1)
+    state_df = state_df.sort_values(f'Hospital_Count_{year}', ascending=False).head(top_n)
+    return state_df.reset_index()
+
+
+@cached
+def load_state_map(version, filters=None):
+    """Per (year, state) arrays for the state map, computed once per data version
+    and filter selection.
+
+    Returns {'years', 'states', metric: 2-D array indexed [year, state]}
+    for Mean_Operating_Cost, Outlier_Percentage and Mean_Contract_Pct;
+    a state-year without reported values is NaN.
+    """
+    cells = rollup_cells(version, ['Year', 'State'], filters)
+    flagged = outlier_counts(version, 'Operating_Cost', cells.index, filters)
+    grid = pd.DataFrame({
+        'Mean_Operating_Cost': rollups.mean(cells, 'Operating_Cost'),
+        'Outlier_Percentage': flagged / cells['Hospital_Count'].to_numpy(dtype='float64') * 100,
+        'Mean_Contract_Pct': rollups.mean(cells, 'Contract_Labor_Pct'),
+    }, index=cells.index).astype('float64')
+    years = grid.index.unique('Year').sort_values()
+    states = grid.index.unique('State').sort_values()
+    full = pd.MultiIndex.from_product([years, states], names=['Year', 'State'])
+    arrays = {'years': years.to_numpy(dtype=int), 'states': states.to_numpy(dtype=str)}
+    for metric, values in grid.reindex(full).items():
+        arrays[metric] = values.to_numpy(dtype='float64', na_value=np.nan).reshape(len(years), len(states))
+    for array in arrays.values():
+        array.flags.writeable = False
+    return MappingProxyType(arrays)
+
+
+@cached
+def load_contract_stats(version, filters=None):
+    fin = hospital_years(version, filters)
+    stats = contract_labor.year_stats(fin['Year'].to_numpy(dtype=int),
+                                      fin['Contract_Labor_Pct'].to_numpy(dtype='float64', na_value=np.nan))
+    return MappingProxyType({year: MappingProxyType(row) for year, row in stats.to_dict('index').items()})
+
+
+@cached
+def load_contract_histograms(version, filters=None):
+    fin = hospital_years(version, filters)
+    histograms = contract_labor.year_histograms(fin['Year'].to_numpy(dtype=int),
+                                                fin['Contract_Labor_Pct'].to_numpy(dtype='float64', na_value=np.nan))
+    for counts in histograms.values():
+        counts.flags.writeable = False
+    return MappingProxyType(histograms)
+
+
+@shared
+def load_outlier_flags(version):
+    return outliers.load_flags()
+
+
+@shared
+def load_outlier_hospitals(version, metric, year, top_n=6, filters=None):
+    """The `top_n` flagged hospitals with the largest `metric` in `year`."""
+    top = outliers.top_k(hospital_years(version, filters, years=[year]), metric, top_n)
+    top = top.assign(Operating_Cost_Billions=top['Operating_Cost'] / 1_000_000_000)
+    names = repository(version).hospital_names(top['Provider_Number'])
+    return top.merge(names, on="Provider_Number", how="left")
+
+
+@cached
+def load_outlier_panel(version, filters=None):
+    """Hospital x year panel of every outlier metric (hcris.panel), read-only."""
+    grid = panel.build(hospital_years(version, filters))
+    for array in [grid.providers, grid.years, *grid.values.values(), *grid.flags.values()]:
+        array.flags.writeable = False
+    return grid._replace(values=MappingProxyType(grid.values), flags=MappingProxyType(grid.flags))
+
+
+@shared
+def load_persistent_outliers(version, min_years, filters=None):
+    """(Hospital, metric) pairs flagged in at least `min_years` of the selected years."""
+    table = panel.persistence_table(load_outlier_panel(version, filters), min_years)
+    names = repository(version).hospital_names(table['Provider_Number'].unique())
+    return table.merge(names, on="Provider_Number", how="left")
+
+
+@shared
+def load_persistent_trends(version, metric, min_years, top_n=5, filters=None):
+    """`metric` and its year-over-year change for the `top_n` most persistent
+    outliers on it, in every year they reported it."""
+    grid = load_outlier_panel(version, filters)
+    trend = panel.trends(grid, metric, panel.most_persistent(grid, metric, min_years, top_n))
+    names = repository(version).hospital_names(trend['Provider_Number'].unique())
+    return trend.merge(names, on="Provider_Number", how="left")
+
+
+@shared
+def load_outlier_points(version, metric, year, filters=None):
+    """Every hospital's record in `year`, labelled by whether `metric` is an outlier."""
+    points = hospital_years(version, filters, years=[year])
+    points = points.assign(Status=points[f'{metric}_Outlier'].map({True: 'Outlier', False: 'Typical'}))
+    names = repository(version).hospital_names(points['Provider_Number'])
+    return points.merge(names, on="Provider_Number", how="left")
+
+
+@shared
+def load_outlier_summary(version, metric, filters=None):
+    """Mean, median and outlier count of `metric` per year."""
+    cells = rollup_cells(version, ['Year'], filters)
+    median = load_quantiles(version, metric, filters=filters).set_index('Year')['P50']
+    summary = pd.DataFrame({'Mean': rollups.mean(cells, metric), 'Median': median}, index=cells.index)
+    summary['Outliers'] = outlier_counts(version, metric, cells.index, filters)
+    return summary.reset_index()
+
+
+@cached
+def load_department_years(version):
+    return tuple(departments.list_years())
+
+
+@shared
+def load_department_states(version, year):
+    """Department records, salaries and cost per (State, Cost_Center) in `year`."""
+    return departments.state_breakdown([year])
+
+
+@shared
+def load_department_hospitals(version, state, year):
+    """Hospitals in `state` with department records in `year`, by name."""
+    names = repository(version).hospital_names(departments.providers_in(state, year))
+    return names.sort_values('Hospital', ignore_index=True)
+
+
+@shared
+def load_department_hospital(version, provider_number):
+    """One hospital's department salaries and cost in every year."""
+    return departments.hospital_breakdown(provider_number)
+
+
+# Search and history indexes are built once per process and data version
+@st.cache_resource(show_spinner=False)
+def search_index(version):
+    return search.SearchIndex(store.read_hospitals(columns=["Hospital", "City", "State"]))
+
+
+@st.cache_resource(show_spinner=False)
+def history_index(version):
+    return search.HistoryIndex(store.read_table("financials"))
+
+
+# Peer groups: one KD-tree per data version and year
+@st.cache_resource(show_spinner=False)
+def peer_index(version, year):
+    return peers.PeerIndex(store.read_table("financials", years=[year]))
+
+
+@shared
+def load_peer_medians(version, year):
+    """Each hospital's peer-group median of peers.METRICS in `year`."""
+    return peer_index(version, year).peer_medians()
+
+
+_precomputed = set()
+_precompute_lock = threading.Lock()
+
+
+def precompute_all(version, progress=None):
+    """Build every derived aggregate and fill the loader caches, once per data version.
+
+    The warehouse-side aggregates are fanned out over a process pool
+    (hcris.precompute); the loaders then read them into the shared caches.
+    Sessions arriving meanwhile wait on the lock instead of repeating the work.
+    `progress(done, total, label)` is called after each step.
+    """
+    with _precompute_lock:
+        if version in _precomputed:
+            return
+        years = store.list_years("financials")
+        warmers = [
+            ("loaders", lambda: (load_rollups(version), load_sketches(version), load_quality(version),
+                                 load_operating_metrics(version), load_outlier_flags(version),
+                                 load_hospital_years(version), filter_index(version),
+                                 [load_state_financials(version, year) for year in years])),
+            ("contract labor", lambda: (load_contract_stats(version), load_contract_histograms(version),
+                                        [load_state_contract(version, year) for year in years])),
+            ("financial metrics", lambda: (load_margins(version), load_database_summary(version),
+                                           [load_outlier_summary(version, metric) for metric in outliers.METRICS])),
+            ("search index", lambda: (search_index(version), history_index(version))),
+            ("peer groups", lambda: [load_peer_medians(version, year) for year in years]),
+            ("outlier panel", lambda: load_outlier_panel(version)),
+            ("departments", lambda: [load_department_states(version, year)
+                                     for year in load_department_years(version)]),
+        ]
+        tasks, _ = precompute.plan()
+        total = len(tasks) + len(warmers)
+
+        def report(done, _, label):
+            if progress is not None:
+                progress(done, total, label)
+
+        done = precompute.run(progress=report)
+        for label, warm in warmers:
+            with timing.span("warm", label):
+                warm()
+            done += 1
+            report(done, total, label)
+        _precomputed.add(version)
+
+
+def figures(page, data_version):
+    """Figure lookup for one page render: `cached_figure(name, build, **filters)`
+    runs `build()` only when the (page, name, filters, data version)
+    combination has not been seen, and caches the compacted figure's JSON."""
+    def cached_figure(name, build, **filters):
+        key = resultcache.make_key("figure", page, name, data_version, **filters)
+
+        def timed_build():
+            with timing.span("build", name):
+                return charts.compact(build()).to_json()
+
+        with timing.span("figure", name):
+            return figcache.CachedFigure(result_cache().get_or_compute(key, timed_build))
+    return cached_figure
+
+
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart, timed (serialization and sending to the browser)."""
+    with timing.span("plotly_chart"):
+        return st.plotly_chart(fig, **kwargs)
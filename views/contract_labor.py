@@ -0,0 +1,174 @@
+"""Contract Labor Analysis page."""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import numpy as np
+
+from hcris import contract_labor
+from views import crossfilter
+from views.common import (figures, load_contract_histograms, load_contract_stats, load_outlier_hospitals,
+                          load_state_contract, plotly_chart)
+
+PAGE = "Contract Labor Analysis"
+
+
+def render(data_version):
+    st.header("👷 Contract Labor Analysis")
+    
+    # Per-year statistics are computed once per data version; switching
+    # years is a dictionary lookup
+    selection = crossfilter.active(data_version)
+    contract_stats = load_contract_stats(data_version, selection)
+    years = sorted(contract_stats)
+    if not years:
+        st.info("No contract labor figures for the selected hospitals.")
+        return None
+    
+    # Everything below the header depends on the selected year; it reruns on
+    # its own when the year changes, without the rest of the app
+    filters = {}
+    year_sections(data_version, years, selection, filters)
+
+    # Filters applied on this page, offered to the sidebar export; kept
+    # current by the fragment
+    return filters
+
+
+@st.fragment
+def year_sections(data_version, years, selection, filters):
+    cached_figure = figures(PAGE, data_version)
+    contract_stats = load_contract_stats(data_version, selection)
+
+    # Year selector
+    year_col1, year_col2 = st.columns([1, 3])
+    with year_col1:
+        selected_year = st.selectbox("Select Year", years, index=years.index(2023) if 2023 in years else len(years) - 1)
+    
+    stats = contract_stats[selected_year]
+    
+    # Display key metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Mean Contract %", f"{stats['mean']:.1f}%")
+    with col2:
+        st.metric("Median Contract %", f"{stats['median']:.1f}%")
+    with col3:
+        st.metric("Max Contract %", f"{stats['max']:.1f}%")
+    with col4:
+        st.metric("Within Target (3-5%)", f"{stats['within_target']:.1f}%")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Distribution histogram - bins are counted server-side, so the chart
+        # ships 50 bar heights whatever the hospital count
+        counts = load_contract_histograms(data_version, selection)[selected_year]
+        edges = contract_labor.HISTOGRAM_EDGES
+        def build_dist():
+            fig_dist = go.Figure(go.Bar(
+                x=(edges[:-1] + edges[1:]) / 2, y=counts,
+                width=np.diff(edges),
+                name='Hospitals',
+                hovertemplate='%{x:.1f}%: %{y} hospitals<extra></extra>'
+            ))
+            fig_dist.update_layout(
+                title=f"Contract Labor Distribution - {selected_year}",
+                xaxis_title="Contract Labor %",
+                yaxis_title="Number of Hospitals",
+                bargap=0
+            )
+        
+            # Add target range
+            fig_dist.add_vline(x=3, line_dash="dash", line_color="green", annotation_text="Target Min (3%)")
+            fig_dist.add_vline(x=5, line_dash="dash", line_color="green", annotation_text="Target Max (5%)")
+            fig_dist.update_layout(template="plotly_white", height=400)
+            return fig_dist
+        
+        fig_dist = cached_figure('dist', build_dist, year=selected_year, selection=selection)
+        plotly_chart(fig_dist, use_container_width=True)
+    
+    with col2:
+        # Target range analysis
+        target_data = pd.DataFrame({
+            'Category': contract_labor.TARGET_CATEGORIES,
+            'Percentage': [stats['below_target'], stats['within_target'], stats['above_target']],
+            'Color': ['#ff4444', '#44ff44', '#ffaa44']
+        })
+        
+        def build_target():
+            fig_target = px.pie(
+                target_data, values='Percentage', names='Category',
+                title=f"Target Range Distribution - {selected_year}",
+                color='Category',
+                color_discrete_map={
+                    'Below Target (<3%)': '#ff4444',
+                    'Within Target (3-5%)': '#44ff44', 
+                    'Above Target (>5%)': '#ffaa44'
+                }
+            )
+            fig_target.update_layout(template="plotly_white", height=400)
+            return fig_target
+        
+        fig_target = cached_figure('target', build_target, year=selected_year, selection=selection)
+        plotly_chart(fig_target, use_container_width=True)
+    
+    # State-wise analysis
+    st.subheader("State-wise Contract Labor Analysis")
+    
+    # Top states for the selected year, summed from the rollup cube
+    top_states_data = load_state_contract(data_version, selected_year, filters=selection)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        def build_states():
+            fig_states = px.bar(
+                top_states_data, x='State', y='Hospital_Count',
+                title="Hospital Count by State",
+                color='Hospital_Count',
+                color_continuous_scale='Blues'
+            )
+            fig_states.update_layout(template="plotly_white", height=400)
+            return fig_states
+        
+        fig_states = cached_figure('states', build_states, year=selected_year, selection=selection)
+        plotly_chart(fig_states, use_container_width=True)
+    
+    with col2:
+        def build_contract_states():
+            fig_contract_states = px.bar(
+                top_states_data, x='State', y='Mean_Contract_Pct',
+                title="Mean Contract Labor % by State",
+                color='Mean_Contract_Pct',
+                color_continuous_scale='Reds'
+            )
+            fig_contract_states.add_hline(y=3, line_dash="dash", line_color="green", annotation_text="Target Min")
+            fig_contract_states.add_hline(y=5, line_dash="dash", line_color="green", annotation_text="Target Max")
+            fig_contract_states.update_layout(template="plotly_white", height=400)
+            return fig_contract_states
+        
+        fig_contract_states = cached_figure('contract_states', build_contract_states, year=selected_year,
+                                            selection=selection)
+        plotly_chart(fig_contract_states, use_container_width=True)
+    
+    # High outlier hospitals
+    st.subheader("⚠️ High Contract Labor Outliers")
+    outlier_hospitals_cl = load_outlier_hospitals(data_version, 'Contract_Labor_Pct', year=selected_year, top_n=4,
+                                                  filters=selection)
+    
+    def build_outliers():
+        fig_outliers = px.bar(
+            outlier_hospitals_cl, x='Hospital', y='Contract_Labor_Pct',
+            color='State',
+            title=f"Highest Contract Labor Outliers Within State ({selected_year})",
+            labels={'Contract_Labor_Pct': 'Contract Labor %'}
+        )
+        fig_outliers.update_layout(template="plotly_white", height=400, xaxis_tickangle=-45)
+        return fig_outliers
+    
+    fig_outliers = cached_figure('outliers', build_outliers, year=selected_year, selection=selection)
+    plotly_chart(fig_outliers, use_container_width=True)
+
+    filters['years'] = [int(selected_year)]
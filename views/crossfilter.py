@@ -0,0 +1,71 @@
+"""Global sidebar filters (years, states, hospital types, bed sizes).
+
+The sidebar widgets are drawn once per rerun by app.py; pages read the
+current selection with `active()` and pass it to their loaders, which
+select hospital-year rows through the bitmap index (hcris.bitmaps) rather
+than boolean-indexing the table.
+"""
+import streamlit as st
+
+from hcris import bitmaps
+from views.common import criteria, filter_index
+
+
+def sidebar(data_version):
+    """Draw the filter widgets; returns the active filters (see `active`)."""
+    index = filter_index(data_version)
+    years = index.values('Year')
+    bands = [band for band in [*bitmaps.BED_BANDS, bitmaps.UNKNOWN_BAND] if band in index.bitmaps['Bed_Band']]
+
+    st.sidebar.markdown("### 🔎 Filters")
+    if len(years) > 1:
+        st.sidebar.select_slider("Years", years, value=(years[0], years[-1]), key="filter_years")
+    st.sidebar.multiselect("States", index.values('State'), key="filter_states", placeholder="All states")
+    st.sidebar.multiselect("Hospital types", index.values('Type'), key="filter_types", placeholder="All types")
+    st.sidebar.multiselect("Bed size", bands, key="filter_bed_bands", placeholder="All sizes")
+
+    filters = active(data_version)
+    selected = index.count(select(index, filters))
+    st.sidebar.caption(f"{selected:,} of {index.size:,} hospital-years selected")
+    if not selected:
+        st.warning("No hospitals match the sidebar filters.")
+        st.stop()
+    return filters
+
+
+def active(data_version):
+    """The constrained filters as {'years': [...], 'states': [...], ...}, or None
+    when nothing is filtered.  Unconstrained dimensions are left out, so equal
+    selections give equal cache keys."""
+    index = filter_index(data_version)
+    filters = {}
+    years = index.values('Year')
+    low, high = st.session_state.get("filter_years", (years[0], years[-1]) if years else (None, None))
+    if years and (low, high) != (years[0], years[-1]):
+        filters['years'] = [year for year in years if low <= year <= high]
+    for key in ('states', 'types', 'bed_bands'):
+        values = st.session_state.get(f"filter_{key}")
+        if values:
+            filters[key] = sorted(values)
+    return filters or None
+
+
+def select(index, filters):
+    """Bitmap of the rows `filters` allows."""
+    return index.select(**criteria(filters))
+
+
+def allowed(filters, key, values):
+    """The `values` that `filters` lets through on `key`, in order."""
+    if not filters or key not in filters:
+        return list(values)
+    return [value for value in values if value in filters[key]]
+
+
+def focus_year(data_version, filters, default=2023):
+    """The year a single-year view shows: `default` if the filters allow it,
+    else the latest year they do."""
+    years = allowed(filters, 'years', filter_index(data_version).values('Year'))
+    if default in years or not years:
+        return default
+    return years[-1]
@@ -0,0 +1,159 @@
+"""Data Quality page."""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from hcris import quality
+from views import crossfilter
+from views.common import figures, load_operating_metrics, load_outlier_summary, load_quality, plotly_chart
+
+PAGE = "Data Quality"
+
+
+def render(data_version):
+    cached_figure = figures(PAGE, data_version)
+    selection = crossfilter.active(data_version)
+
+    st.header("🔍 Data Quality Assessment")
+    # Checks are stored per year, so of the sidebar filters only the year range applies
+    operating_df = load_operating_metrics(data_version, selection)
+    quality_df = load_quality(data_version, selection)
+    totals = quality_df.sum()
+    
+    # Data completeness matrix
+    st.subheader("Data Completeness Matrix")
+    
+    completeness_matrix = operating_df[['Year', 'Revenue_Complete', 'Cost_Complete', 'FTE_Complete', 'Contract_Complete']].set_index('Year')
+    
+    def build_heatmap():
+        fig_heatmap = px.imshow(
+            completeness_matrix.T,
+            aspect="auto",
+            color_continuous_scale='RdYlGn',
+            title="Data Completeness Heatmap (%)",
+            labels={'x': 'Year', 'y': 'Data Type', 'color': 'Completeness %'}
+        )
+        fig_heatmap.update_layout(template="plotly_white", height=400)
+        return fig_heatmap
+    
+    fig_heatmap = cached_figure('heatmap', build_heatmap, selection=selection)
+    plotly_chart(fig_heatmap, use_container_width=True)
+    
+    # Data quality issues
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Data Quality Issues")
+        
+        quality_issues = quality.issue_counts(quality_df)
+        
+        def build_issues():
+            fig_issues = px.bar(
+                quality_issues, x='Issue Type', y='Count',
+                color='Severity',
+                color_discrete_map={'High': '#ff4444', 'Medium': '#ffaa44', 'None': '#44ff44'},
+                title="Data Quality Issues Count"
+            )
+            fig_issues.update_layout(template="plotly_white", height=400, xaxis_tickangle=-45)
+            return fig_issues
+        
+        fig_issues = cached_figure('issues', build_issues, selection=selection)
+        plotly_chart(fig_issues, use_container_width=True)
+    
+    with col2:
+        st.subheader("Database Integrity")
+        
+        orphaned_fin = totals['Orphaned_Financial']
+        orphaned_dept = totals['Orphaned_Department']
+        consistent = orphaned_fin == 0 and orphaned_dept == 0
+        integrity_metrics = pd.DataFrame({
+            'Metric': ['Orphaned Financial Records', 'Orphaned Department Records', 'Total Records', 'Data Consistency'],
+            'Value': [f"{orphaned_fin:,}", f"{orphaned_dept:,}", f"{totals['Department_Records']:,}",
+                      'Good' if consistent else 'Review'],
+            'Status': ['✅ Good' if orphaned_fin == 0 else '❌ Orphans',
+                       '✅ Good' if orphaned_dept == 0 else '❌ Orphans',
+                       '📊 Info',
+                       '✅ Good' if consistent else '⚠️ Review']
+        })
+        
+        st.dataframe(integrity_metrics, use_container_width=True, hide_index=True)
+    
+    # Year-over-year data availability
+    st.subheader("Data Availability Trends")
+    
+    def build_availability():
+        fig_availability = go.Figure()
+    
+        for column in ['Revenue_Complete', 'Cost_Complete', 'FTE_Complete', 'Contract_Complete']:
+            fig_availability.add_trace(go.Scatter(
+                x=operating_df['Year'], 
+                y=operating_df[column],
+                mode='lines+markers',
+                name=column.replace('_Complete', ' Data'),
+                line=dict(width=3)
+            ))
+    
+        fig_availability.update_layout(
+            title="Data Completeness Trends Over Time",
+            xaxis_title="Year",
+            yaxis_title="Completeness (%)",
+            template="plotly_white",
+            height=400,
+            yaxis=dict(range=[65, 100])
+        )
+        return fig_availability
+    
+    fig_availability = cached_figure('availability', build_availability, selection=selection)
+    plotly_chart(fig_availability, use_container_width=True)
+    
+    # Data quality recommendations
+    st.subheader("🔧 Data Quality Recommendations")
+    
+    fte_outliers = load_outlier_summary(data_version, 'FTE_per_Bed', selection)['Outliers'].sum()
+    contract_coverage = (quality_df['Contract_Complete'] * quality_df['Records']).sum() / totals['Records']
+    st.markdown(f"""
+    <div class="critical-card">
+        <h4 style="color: #d32f2f; margin-top: 0;">🎯 Priority Issues to Address</h4>
+        
+        <div class="high-priority">
+            <h5 style="color: #e65100; margin-top: 0;">🔴 HIGH PRIORITY</h5>
+            <div style="margin-left: 1rem;">
+                <strong>1. Contract Labor Coverage:</strong> Only ~{contract_coverage:.0f}% of hospitals report contract labor data<br>
+                <em>→ Implement mandatory reporting requirements and data validation checks</em>
+            </div>
+        </div>
+        
+        <div class="high-priority">
+            <h5 style="color: #e65100; margin-top: 0;">🔴 CRITICAL</h5>
+            <div style="margin-left: 1rem;">
+                <strong>2. Negative Values:</strong> {totals['Negative_Revenue']:,} hospitals with negative revenue need investigation<br>
+                <em>→ Immediate data audit and correction procedures required</em>
+            </div>
+        </div>
+        
+        <div class="medium-priority">
+            <h5 style="color: #7b1fa2; margin-top: 0;">🟡 MEDIUM PRIORITY</h5>
+            <div style="margin-left: 1rem;">
+                <strong>3. FTE Ratios:</strong> {totals['Implausible_FTE_per_Bed']:,} hospitals have unreasonable FTE/bed ratios and {fte_outliers:,} records are outliers within their state<br>
+                <em>→ Review staffing calculation methodologies and outlier detection</em>
+            </div>
+        </div>
+        
+        <div class="medium-priority">
+            <h5 style="color: #7b1fa2; margin-top: 0;">🟡 MEDIUM PRIORITY</h5>
+            <div style="margin-left: 1rem;">
+                <strong>4. Extreme Margins:</strong> High number of hospitals with extreme operating margins<br>
+                <em>→ Investigate business model variations and reporting accuracy</em>
+            </div>
+        </div>
+        
+        <div class="low-priority">
+            <h5 style="color: #388e3c; margin-top: 0;">🟢 ONGOING</h5>
+            <div style="margin-left: 1rem;">
+                <strong>5. Data Validation:</strong> Implement stronger validation rules for financial metrics<br>
+                <em>→ Establish automated quality checks and alert systems</em>
+            </div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
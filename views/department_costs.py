@@ -0,0 +1,162 @@
+"""Department Costs page."""
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+from views import crossfilter
+from views.common import (figures, load_department_hospital, load_department_hospitals, load_department_states,
+                          load_department_years, plotly_chart)
+
+PAGE = "Department Costs"
+TOP_STATES = 15
+
+
+def render(data_version):
+    st.header("🏬 Department Cost Analysis")
+
+    # Department arrays carry year and state only: the sidebar's type and
+    # bed-size filters don't apply here
+    selection = crossfilter.active(data_version)
+    years = crossfilter.allowed(selection, 'years', load_department_years(data_version))
+    if not years:
+        st.info("No department records in the selected years.")
+        return None
+    if selection and selection.keys() - {'years', 'states'}:
+        st.caption("Hospital type and bed-size filters don't apply to department costs.")
+
+    # Breakdowns are reduced from memory-mapped cost-center arrays, a chunk
+    # of records at a time; everything below depends on the selected year
+    # and reruns on its own
+    filters = {}
+    department_sections(data_version, years, selection, filters)
+
+    # Filters applied on this page, offered to the sidebar export; kept
+    # current by the fragment
+    return filters
+
+
+@st.fragment
+def department_sections(data_version, years, selection, filters):
+    cached_figure = figures(PAGE, data_version)
+
+    year_col1, year_col2 = st.columns([1, 3])
+    with year_col1:
+        selected_year = st.selectbox("Select Year", years, index=len(years) - 1, key="department_year")
+
+    cells = load_department_states(data_version, selected_year)
+    if selection and 'states' in selection:
+        cells = cells[cells['State'].isin(selection['states'])]
+    if cells.empty:
+        st.info("No department records in the selected states.")
+        return
+    total_cost = cells['Total_Cost'].sum()
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Department Records", f"{cells['Records'].sum():,}")
+    with col2:
+        st.metric("Total Department Cost", f"${total_cost / 1_000_000_000:,.1f}B")
+    with col3:
+        st.metric("Salaries Share", f"{cells['Salaries'].sum() / total_cost * 100:.1f}%" if total_cost else "n/a")
+    with col4:
+        st.metric("Cost Centers", f"{cells['Cost_Center'].nunique():,}")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        def build_departments():
+            national = cells.groupby('Department', as_index=False)[['Salaries', 'Total_Cost']].sum()
+            national = national.assign(Total_Cost_Millions=national['Total_Cost'] / 1_000_000)
+            fig_departments = px.bar(
+                national.sort_values('Total_Cost_Millions'),
+                x='Total_Cost_Millions', y='Department',
+                orientation='h',
+                title=f"Total Cost by Department - {selected_year}",
+                labels={'Total_Cost_Millions': 'Total Cost ($ Millions)'}
+            )
+            fig_departments.update_layout(template="plotly_white", height=600)
+            return fig_departments
+
+        fig_departments = cached_figure('departments', build_departments, year=selected_year, selection=selection)
+        plotly_chart(fig_departments, use_container_width=True)
+
+    with col2:
+        def build_state_mix():
+            # Each department's share of the state's total cost, for the
+            # states with the most department spending
+            state_cost = cells.groupby('State')['Total_Cost'].sum()
+            top = state_cost.nlargest(TOP_STATES).index
+            mix = cells[cells['State'].isin(top)].pivot_table(
+                index='Department', columns='State', values='Total_Cost', aggfunc='sum', fill_value=0
+            )[top]
+            share = mix / state_cost[top] * 100
+            fig_state_mix = go.Figure(go.Heatmap(
+                z=share.to_numpy(), x=share.columns, y=share.index,
+                colorscale='Blues',
+                colorbar=dict(title="% of cost"),
+                hovertemplate='%{x} %{y}: %{z:.1f}%<extra></extra>'
+            ))
+            fig_state_mix.update_layout(
+                title=f"Department Mix - Top {TOP_STATES} States by Cost",
+                template="plotly_white",
+                height=600
+            )
+            return fig_state_mix
+
+        fig_state_mix = cached_figure('state_mix', build_state_mix, year=selected_year, selection=selection)
+        plotly_chart(fig_state_mix, use_container_width=True)
+
+    # One hospital's departments: its records are a single contiguous slice
+    # of the arrays
+    st.subheader("Hospital Department Breakdown")
+    states = sorted(cells['State'].unique())
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        selected_state = st.selectbox("State", states, key="department_state")
+    hospitals = load_department_hospitals(data_version, selected_state, selected_year)
+    with col2:
+        provider = st.selectbox(
+            "Hospital", hospitals['Provider_Number'],
+            format_func=dict(zip(hospitals['Provider_Number'], hospitals['Hospital'])).get,
+            key="department_hospital"
+        )
+
+    filters.update(years=[int(selected_year)], states=[selected_state])
+    if provider is None:
+        st.info("No hospitals with department records in this state.")
+        return
+
+    breakdown = load_department_hospital(data_version, provider)
+    year_breakdown = breakdown[breakdown['Year'] == selected_year]
+
+    def build_hospital():
+        fig_hospital = go.Figure()
+        ordered = year_breakdown.sort_values('Total_Cost', ascending=False)
+        fig_hospital.add_trace(go.Bar(
+            x=ordered['Department'], y=ordered['Salaries'] / 1_000_000,
+            name='Salaries', marker_color='#1f77b4'
+        ))
+        fig_hospital.add_trace(go.Bar(
+            x=ordered['Department'], y=(ordered['Total_Cost'] - ordered['Salaries']) / 1_000_000,
+            name='Other Cost', marker_color='#ff7f0e'
+        ))
+        fig_hospital.update_layout(
+            title=f"Department Costs - {selected_year}",
+            yaxis_title="$ Millions",
+            barmode='stack',
+            template="plotly_white",
+            height=450,
+            xaxis_tickangle=-45
+        )
+        return fig_hospital
+
+    fig_hospital = cached_figure('hospital', build_hospital, provider=provider, year=selected_year)
+    plotly_chart(fig_hospital, use_container_width=True)
+
+    # Department cost in every year the hospital reported
+    history = breakdown.pivot_table(index='Department', columns='Year', values='Total_Cost', aggfunc='sum')
+    st.dataframe(
+        (history / 1_000_000).round(2).rename(columns=lambda year: f"{year} ($M)"),
+        use_container_width=True
+    )
@@ -0,0 +1,125 @@
+"""Financial Metrics page."""
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+from views import crossfilter
+from views.common import figures, load_margins, load_outlier_summary, plotly_chart
+
+PAGE = "Financial Metrics"
+
+
+def render(data_version):
+    cached_figure = figures(PAGE, data_version)
+    selection = crossfilter.active(data_version)
+
+    st.header("💰 Financial Metrics Analysis")
+    
+    # Operating margin analysis
+    st.subheader("Operating Margin Trends")
+    
+    margin_data = load_margins(data_version, selection)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        def build_margin_trend():
+            fig_margin_trend = go.Figure()
+            # Middle half of hospitals: 25th to 75th percentile
+            fig_margin_trend.add_trace(go.Scatter(
+                x=margin_data['Year'], y=margin_data['P75_Margin'],
+                mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'
+            ))
+            fig_margin_trend.add_trace(go.Scatter(
+                x=margin_data['Year'], y=margin_data['P25_Margin'],
+                mode='lines', line=dict(width=0), fill='tonexty', fillcolor='rgba(31, 119, 180, 0.15)',
+                name='25th-75th Percentile', hoverinfo='skip'
+            ))
+            fig_margin_trend.add_trace(go.Scatter(
+                x=margin_data['Year'], y=margin_data['Median_Margin'],
+                mode='lines+markers', name='Median Margin',
+                line=dict(color='#1f77b4', width=3)
+            ))
+            fig_margin_trend.update_layout(
+                title="Median Operating Margin Trend",
+                xaxis_title="Year",
+                yaxis_title="Operating Margin (%)",
+                template="plotly_white",
+                height=400
+            )
+            fig_margin_trend.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="Break-even")
+            return fig_margin_trend
+        
+        fig_margin_trend = cached_figure('margin_trend', build_margin_trend, selection=selection)
+        plotly_chart(fig_margin_trend, use_container_width=True)
+    
+    with col2:
+        # Extreme margins
+        def build_extreme():
+            fig_extreme = go.Figure()
+            fig_extreme.add_trace(go.Bar(
+                x=margin_data['Year'], y=margin_data['Extreme_Negative'],
+                name='Extreme Losses (<-50%)', marker_color='#ff4444'
+            ))
+            fig_extreme.add_trace(go.Bar(
+                x=margin_data['Year'], y=margin_data['Extreme_Positive'],
+                name='Extreme Gains (>50%)', marker_color='#44ff44'
+            ))
+            fig_extreme.update_layout(
+                title="Hospitals with Extreme Margins",
+                xaxis_title="Year",
+                yaxis_title="Number of Hospitals",
+                template="plotly_white",
+                height=400
+            )
+            return fig_extreme
+        
+        fig_extreme = cached_figure('extreme', build_extreme, selection=selection)
+        plotly_chart(fig_extreme, use_container_width=True)
+    
+    # Revenue per bed analysis
+    st.subheader("Revenue per Bed Analysis")
+    
+    # Outliers are flagged against each hospital's state and year
+    revenue_df = load_outlier_summary(data_version, 'Revenue_per_Bed', selection)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        def build_revenue():
+            fig_revenue = go.Figure()
+            fig_revenue.add_trace(go.Scatter(
+                x=revenue_df['Year'], y=revenue_df['Mean'],
+                mode='lines+markers', name='Mean Revenue/Bed',
+                line=dict(color='#2ca02c', width=3)
+            ))
+            fig_revenue.add_trace(go.Scatter(
+                x=revenue_df['Year'], y=revenue_df['Median'],
+                mode='lines+markers', name='Median Revenue/Bed',
+                line=dict(color='#ff7f0e', width=3)
+            ))
+            fig_revenue.update_layout(
+                title="Revenue per Bed Trends",
+                xaxis_title="Year",
+                yaxis_title="Revenue per Bed ($)",
+                template="plotly_white",
+                height=400
+            )
+            return fig_revenue
+        
+        fig_revenue = cached_figure('revenue', build_revenue, selection=selection)
+        plotly_chart(fig_revenue, use_container_width=True)
+    
+    with col2:
+        def build_outliers_rev():
+            fig_outliers_rev = px.bar(
+                revenue_df, x='Year', y='Outliers',
+                title="Revenue per Bed Outliers by Year",
+                color='Outliers',
+                color_continuous_scale='Oranges'
+            )
+            fig_outliers_rev.update_layout(template="plotly_white", height=400)
+            return fig_outliers_rev
+        
+        fig_outliers_rev = cached_figure('outliers_rev', build_outliers_rev, selection=selection)
+        plotly_chart(fig_outliers_rev, use_container_width=True)
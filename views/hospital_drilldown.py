@@ -0,0 +1,210 @@
+"""Hospital Drill-down page."""
+import math
+
+import streamlit as st
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from views import crossfilter
+from views.common import figures, history_index, load_peer_medians, peer_index, plotly_chart, search_index
+
+PAGE = "Hospital Drill-down"
+PEER_COUNT = 25
+
+# Peer comparison metric -> (label, display scale, metric format, delta_color)
+PEER_METRICS = {
+    'Contract_Labor_Pct': ("Contract Labor %", 1, "{:.1f}%", "inverse"),
+    'Operating_Margin': ("Operating Margin %", 1, "{:.1f}%", "normal"),
+    'Revenue_per_Bed': ("Revenue per Bed ($K)", 1_000, "${:,.0f}K", "off"),
+}
+
+
+def _value(value, template):
+    return "n/a" if value is None or math.isnan(value) else template.format(value)
+
+
+def render(data_version):
+    st.header("🏥 Hospital Drill-down")
+
+    # Searching and picking a hospital rerun only the section below
+    filters = {}
+    hospital_sections(data_version, filters)
+
+    # Filters applied on this page, offered to the sidebar export; kept
+    # current by the fragment
+    return filters
+
+
+@st.fragment
+def hospital_sections(data_version, filters):
+    cached_figure = figures(PAGE, data_version)
+    filters.clear()
+
+    # Matches come from an in-memory name / CCN index, so each query is a
+    # fraction of a millisecond whatever the hospital count
+    query = st.text_input("Search by hospital name or CCN", placeholder="e.g. Stanford, 050441")
+    if not query:
+        st.info("Type part of a hospital name or its CMS Certification Number (CCN).")
+        return
+
+    # The sidebar's state filter narrows the matches
+    selection = crossfilter.active(data_version) or {}
+    matches = search_index(data_version).search(query, limit=20, states=selection.get('states'))
+    if not matches:
+        st.warning(f"No hospitals match '{query}'" + (" in the selected states." if 'states' in selection else "."))
+        return
+
+    match = st.selectbox(
+        f"{len(matches)} best matches",
+        matches,
+        format_func=lambda m: f"{m.hospital} — {m.city}, {m.state} (CCN {m.provider_number})"
+    )
+
+    history = history_index(data_version).history(match.provider_number)
+    if history.empty:
+        st.warning("No financial reports on file for this hospital.")
+        return
+    latest = history.iloc[-1]
+
+    st.subheader(f"{match.hospital} ({int(latest['Year'])})")
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Beds", _value(latest['Beds'], "{:,.0f}"))
+    with col2:
+        st.metric("Operating Cost", _value(latest['Operating_Cost'] / 1_000_000, "${:,.1f}M"))
+    with col3:
+        st.metric("Operating Margin", _value(latest['Operating_Margin'], "{:.1f}%"))
+    with col4:
+        st.metric("Contract Labor %", _value(latest['Contract_Labor_Pct'], "{:.1f}%"))
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        def build_financials():
+            fig_financials = go.Figure()
+            fig_financials.add_trace(go.Scatter(
+                x=history['Year'], y=history['Net_Patient_Revenue'] / 1_000_000,
+                mode='lines+markers', name='Net Patient Revenue',
+                line=dict(color='#2ca02c', width=3)
+            ))
+            fig_financials.add_trace(go.Scatter(
+                x=history['Year'], y=history['Operating_Cost'] / 1_000_000,
+                mode='lines+markers', name='Operating Cost',
+                line=dict(color='#d62728', width=3)
+            ))
+            fig_financials.update_layout(
+                title="Revenue and Operating Cost",
+                xaxis_title="Year",
+                yaxis_title="$ Millions",
+                xaxis=dict(dtick=1),
+                template="plotly_white",
+                height=400
+            )
+            return fig_financials
+
+        fig_financials = cached_figure('financials', build_financials, provider=match.provider_number)
+        plotly_chart(fig_financials, use_container_width=True)
+
+    with col2:
+        # Median of the hospital's peer group in each year it reported
+        years = history['Year'].astype(int).tolist()
+        peer_contract = [_peer_median(data_version, year, match.provider_number, 'Contract_Labor_Pct')
+                         for year in years]
+
+        def build_contract():
+            fig_contract = go.Figure(go.Scatter(
+                x=history['Year'], y=history['Contract_Labor_Pct'],
+                mode='lines+markers', name='Contract Labor %',
+                line=dict(color='#1f77b4', width=3)
+            ))
+            fig_contract.add_trace(go.Scatter(
+                x=years, y=peer_contract,
+                mode='lines', name=f'Peer Median ({PEER_COUNT} nearest)',
+                line=dict(color='#7f7f7f', width=2, dash='dot')
+            ))
+            fig_contract.add_hrect(y0=3, y1=5, fillcolor="green", opacity=0.1, line_width=0,
+                                   annotation_text="Target (3-5%)")
+            fig_contract.update_layout(
+                title="Contract Labor % of Salaries",
+                xaxis_title="Year",
+                yaxis_title="Contract Labor %",
+                xaxis=dict(dtick=1),
+                template="plotly_white",
+                height=400
+            )
+            return fig_contract
+
+        fig_contract = cached_figure('contract', build_contract, provider=match.provider_number)
+        plotly_chart(fig_contract, use_container_width=True)
+
+    peer_section(data_version, match.provider_number, int(latest['Year']), cached_figure)
+
+    # Year-by-year history
+    st.subheader("Reported History")
+    st.dataframe(
+        history[['Year', 'Beds', 'FTE', 'Net_Patient_Revenue', 'Operating_Cost', 'Operating_Margin',
+                 'Contract_Labor', 'Contract_Labor_Pct']]
+        .rename(columns={
+            'Net_Patient_Revenue': 'Net Patient Revenue',
+            'Operating_Cost': 'Operating Cost',
+            'Operating_Margin': 'Operating Margin %',
+            'Contract_Labor': 'Contract Labor',
+            'Contract_Labor_Pct': 'Contract Labor %'
+        })
+        .round(1),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    filters.update(years=history['Year'].tolist(), states=[match.state])
+
+
+def _peer_median(data_version, year, provider_number, metric):
+    medians = load_peer_medians(data_version, year)
+    value = medians.loc[medians['Provider_Number'] == provider_number, metric]
+    return None if value.empty or value.isna().iloc[0] else float(value.iloc[0])
+
+
+def peer_section(data_version, provider_number, year, cached_figure):
+    """The hospital against its nearest peers on beds, revenue, FTE and
+    teaching status, from the year's cached KD-tree."""
+    st.subheader(f"Peer Group ({year})")
+    index = peer_index(data_version, year)
+    peer_df = index.peers(provider_number, k=PEER_COUNT)
+    if peer_df is None or peer_df.empty:
+        st.info("This hospital's beds, revenue or FTE are missing, so it has no peer group.")
+        return
+    own = index.record(provider_number)
+
+    columns = st.columns(len(PEER_METRICS))
+    for column, (metric, (label, scale, template, delta_color)) in zip(columns, PEER_METRICS.items()):
+        value, median = own[metric], peer_df[metric].median()
+        delta = None if math.isnan(value) or math.isnan(median) else f"{(value - median) / scale:+,.1f} vs peer median"
+        with column:
+            st.metric(label, _value(value / scale, template), delta=delta, delta_color=delta_color)
+
+    def build_peers():
+        fig_peers = make_subplots(rows=1, cols=len(PEER_METRICS),
+                                  subplot_titles=[label for label, *_ in PEER_METRICS.values()])
+        for i, (metric, (label, scale, _, _)) in enumerate(PEER_METRICS.items(), start=1):
+            fig_peers.add_trace(go.Box(
+                y=peer_df[metric] / scale, name='Peers', boxpoints='all', jitter=0.4, pointpos=0,
+                text=peer_df['Provider_Number'], hovertemplate='CCN %{text}: %{y:,.1f}<extra></extra>',
+                marker_color='#7f7f7f', showlegend=i == 1
+            ), row=1, col=i)
+            fig_peers.add_trace(go.Scatter(
+                x=['Peers'], y=[own[metric] / scale], mode='markers', name='This Hospital',
+                marker=dict(color='#d62728', size=14, symbol='diamond'), showlegend=i == 1
+            ), row=1, col=i)
+        fig_peers.update_layout(
+            title=f"{len(peer_df)} Nearest Peers - {year}",
+            template="plotly_white",
+            height=400
+        )
+        return fig_peers
+
+    fig_peers = cached_figure('peers', build_peers, provider=provider_number, year=year)
+    plotly_chart(fig_peers, use_container_width=True)
+    st.caption(f"Peers are the {len(peer_df)} hospitals nationwide closest in beds, net patient revenue and FTE "
+               f"(log scale), matched on teaching status, whatever the sidebar filters.")
@@ -0,0 +1,155 @@
+"""Outlier Analysis page."""
+import streamlit as st
+import plotly.express as px
+
+from views import charts, crossfilter
+from views.common import (figures, load_outlier_hospitals, load_outlier_panel, load_outlier_points,
+                          load_persistent_outliers, load_persistent_trends, plotly_chart)
+
+PAGE = "Outlier Analysis"
+TREND_HOSPITALS = 5
+
+# Outlier metric -> label
+METRIC_LABELS = {
+    'Contract_Labor_Pct': "Contract Labor %",
+    'Operating_Cost': "Operating Cost",
+    'FTE_per_Bed': "FTE per Bed",
+    'Revenue_per_Bed': "Revenue per Bed",
+}
+
+
+def render(data_version):
+    cached_figure = figures(PAGE, data_version)
+
+    st.header("🚨 Hospital Outlier Analysis")
+    selection = crossfilter.active(data_version)
+    year = crossfilter.focus_year(data_version, selection)
+    outlier_df = load_outlier_hospitals(data_version, 'Operating_Cost', year, filters=selection)
+    
+    # Top financial outliers
+    st.subheader(f"Top Financial Outliers ({year})")
+    
+    def build_outliers():
+        fig_outliers = px.bar(
+            outlier_df.sort_values('Operating_Cost_Billions', ascending=True),
+            x='Operating_Cost_Billions', y='Hospital',
+            orientation='h',
+            color='State',
+            title="Highest Operating Costs ($ Billions)",
+            labels={'Operating_Cost_Billions': 'Operating Cost ($ Billions)'}
+        )
+        fig_outliers.update_layout(template="plotly_white", height=400)
+        return fig_outliers
+    
+    fig_outliers = cached_figure('outliers', build_outliers, selection=selection)
+    plotly_chart(fig_outliers, use_container_width=True)
+    
+    # FTE Analysis
+    st.subheader("FTE Analysis and Outliers")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Every hospital in the year, FTE-per-bed outliers within their state highlighted
+        fte_points = load_outlier_points(data_version, 'FTE_per_Bed', year=year, filters=selection)
+        
+        def build_fte():
+            fig_fte = charts.scatter(
+                fte_points, x='Beds', y='FTE',
+                outlier='FTE_per_Bed_Outlier',
+                hover_name='Hospital',
+                title="FTE vs Bed Count - Outliers Highlighted",
+                color='Status',
+                color_discrete_map={'Typical': '#9ecae1', 'Outlier': '#d62728'}
+            )
+            fig_fte.update_layout(template="plotly_white", height=400)
+            return fig_fte
+        
+        fig_fte = cached_figure('fte', build_fte, selection=selection)
+        plotly_chart(fig_fte, use_container_width=True)
+    
+    with col2:
+        # Largest FTE-per-bed outliers within their state in the year
+        fte_outliers = load_outlier_hospitals(data_version, 'FTE_per_Bed', year=year, top_n=5, filters=selection)
+        
+        def build_fte_ratio():
+            fig_fte_ratio = px.bar(
+                fte_outliers.sort_values('FTE_per_Bed', ascending=True),
+                x='FTE_per_Bed', y='Hospital',
+                orientation='h',
+                title="FTE per Bed Ratio - Top Outliers",
+                color='FTE_per_Bed',
+                color_continuous_scale='Oranges'
+            )
+            fig_fte_ratio.update_layout(template="plotly_white", height=400)
+            return fig_fte_ratio
+        
+        fig_fte_ratio = cached_figure('fte_ratio', build_fte_ratio, selection=selection)
+        plotly_chart(fig_fte_ratio, use_container_width=True)
+    
+    # Hospitals flagged year after year; choosing the threshold or metric
+    # reruns only this section
+    st.subheader("Persistent Outliers Across Years")
+    persistent_outliers(data_version, selection)
+    
+    # Filters applied on this page, offered to the sidebar export
+    return {'years': [year]}
+
+
+@st.fragment
+def persistent_outliers(data_version, selection):
+    cached_figure = figures(PAGE, data_version)
+    # Every hospital-year aligned on provider number, so persistence and
+    # year-over-year changes are whole-panel array operations
+    years = load_outlier_panel(data_version, selection).years.tolist()
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        min_years = st.slider(f"Flagged in at least N of {len(years)} years", 1, len(years),
+                              min(3, len(years)), key="persistent_min_years") if len(years) > 1 else 1
+    with col2:
+        metric = st.selectbox("Trend metric", list(METRIC_LABELS), format_func=METRIC_LABELS.get,
+                              key="persistent_metric")
+
+    trend = load_persistent_trends(data_version, metric, min_years, TREND_HOSPITALS, selection)
+    label = METRIC_LABELS[metric]
+
+    def build_trend():
+        fig_trend = px.line(
+            trend, x='Year', y=metric,
+            color='Hospital',
+            title=f"{label} Trends - Persistent Outliers",
+            labels={metric: label},
+            hover_data={'YoY_Change': ':,.2f'},
+            markers=True
+        )
+        fig_trend.update_layout(template="plotly_white", height=400, xaxis=dict(dtick=1))
+        return fig_trend
+
+    if trend.empty:
+        st.info(f"No hospital's {label.lower()} was an outlier in {min_years} or more of the selected years.")
+    else:
+        fig_trend = cached_figure('persistent_trend', build_trend, metric=metric, min_years=min_years,
+                                  selection=selection)
+        plotly_chart(fig_trend, use_container_width=True)
+
+    # Every persistent (hospital, metric) pair
+    table = load_persistent_outliers(data_version, min_years, selection)
+    st.caption(f"{table['Provider_Number'].nunique():,} hospitals are outliers on at least one metric "
+               f"in {min_years} or more of {len(years)} years.")
+    st.dataframe(
+        table.assign(Metric=table['Metric'].map(METRIC_LABELS))
+        [['Hospital', 'Provider_Number', 'Metric', 'Years_Flagged', 'Years_Reported', 'Latest_Value',
+          'Latest_Change', 'Mean_Change']]
+        .rename(columns={
+            'Provider_Number': 'CCN',
+            'Years_Flagged': 'Years Flagged',
+            'Years_Reported': 'Years Reported',
+            'Latest_Value': 'Latest Value',
+            'Latest_Change': 'Latest YoY Change',
+            'Mean_Change': 'Mean YoY Change'
+        })
+        .round(2),
+        use_container_width=True,
+        hide_index=True
+    )
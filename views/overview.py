@@ -0,0 +1,143 @@
+"""Overview page."""
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+from views import crossfilter
+from views.common import (figures, load_database_summary, load_operating_metrics, load_outlier_summary,
+                          load_quality, plotly_chart)
+
+PAGE = "Overview"
+
+
+def render(data_version):
+    cached_figure = figures(PAGE, data_version)
+
+    st.header("📈 Database Overview")
+    # Database totals are unfiltered; the per-year charts follow the sidebar
+    # year range and the outlier count all of its filters
+    selection = crossfilter.active(data_version)
+    summary = load_database_summary(data_version)
+    operating_df = load_operating_metrics(data_version, selection)
+    quality_df = load_quality(data_version, selection)
+    cost_outliers = load_outlier_summary(data_version, 'Operating_Cost', selection)
+    
+    # Key metrics in columns
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>{summary['Hospitals']:,}</h3>
+            <p>Total Hospitals</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>{summary['Last_Year'] - summary['First_Year'] + 1} Years</h3>
+            <p>Data Coverage ({summary['First_Year']}-{summary['Last_Year']})</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>{summary['Teaching_Hospitals']:,}</h3>
+            <p>Teaching Hospitals</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>{summary['States']}</h3>
+            <p>States Covered</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.subheader("Data Completeness Over Time")
+    
+    # Data completeness chart
+    def build_completeness():
+        fig_completeness = go.Figure()
+    
+        fig_completeness.add_trace(go.Scatter(
+            x=operating_df['Year'], y=operating_df['Revenue_Complete'],
+            mode='lines+markers', name='Revenue Data', line=dict(color='#1f77b4')
+        ))
+        fig_completeness.add_trace(go.Scatter(
+            x=operating_df['Year'], y=operating_df['Cost_Complete'],
+            mode='lines+markers', name='Cost Data', line=dict(color='#ff7f0e')
+        ))
+        fig_completeness.add_trace(go.Scatter(
+            x=operating_df['Year'], y=operating_df['FTE_Complete'],
+            mode='lines+markers', name='FTE Data', line=dict(color='#2ca02c')
+        ))
+        fig_completeness.add_trace(go.Scatter(
+            x=operating_df['Year'], y=operating_df['Contract_Complete'],
+            mode='lines+markers', name='Contract Labor Data', line=dict(color='#d62728')
+        ))
+    
+        fig_completeness.update_layout(
+            title="Data Completeness Percentage by Year",
+            xaxis_title="Year",
+            yaxis_title="Completeness (%)",
+            yaxis=dict(range=[60, 100]),
+            template="plotly_white",
+            height=400
+        )
+        return fig_completeness
+    
+    fig_completeness = cached_figure('completeness', build_completeness, selection=selection)
+    
+    plotly_chart(fig_completeness, use_container_width=True)
+    
+    # Hospital count by year
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        def build_hospitals():
+            fig_hospitals = px.bar(
+                operating_df, x='Year', y='Total_Hospitals',
+                title="Total Hospitals by Year",
+                color='Total_Hospitals',
+                color_continuous_scale='Blues'
+            )
+            fig_hospitals.update_layout(template="plotly_white", height=350)
+            return fig_hospitals
+        
+        fig_hospitals = cached_figure('hospitals', build_hospitals, selection=selection)
+        plotly_chart(fig_hospitals, use_container_width=True)
+    
+    with col2:
+        # Data quality indicators
+        st.subheader("Data Quality Indicators")
+        issues = quality_df.sum()
+        contract_coverage = (quality_df['Contract_Complete'] * quality_df['Records']).sum() / issues['Records']
+        st.markdown(f"""
+        <div class="critical-card">
+            <h4 style="color: #d32f2f; margin-top: 0;">🚨 Critical Issues Identified</h4>
+            <div class="issue-item critical-issue">
+                <span class="status-icon">❌</span>
+                <strong>Negative revenue records: {issues['Negative_Revenue']:,}</strong> (Data integrity violation)
+            </div>
+            <div class="issue-item high-issue">
+                <span class="status-icon">⚠️</span>
+                <strong>Negative operating costs: {issues['Negative_Operating_Cost']:,}</strong> (Validation needed)
+            </div>
+            <div class="issue-item medium-issue">
+                <span class="status-icon">⚠️</span>
+                <strong>Negative contract labor: {issues['Negative_Contract_Labor']:,}</strong> (Review required)
+            </div>
+            <div class="issue-item high-issue">
+                <span class="status-icon">📊</span>
+                <strong>Contract labor data coverage: ~{contract_coverage:.0f}%</strong> (Incomplete reporting)
+            </div>
+            <div class="issue-item medium-issue">
+                <span class="status-icon">🔎</span>
+                <strong>Operating cost outliers: {cost_outliers['Outliers'].sum():,}</strong> (Within state and year)
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
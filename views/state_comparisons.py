@@ -0,0 +1,158 @@
+"""State Comparisons page."""
+import numpy as np
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+from views import charts, crossfilter
+from views.common import figures, load_state_financials, load_state_map, plotly_chart
+
+PAGE = "State Comparisons"
+
+# Map metric -> (label, hover value format)
+MAP_METRICS = {
+    'Mean_Operating_Cost': ("Mean Operating Cost ($M)", "$%{z:,.1f}M"),
+    'Outlier_Percentage': ("Operating Cost Outliers (%)", "%{z:.1f}%"),
+    'Mean_Contract_Pct': ("Mean Contract Labor (%)", "%{z:.1f}%"),
+}
+MAP_SCALE = {'Mean_Operating_Cost': 1_000_000}
+
+
+def render(data_version):
+    cached_figure = figures(PAGE, data_version)
+
+    st.header("🗺️ State-wise Financial Comparisons")
+
+    # Every state and year, from precomputed arrays; picking a metric or
+    # year reruns only the map and swaps its z values
+    st.subheader("All States")
+    state_map(data_version)
+
+    selection = crossfilter.active(data_version)
+    year = crossfilter.focus_year(data_version, selection)
+    state_df = load_state_financials(data_version, year=year, filters=selection)
+    count = f'Hospital_Count_{year}'
+    
+    # State financial overview
+    st.subheader(f"Operating Costs by State ({year})")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        def build_state_costs():
+            fig_state_costs = px.bar(
+                state_df.sort_values('Mean_Operating_Cost_Millions', ascending=True),
+                x='Mean_Operating_Cost_Millions', y='State',
+                orientation='h',
+                title=f"Mean Operating Costs by State ({year})",
+                color='Mean_Operating_Cost_Millions',
+                color_continuous_scale='Viridis',
+                labels={'Mean_Operating_Cost_Millions': 'Operating Cost ($ Millions)'}
+            )
+            fig_state_costs.update_layout(template="plotly_white", height=500)
+            return fig_state_costs
+        
+        fig_state_costs = cached_figure('state_costs', build_state_costs, selection=selection)
+        plotly_chart(fig_state_costs, use_container_width=True)
+    
+    with col2:
+        def build_hospital_count():
+            fig_hospital_count = charts.scatter(
+                state_df, x=count, y='Mean_Operating_Cost_Millions',
+                size=count, color='Outlier_Percentage',
+                hover_name='State',
+                title="Hospital Count vs Mean Operating Cost",
+                labels={
+                    count: 'Number of Hospitals',
+                    'Mean_Operating_Cost_Millions': 'Mean Operating Cost ($ Millions)',
+                    'Outlier_Percentage': 'Outlier %'
+                }
+            )
+            fig_hospital_count.update_layout(template="plotly_white", height=500)
+            return fig_hospital_count
+        
+        fig_hospital_count = cached_figure('hospital_count', build_hospital_count, selection=selection)
+        plotly_chart(fig_hospital_count, use_container_width=True)
+    
+    # Outlier percentage by state
+    st.subheader("Financial Outlier Distribution by State")
+    
+    def build_outlier_pct():
+        fig_outlier_pct = px.bar(
+            state_df.sort_values('Outlier_Percentage', ascending=False),
+            x='State', y='Outlier_Percentage',
+            title="Percentage of Financial Outliers by State",
+            color='Outlier_Percentage',
+            color_continuous_scale='Reds'
+        )
+        fig_outlier_pct.update_layout(template="plotly_white", height=400)
+        return fig_outlier_pct
+    
+    fig_outlier_pct = cached_figure('outlier_pct', build_outlier_pct, selection=selection)
+    plotly_chart(fig_outlier_pct, use_container_width=True)
+    
+    # State rankings table
+    st.subheader("State Rankings Summary")
+    
+    state_summary = state_df.round({'Mean_Operating_Cost_Millions': 1})
+    state_summary = state_summary.sort_values('Mean_Operating_Cost_Millions', ascending=False)
+    
+    st.dataframe(
+        state_summary[['State', count, 'Mean_Operating_Cost_Millions', 'Outlier_Percentage']]
+        .rename(columns={
+            count: 'Hospital Count',
+            'Mean_Operating_Cost_Millions': 'Mean Cost ($M)',
+            'Outlier_Percentage': 'Outlier %'
+        }),
+        use_container_width=True
+    )
+    
+    # Filters applied on this page, offered to the sidebar export
+    return {'years': [year]}
+
+
+@st.fragment
+def state_map(data_version):
+    cached_figure = figures(PAGE, data_version)
+    selection = crossfilter.active(data_version)
+    arrays = load_state_map(data_version, selection)
+    years = arrays['years'].tolist()
+
+    col1, col2 = st.columns([2, 3])
+    with col1:
+        metric = st.radio("Metric", list(MAP_METRICS), format_func=lambda m: MAP_METRICS[m][0],
+                          horizontal=True, key="state_map_metric")
+    with col2:
+        if len(years) > 1:
+            year = st.select_slider("Year", years, value=years[-1], key="state_map_year")
+        else:
+            year = years[0]
+
+    def build_map():
+        # Geometry, layout and colour scale only; values are filled in below
+        fig_map = go.Figure(go.Choropleth(
+            locations=arrays['states'],
+            locationmode='USA-states',
+            z=np.zeros(len(arrays['states'])),
+            colorscale='Blues',
+            marker_line_color='white'
+        ))
+        fig_map.update_layout(
+            geo=dict(scope='usa', projection_type='albers usa', showlakes=False),
+            template="plotly_white",
+            height=500,
+            margin=dict(l=0, r=0, t=40, b=0),
+            uirevision='state_map'
+        )
+        return fig_map
+
+    label, value_format = MAP_METRICS[metric]
+    z = arrays[metric][years.index(year)] / MAP_SCALE.get(metric, 1)
+    fig_map = cached_figure('state_map', build_map, selection=selection).restyled(
+        z=[None if np.isnan(value) else round(float(value), 2) for value in z],
+        colorbar={'title': {'text': label}},
+        hovertemplate=f"%{{location}}: {value_format}<extra></extra>",
+        layout={'title': {'text': f"{label} by State - {year}"}}
+    )
+    plotly_chart(fig_map, use_container_width=True)
+    st.caption("Territories have no shape on Plotly's built-in USA-states map and are not drawn.")